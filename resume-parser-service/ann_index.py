@@ -0,0 +1,219 @@
+"""
+Approximate nearest-neighbour index over the job-embedding store (pure NumPy).
+
+IVF (inverted file) layout: a spherical k-means coarse quantizer splits the
+normalized job embeddings into `nlist` clusters, and each cluster keeps the ids
+of its jobs. A query only scores the jobs in its `nprobe` closest clusters,
+exactly, against the vectors in the store, so `nprobe` trades recall for
+latency. New jobs are assigned to their nearest centroid on insert; the
+centroids are only retrained on an explicit rebuild.
+
+Centroids are persisted next to the store (ivf_centroids.npy) so restarts and
+sibling workers reuse the same quantizer; inverted lists are rebuilt in memory.
+"""
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from job_store import JobEmbeddingStore, top_k_indices
+
+_ASSIGN_CHUNK = 8192
+
+
+class IVFIndex:
+    """Inverted-file index of job ids, scored exactly against the backing store."""
+
+    CENTROIDS_FILE = "ivf_centroids.npy"
+
+    def __init__(self, store: JobEmbeddingStore):
+        self.store = store
+        self.centroids: Optional[np.ndarray] = None
+        self._lists: List[Dict[str, None]] = []
+        self._assignment: Dict[str, int] = {}
+        self._store_version = None
+        self._centroids_version = None
+        self._lock = threading.RLock()
+
+    @property
+    def centroids_path(self) -> str:
+        return os.path.join(self.store.directory, self.CENTROIDS_FILE)
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    @property
+    def nlist(self) -> int:
+        return 0 if self.centroids is None else self.centroids.shape[0]
+
+    def train(self, nlist: int, iterations: int = 10, sample_size: int = 65536, seed: int = 0) -> None:
+        """Fit the coarse quantizer on (a sample of) the store, persist it and reassign every job."""
+        vectors = self.store.vectors()
+        if vectors.shape[0] < nlist:
+            raise ValueError(f"Need at least {nlist} stored jobs to train {nlist} lists, have {vectors.shape[0]}")
+
+        rng = np.random.default_rng(seed)
+        if vectors.shape[0] > sample_size:
+            sample = np.asarray(vectors[np.sort(rng.choice(vectors.shape[0], sample_size, replace=False))])
+        else:
+            sample = np.array(vectors)
+
+        centroids = _spherical_kmeans(sample, nlist, iterations, rng)
+        tmp_path = f"{self.centroids_path}.{os.getpid()}.tmp.npy"
+        np.save(tmp_path, centroids)
+        with self._lock:
+            os.replace(tmp_path, self.centroids_path)
+            self._load_centroids()
+
+    def load(self) -> bool:
+        """Load persisted centroids if present; returns whether the index is usable."""
+        with self._lock:
+            if os.path.exists(self.centroids_path):
+                self._load_centroids()
+            return self.is_trained
+
+    def sync(self) -> None:
+        """Pick up centroid rebuilds and job inserts/deletes made by other processes."""
+        with self._lock:
+            if os.path.exists(self.centroids_path) and _file_version(self.centroids_path) != self._centroids_version:
+                self._load_centroids()
+                return
+            if self.centroids is None or self.store.version == self._store_version:
+                return
+
+            stored = set(self.store.ids())
+            self._drop([job_id for job_id in self._assignment if job_id not in stored])
+            added = [job_id for job_id in stored if job_id not in self._assignment]
+            if added:
+                present, vectors = self.store.vectors_for(added)
+                self._assign(present, vectors)
+            self._store_version = self.store.version
+
+    def add(self, job_ids: List[str], vectors: np.ndarray) -> None:
+        """Assign new or updated jobs to their nearest list (no retraining)."""
+        with self._lock:
+            if self.centroids is None:
+                return
+            self._drop(job_ids)
+            self._assign(job_ids, np.asarray(vectors, dtype=np.float32))
+            # Our own write is applied, so sync() need not rescan the store for it
+            self._store_version = self.store.version
+
+    def remove(self, job_ids: List[str]) -> None:
+        with self._lock:
+            self._drop(job_ids)
+            self._store_version = self.store.version
+
+    def search(self, query: np.ndarray, k: int, nprobe: int) -> List[Tuple[str, float]]:
+        """Approximate top-k: exact scores for the jobs in the nprobe closest lists."""
+        self.sync()
+        query = np.asarray(query, dtype=np.float32)
+        nprobe = max(1, min(nprobe, self.nlist))
+        probe = top_k_indices(self.centroids @ query, nprobe)
+
+        with self._lock:
+            candidates = [job_id for list_no in probe for job_id in self._lists[list_no]]
+        if not candidates:
+            return []
+        present, vectors = self.store.vectors_for(candidates)
+        scores = vectors @ query
+        return [(present[i], float(scores[i])) for i in top_k_indices(scores, k)]
+
+    def list_sizes(self) -> List[int]:
+        with self._lock:
+            return [len(ids) for ids in self._lists]
+
+    # --- internals ---
+
+    def _load_centroids(self) -> None:
+        self._centroids_version = _file_version(self.centroids_path)
+        self.centroids = np.load(self.centroids_path).astype(np.float32)
+        self._lists = [{} for _ in range(self.centroids.shape[0])]
+        self._assignment = {}
+        with self.store.reading():
+            self._store_version = self.store.version
+            self._assign(self.store.ids(), self.store.vectors())
+
+    def _assign(self, job_ids: List[str], vectors: np.ndarray) -> None:
+        for start in range(0, len(job_ids), _ASSIGN_CHUNK):
+            chunk = np.asarray(vectors[start:start + _ASSIGN_CHUNK])
+            nearest = np.argmax(chunk @ self.centroids.T, axis=1)
+            for job_id, list_no in zip(job_ids[start:start + _ASSIGN_CHUNK], nearest.tolist()):
+                self._lists[list_no][job_id] = None
+                self._assignment[job_id] = list_no
+
+    def _drop(self, job_ids: List[str]) -> None:
+        for job_id in job_ids:
+            list_no = self._assignment.pop(job_id, None)
+            if list_no is not None:
+                self._lists[list_no].pop(job_id, None)
+
+
+def default_nlist(count: int) -> int:
+    """Rule-of-thumb list count: about 4 * sqrt(N)."""
+    return max(1, int(4 * np.sqrt(count)))
+
+
+def recall_report(index: IVFIndex, queries: np.ndarray, k: int, nprobes: List[int]) -> dict:
+    """
+    Compare the IVF index against exact search on the same store.
+    Returns recall@k and mean per-query latency for each nprobe value.
+    """
+    exact_results = []
+    started = time.perf_counter()
+    for query in queries:
+        exact_results.append({job_id for job_id, _ in index.store.search(query, k)})
+    exact_ms = (time.perf_counter() - started) * 1000 / max(len(queries), 1)
+
+    rows = []
+    for nprobe in nprobes:
+        hits = 0
+        started = time.perf_counter()
+        approx_results = [index.search(query, k, nprobe) for query in queries]
+        latency_ms = (time.perf_counter() - started) * 1000 / max(len(queries), 1)
+        for approx, exact in zip(approx_results, exact_results):
+            hits += len(exact.intersection(job_id for job_id, _ in approx))
+        expected = sum(len(exact) for exact in exact_results)
+        rows.append({
+            "nprobe": nprobe,
+            "recallAtK": round(hits / expected, 4) if expected else 0.0,
+            "meanLatencyMs": round(latency_ms, 3),
+        })
+
+    return {
+        "k": k,
+        "queries": len(queries),
+        "jobs": len(index.store),
+        "nlist": index.nlist,
+        "exactMeanLatencyMs": round(exact_ms, 3),
+        "results": rows,
+    }
+
+
+def _spherical_kmeans(sample: np.ndarray, nlist: int, iterations: int, rng: np.random.Generator) -> np.ndarray:
+    """k-means on the unit sphere (cosine distance), seeded from random sample points."""
+    centroids = sample[rng.choice(sample.shape[0], nlist, replace=False)].copy()
+    for _ in range(iterations):
+        sums = np.zeros_like(centroids)
+        counts = np.zeros(nlist, dtype=np.int64)
+        for start in range(0, sample.shape[0], _ASSIGN_CHUNK):
+            chunk = sample[start:start + _ASSIGN_CHUNK]
+            nearest = np.argmax(chunk @ centroids.T, axis=1)
+            np.add.at(sums, nearest, chunk)
+            counts += np.bincount(nearest, minlength=nlist)
+
+        # Reseed empty lists from random points so every list stays useful
+        empty = np.flatnonzero(counts == 0)
+        if empty.size:
+            sums[empty] = sample[rng.choice(sample.shape[0], empty.size, replace=False)]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        centroids = sums / np.maximum(norms, 1e-12)
+    return centroids.astype(np.float32)
+
+
+def _file_version(path: str) -> tuple:
+    stat = os.stat(path)
+    return (stat.st_ino, stat.st_mtime_ns)
@@ -0,0 +1,7 @@
+"""Make the service modules importable when running scripts from benchmarks/."""
+import os
+import sys
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVICE_DIR not in sys.path:
+    sys.path.insert(0, SERVICE_DIR)
@@ -0,0 +1,116 @@
+"""
+Embedding latency and throughput: sentence-transformers on PyTorch vs the ONNX
+Runtime backend (float32 and dynamic int8), on the same model and corpus, with
+the largest difference in resume/job cosine scores against PyTorch.
+
+"pairMs" times one resume/job pair per call, as /semantic-score encodes;
+"batch" encodes --batch-size texts per call, as /semantic-score/batch and
+/job-embeddings do. The ONNX export goes to a temporary directory unless
+--export-dir is given.
+
+Usage: python benchmarks/bench_embedding_backends.py [--pairs 200] [--batch-size 32]
+                                                     [--threads 0] [--export-dir DIR]
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import _path  # noqa: F401
+import settings
+from corpus import make_resume_text
+from onnx_encoder import load_onnx_encoder
+
+# Largest acceptable |cosine difference| against PyTorch, per backend
+TOLERANCE = {"onnx": 1e-4, "onnxInt8": 0.02}
+
+
+def _pairs(count: int, seed: int):
+    rng = random.Random(seed)
+    resumes = [make_resume_text(rng, length=rng.choice([1, 1, 2, 4]), skill_density=0.08) for _ in range(count)]
+    # Job postings are shorter: a title line and a few requirement lines of another resume
+    jobs = [" ".join(make_resume_text(rng, length=1, skill_density=0.2).split("\n")[:8]) for _ in range(count)]
+    return [(" ".join(r.split()), " ".join(j.split())) for r, j in zip(resumes, jobs)]
+
+
+def _bench(encoder, pairs, batch_size: int) -> dict:
+    encode = lambda texts: np.asarray(encoder.encode(texts, normalize_embeddings=True), dtype=np.float32)  # noqa: E731
+    for resume, job in pairs[:5]:
+        encode([resume, job])
+
+    latencies, scores = [], []
+    for resume, job in pairs:
+        started = time.perf_counter()
+        vectors = encode([resume, job])
+        latencies.append(time.perf_counter() - started)
+        scores.append(float(vectors[1] @ vectors[0]))
+
+    texts = [text for pair in pairs for text in pair]
+    started = time.perf_counter()
+    for start in range(0, len(texts), batch_size):
+        encode(texts[start:start + batch_size])
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return {
+        "pairMs": {
+            "mean": round(statistics.mean(ordered) * 1000, 3),
+            "p50": round(ordered[len(ordered) // 2] * 1000, 3),
+            "p95": round(ordered[int(len(ordered) * 0.95) - 1] * 1000, 3),
+        },
+        "batchTextsPerSecond": round(len(texts) / elapsed, 1),
+        "_scores": np.array(scores),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pairs", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--threads", type=int, default=0, help="torch and ONNX Runtime intra-op threads (0 = default)")
+    parser.add_argument("--export-dir", help="reuse or keep the ONNX export here")
+    args = parser.parse_args()
+
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    pairs = _pairs(args.pairs, args.seed)
+    export_dir = args.export_dir or tempfile.mkdtemp(prefix="onnx-export-")
+
+    backends = {
+        "torch": SentenceTransformer(settings.EMBEDDING_MODEL_NAME, device="cpu", local_files_only=True),
+        "onnx": load_onnx_encoder(settings.EMBEDDING_MODEL_NAME, export_dir, quantize=False, intra_op_threads=args.threads),
+        "onnxInt8": load_onnx_encoder(settings.EMBEDDING_MODEL_NAME, export_dir, quantize=True, intra_op_threads=args.threads),
+    }
+    results = {name: _bench(encoder, pairs, args.batch_size) for name, encoder in backends.items()}
+
+    reference = results["torch"].pop("_scores")
+    failed = False
+    for name in ("onnx", "onnxInt8"):
+        diff = float(np.max(np.abs(results[name].pop("_scores") - reference)))
+        results[name]["maxCosineDiff"] = round(diff, 6)
+        results[name]["speedupPair"] = round(results["torch"]["pairMs"]["mean"] / results[name]["pairMs"]["mean"], 2)
+        results[name]["speedupBatch"] = round(results[name]["batchTextsPerSecond"] / results["torch"]["batchTextsPerSecond"], 2)
+        failed |= diff > TOLERANCE[name]
+
+    report = {
+        "model": settings.EMBEDDING_MODEL_NAME,
+        "pairs": len(pairs),
+        "batchSize": args.batch_size,
+        "threads": args.threads or "default",
+        **results,
+    }
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
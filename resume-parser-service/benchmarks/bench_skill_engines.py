@@ -0,0 +1,77 @@
+"""
+Skill-matching throughput: spaCy (tokenizer-only Doc + PhraseMatcher) vs the
+token trie (SKILL_ENGINE=trie), on the same taxonomy and corpus, with a check
+that both engines return identical skills for every resume.
+
+The trie is timed twice: "cold" on an empty chunk cache (every whitespace
+chunk is tokenized), and "warm" on a second pass over the corpus.
+
+Usage: python benchmarks/bench_skill_engines.py [--resumes 3000] [--seed 42]
+"""
+import argparse
+import json
+import sys
+import time
+
+import spacy
+
+import _path  # noqa: F401
+import resume_parsing
+import settings
+from corpus import make_corpus
+from skill_taxonomy import SkillTaxonomy
+from skill_trie import TokenizerRules, TokenTrieSkillMatcher
+
+
+def _timed(fn, texts):
+    started = time.perf_counter()
+    results = [fn(text) for text in texts]
+    elapsed = time.perf_counter() - started
+    return results, {
+        "seconds": round(elapsed, 3),
+        "resumesPerSecond": round(len(texts) / elapsed, 1),
+        "meanMs": round(elapsed * 1000 / len(texts), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--resumes", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # Tokenizer-only en_core_web_sm when installed; its tokenizer rules are the English defaults
+    pipeline = resume_parsing._load_spacy_pipeline("tokenizer") or spacy.blank("en")
+    taxonomy = SkillTaxonomy.load(settings.SKILLS_TAXONOMY_PATH)
+
+    started = time.perf_counter()
+    phrase_matcher = taxonomy.compile(pipeline)
+    phrase_compile_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    trie_matcher = TokenTrieSkillMatcher(taxonomy, TokenizerRules.from_spacy(pipeline.tokenizer))
+    trie_compile_ms = (time.perf_counter() - started) * 1000
+
+    texts = [text.lower() for text in make_corpus(args.resumes, seed=args.seed)]
+    spacy_skills, spacy_stats = _timed(lambda text: phrase_matcher(pipeline(text)), texts)
+    trie_skills, trie_cold = _timed(trie_matcher, texts)
+    _, trie_warm = _timed(trie_matcher, texts)
+
+    mismatches = sum(a != b for a, b in zip(spacy_skills, trie_skills))
+    report = {
+        "resumes": len(texts),
+        "meanChars": round(sum(len(t) for t in texts) / len(texts)),
+        "skills": len(taxonomy.skills),
+        "compileMs": {"spacy": round(phrase_compile_ms, 1), "trie": round(trie_compile_ms, 1)},
+        "spacy": spacy_stats,
+        "trieCold": trie_cold,
+        "trieWarm": trie_warm,
+        "speedupCold": round(trie_cold["resumesPerSecond"] / spacy_stats["resumesPerSecond"], 2),
+        "speedupWarm": round(trie_warm["resumesPerSecond"] / spacy_stats["resumesPerSecond"], 2),
+        "skillMismatches": mismatches,
+    }
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Per-resume latency of the spaCy stage of the parse path (nlp() + skill matching):
+full en_core_web_sm pipeline vs the tokenizer-only pipeline (SPACY_PIPELINE),
+and a check that both produce identical skills.
+
+Usage: python benchmarks/bench_spacy_pipeline.py [--resumes 200] [--seed 42]
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+
+import _path  # noqa: F401
+import resume_parsing
+import settings
+from corpus import make_corpus
+
+
+def _run(mode: str, texts):
+    pipeline = resume_parsing._load_spacy_pipeline(mode)
+    if pipeline is None:
+        sys.exit("en_core_web_sm is not installed")
+    resume_parsing.nlp = pipeline
+    resume_parsing._skill_matcher = None
+
+    # Warm up vocab and matcher before timing
+    for text in texts[:5]:
+        resume_parsing._extract_skills(text.lower())
+
+    latencies, skills = [], []
+    for text in texts:
+        started = time.perf_counter()
+        skills.append(resume_parsing._extract_skills(text.lower()))
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies, skills
+
+
+def _summary(latencies):
+    ordered = sorted(latencies)
+    return {
+        "meanMs": round(statistics.mean(ordered), 3),
+        "p50Ms": round(ordered[len(ordered) // 2], 3),
+        "p95Ms": round(ordered[int(len(ordered) * 0.95) - 1], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # This benchmark times the spaCy Doc path, whatever SKILL_ENGINE is set to
+    settings.SKILL_ENGINE = "spacy"
+    texts = make_corpus(args.resumes, seed=args.seed)
+    full_latencies, full_skills = _run("full", texts)
+    tok_latencies, tok_skills = _run("tokenizer", texts)
+
+    mismatches = sum(a != b for a, b in zip(full_skills, tok_skills))
+    report = {
+        "resumes": len(texts),
+        "meanChars": round(statistics.mean(len(t) for t in texts)),
+        "full": _summary(full_latencies),
+        "tokenizer": _summary(tok_latencies),
+        "speedup": round(statistics.mean(full_latencies) / statistics.mean(tok_latencies), 2),
+        "skillMismatches": mismatches,
+    }
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+Offline benchmark of every parsing and scoring stage, in isolation and end to
+end through the ASGI app in-process, on a synthetic PDF/DOCX resume corpus,
+plus app import and time-to-ready in fresh processes.
+Prints (or writes) a JSON report; compare two reports with --compare.
+
+Usage:
+    python benchmarks/bench_suite.py [--documents 40] [--seed 42] [--output report.json]
+                                     [--skip-encode] [--skip-e2e] [--concurrency 4]
+                                     [--startup-runs 3]
+    python benchmarks/bench_suite.py --compare base.json new.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+# Measure real work: no parse/embedding cache hits, and no per-request logging
+os.environ["PARSE_CACHE_PATH"] = ""
+os.environ["EMBEDDING_CACHE_MAX_ENTRIES"] = "0"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import _path  # noqa: F401
+import settings
+from documents import make_documents
+
+_WARMUP = 3
+
+
+def _summary(latencies, items: int = None) -> dict:
+    ordered = sorted(latencies)
+    total = sum(ordered)
+    return {
+        "count": len(ordered),
+        "meanMs": round(statistics.mean(ordered) * 1000, 3),
+        "p50Ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p95Ms": round(ordered[max(0, int(len(ordered) * 0.95) - 1)] * 1000, 3),
+        "maxMs": round(ordered[-1] * 1000, 3),
+        "perSecond": round((items or len(ordered)) / total, 1) if total else None,
+    }
+
+
+def _time_each(fn, inputs) -> dict:
+    for item in inputs[:_WARMUP]:
+        fn(item)
+    latencies = []
+    for item in inputs:
+        started = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - started)
+    return _summary(latencies)
+
+
+def _job_texts(documents):
+    """A job description per document, sharing some of its skills."""
+    return [
+        "We are hiring. Requirements: " + ", ".join(line for line in doc.text.split("\n")[5:8]) + "."
+        for doc in documents
+    ]
+
+
+def bench_stages(documents, skip_encode: bool) -> dict:
+    import resume_parsing
+    from resume_sections import scan_resume
+
+    if resume_parsing.load_nlp() is None:
+        sys.exit("en_core_web_sm is not installed")
+    resume_parsing.get_skill_matcher()
+
+    texts = [doc.text for doc in documents]
+    stages = {
+        "extract_text.pdf": _time_each(resume_parsing._extract_text, [d.content for d in documents if d.kind == "pdf"]),
+        "extract_text.docx": _time_each(resume_parsing._extract_text, [d.content for d in documents if d.kind == "docx"]),
+        "extract_skills": _time_each(lambda text: resume_parsing._extract_skills(text.lower()), texts),
+        "extract_sections": _time_each(scan_resume, texts),
+        "parse_resume_text": _time_each(resume_parsing._parse_resume_text, texts),
+    }
+
+    if skip_encode:
+        stages["semantic_encode"] = {"skipped": "--skip-encode"}
+        return stages
+    try:
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(settings.EMBEDDING_MODEL_NAME, local_files_only=True)
+    except Exception as e:
+        stages["semantic_encode"] = {"skipped": f"model unavailable: {e}"}
+        return stages
+    pairs = list(zip(texts, _job_texts(documents)))
+    stages["semantic_encode"] = _time_each(lambda pair: model.encode(list(pair), normalize_embeddings=True), pairs)
+    return stages
+
+
+async def _bench_e2e(documents, concurrency: int) -> dict:
+    import httpx
+    import main
+
+    transport = httpx.ASGITransport(app=main.app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def parse(doc):
+            response = await client.post("/parse-resume-file", files={"file": (doc.name, doc.content)})
+            response.raise_for_status()
+
+        async def score(pair):
+            response = await client.post("/semantic-score", json={"resumeText": pair[0], "jobText": pair[1]})
+            response.raise_for_status()
+
+        async def timed(fn, inputs):
+            for item in inputs[:_WARMUP]:
+                await fn(item)
+            latencies = []
+            for item in inputs:
+                started = time.perf_counter()
+                await fn(item)
+                latencies.append(time.perf_counter() - started)
+            return _summary(latencies)
+
+        for kind in ("pdf", "docx"):
+            results[f"e2e.parse_resume_file.{kind}"] = await timed(parse, [d for d in documents if d.kind == kind])
+
+        # Throughput with `concurrency` requests in flight
+        slots = asyncio.Semaphore(concurrency)
+
+        async def limited(doc):
+            async with slots:
+                started = time.perf_counter()
+                await parse(doc)
+                return time.perf_counter() - started
+
+        started = time.perf_counter()
+        latencies = await asyncio.gather(*(limited(doc) for doc in documents))
+        elapsed = time.perf_counter() - started
+        concurrent = _summary(latencies)
+        concurrent["perSecond"] = round(len(documents) / elapsed, 1)
+        concurrent["concurrency"] = concurrency
+        results["e2e.parse_resume_file.concurrent"] = concurrent
+
+        if main.embedding_loader.get() is None:
+            results["e2e.semantic_score"] = {"skipped": "sentence-transformer model not loaded"}
+        else:
+            results["e2e.semantic_score"] = await timed(score, list(zip([d.text for d in documents], _job_texts(documents))))
+
+    main._shutdown_executors()
+    return results
+
+
+# Run in a fresh interpreter: import the app, then load and warm up both models
+_STARTUP_SCRIPT = """
+import json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter() - started
+for loader in main._MODEL_LOADERS:
+    loader.start()
+ready = all(loader.get() is not None for loader in main._MODEL_LOADERS)
+print(json.dumps({"import": imported, "ready": time.perf_counter() - started if ready else None}))
+main._shutdown_executors()
+"""
+
+
+def bench_startup(runs: int) -> dict:
+    imports, readies = [], []
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-c", _STARTUP_SCRIPT], cwd=_path.SERVICE_DIR, capture_output=True, text=True, check=True
+        )
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        imports.append(result["import"])
+        if result["ready"] is not None:
+            readies.append(result["ready"])
+    stages = {"startup.import": _summary(imports)}
+    stages["startup.ready"] = _summary(readies) if readies else {"skipped": "a model failed to load"}
+    return stages
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=_path.SERVICE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args) -> dict:
+    documents = make_documents(args.documents, seed=args.seed)
+    report = {
+        "meta": {
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "settings": {
+                name: getattr(settings, name)
+                for name in ("SKILL_ENGINE", "SPACY_PIPELINE", "PARSE_EXECUTOR", "PARSE_WORKERS", "EMBEDDING_MODEL_NAME")
+            },
+            "corpus": {
+                "documents": len(documents),
+                "seed": args.seed,
+                "pdf": sum(d.kind == "pdf" for d in documents),
+                "docx": sum(d.kind == "docx" for d in documents),
+                "bytes": sum(len(d.content) for d in documents),
+                "characters": sum(len(d.text) for d in documents),
+            },
+        },
+        "stages": bench_stages(documents, args.skip_encode),
+    }
+    if not args.skip_e2e:
+        report["stages"].update(asyncio.run(_bench_e2e(documents, args.concurrency)))
+    if args.startup_runs:
+        report["stages"].update(bench_startup(args.startup_runs))
+    return report
+
+
+def compare(base_path: str, new_path: str) -> None:
+    """Print the change in mean latency per stage between two reports."""
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"{'stage':36} {'base ms':>10} {'new ms':>10} {'change':>8}")
+    for stage, result in new["stages"].items():
+        before = base["stages"].get(stage, {}).get("meanMs")
+        after = result.get("meanMs")
+        if before is None or after is None:
+            print(f"{stage:36} {str(before):>10} {str(after):>10} {'n/a':>8}")
+            continue
+        change = (after - before) / before * 100 if before else 0.0
+        print(f"{stage:36} {before:>10.3f} {after:>10.3f} {change:>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--documents", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--skip-encode", action="store_true", help="skip the sentence-transformer stage")
+    parser.add_argument("--skip-e2e", action="store_true", help="skip the in-process ASGI requests")
+    parser.add_argument("--startup-runs", type=int, default=3, help="fresh processes timed for startup (0 skips)")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="compare two reports and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
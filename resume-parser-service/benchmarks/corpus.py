@@ -0,0 +1,95 @@
+"""
+Deterministic synthetic resume corpus for offline benchmarks.
+Resumes vary in length, section layout and skill density; the same seed
+always yields the same corpus so results can be compared between commits.
+"""
+import random
+from typing import List
+
+import _path  # noqa: F401  (puts the service directory on sys.path)
+import settings
+from skill_taxonomy import SkillTaxonomy
+
+_SKILLS = SkillTaxonomy.load(settings.SKILLS_TAXONOMY_PATH).skills
+
+_FIRST_NAMES = ["John", "Jane", "Aarav", "Sita", "Maria", "Wei", "Fatima", "Lucas", "Priya", "Tom"]
+_LAST_NAMES = ["Doe", "Smith", "Sharma", "Thapa", "Garcia", "Chen", "Khan", "Silva", "Patel", "Brown"]
+_TITLES = [
+    "Senior Software Engineer", "Data Scientist", "Junior Developer", "Lead Engineer",
+    "Product Designer", "Business Analyst", "Project Manager", "DevOps Consultant",
+]
+_COMPANIES = ["Tech Corp", "StartupXYZ", "Analytics Inc", "Research Lab", "CloudWorks", "FinSoft"]
+_DEGREES = [
+    "Bachelor of Science in Computer Science", "Master of Science in Data Science",
+    "B.Tech in Information Technology", "MBA, Business Administration", "Diploma in Graphic Design",
+]
+_MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+_FILLER = [
+    "Delivered features end to end, collaborating with design and product teams",
+    "Improved reliability and performance of core services while mentoring teammates",
+    "Owned planning, estimation and release of quarterly roadmap items",
+    "Wrote documentation and ran workshops for internal stakeholders",
+]
+
+# Header spellings seen in real resumes, per section
+_HEADERS = {
+    "summary": ["SUMMARY", "Professional Summary", "OBJECTIVE", "Profile", "About Me"],
+    "skills": ["SKILLS", "Technical Skills", "Core Competencies: Skills"],
+    "experience": ["EXPERIENCE", "Work Experience", "Professional Experience", "Employment History"],
+    "education": ["EDUCATION", "Academic Background", "Qualifications"],
+    "projects": ["PROJECTS", "Selected Projects"],
+}
+
+
+def _skill_mentions(rng: random.Random, density: float) -> List[str]:
+    count = max(1, int(len(_SKILLS) * density))
+    skills = rng.sample(_SKILLS, count)
+    # Vary casing the way people write them (Python, PYTHON, python)
+    return [rng.choice([s, s.title(), s.upper()]) for s in skills]
+
+
+def make_resume_text(rng: random.Random, length: int = 1, skill_density: float = 0.08) -> str:
+    """One resume; `length` scales the number of jobs/projects (1 = typical two-page resume)."""
+    name = f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}"
+    title = rng.choice(_TITLES)
+    years = rng.randint(1, 15)
+    skills = _skill_mentions(rng, skill_density)
+
+    sections = {
+        "summary": [
+            f"{title} with {years}+ years of experience in {', '.join(skills[:3])}.",
+            rng.choice(_FILLER) + ".",
+        ],
+        "skills": [", ".join(skills[i:i + 6]) for i in range(0, len(skills), 6)],
+        "experience": [],
+        "education": [f"{rng.choice(_DEGREES)}", f"State University, {2024 - years - rng.randint(0, 4)}"],
+        "projects": [],
+    }
+    for job in range(2 * length):
+        start = 2024 - years + job
+        sections["experience"].append(f"{rng.choice(_TITLES)} | {rng.choice(_COMPANIES)} | {start}-{start + 1}")
+        sections["experience"].append(f"{rng.choice(_MONTHS)} {start} - {rng.choice(['Present', str(start + 1)])}")
+        for _ in range(3):
+            sections["experience"].append(f"- {rng.choice(_FILLER)} using {rng.choice(skills)}.")
+    for _ in range(length):
+        sections["projects"].append(f"{rng.choice(skills)} dashboard: {rng.choice(_FILLER)}.")
+
+    order = ["summary", "skills", "experience", "education", "projects"]
+    if rng.random() < 0.5:
+        order = ["summary", "experience", "education", "skills", "projects"]
+
+    lines = [name, title, f"{name.lower().replace(' ', '.')}@example.com | +977-98000000", ""]
+    for section in order:
+        lines.append(rng.choice(_HEADERS[section]))
+        lines.extend(sections[section])
+        lines.append("")
+    return "\n".join(lines).strip()
+
+
+def make_corpus(size: int, seed: int = 42) -> List[str]:
+    """`size` resumes mixing short, typical and long documents and skill densities."""
+    rng = random.Random(seed)
+    return [
+        make_resume_text(rng, length=rng.choice([1, 1, 2, 4, 8]), skill_density=rng.choice([0.03, 0.08, 0.2]))
+        for _ in range(size)
+    ]
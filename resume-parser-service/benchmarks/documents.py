@@ -0,0 +1,120 @@
+"""
+PDF and DOCX renderings of the synthetic resume corpus, built with the
+standard library only so the bytes are identical on every machine.
+
+PDFs are uncompressed, one Helvetica text line per resume line and
+LINES_PER_PAGE lines per page; DOCX files hold one paragraph per line. Both
+extract back to the original text with pdfplumber / docx2txt.
+"""
+import io
+import random
+import zipfile
+from typing import List, NamedTuple
+from xml.sax.saxutils import escape
+
+from corpus import make_resume_text
+
+LINES_PER_PAGE = 50
+
+
+class Document(NamedTuple):
+    name: str
+    kind: str  # "pdf" or "docx"
+    content: bytes
+    text: str
+
+
+def _pdf_string(line: str) -> str:
+    line = line.encode("latin-1", "replace").decode("latin-1")
+    return "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def make_pdf(text: str) -> bytes:
+    """A letter-size PDF with the lines of text, LINES_PER_PAGE per page."""
+    lines = text.split("\n")
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+
+    # Object numbers: 1 catalog, 2 page tree, 3 font, then a page and its content stream per page
+    objects = {}
+    page_ids = []
+    for number, page_lines in enumerate(pages):
+        page_id, content_id = 4 + 2 * number, 5 + 2 * number
+        page_ids.append(page_id)
+        commands = ["BT", "/F1 10 Tf", "14 TL", "50 750 Td"]
+        for line in page_lines:
+            commands.append(f"{_pdf_string(line)} Tj T*")
+        commands.append("ET")
+        stream = "\n".join(commands).encode("latin-1")
+        objects[content_id] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode()
+    objects[1] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[2] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+    objects[3] = b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = out.tell()
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (object_id, objects[object_id]))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for object_id in sorted(objects):
+        out.write(b"%010d 00000 n \n" % offsets[object_id])
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+
+def make_docx(text: str) -> bytes:
+    """A minimal Word document with one paragraph per line of text."""
+    paragraphs = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' if line else "<w:p/>"
+        for line in text.split("\n")
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{paragraphs}</w:body></w:document>"
+    )
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        # Fixed timestamps keep the bytes reproducible
+        for name, data in (("[Content_Types].xml", _CONTENT_TYPES), ("_rels/.rels", _RELS), ("word/document.xml", document)):
+            archive.writestr(zipfile.ZipInfo(name, date_time=(2024, 1, 1, 0, 0, 0)), data)
+    return out.getvalue()
+
+
+def make_documents(size: int, seed: int = 42) -> List[Document]:
+    """`size` resumes alternating PDF and DOCX, with the corpus mix of lengths and skill densities."""
+    rng = random.Random(seed)
+    documents = []
+    for index in range(size):
+        text = make_resume_text(rng, length=rng.choice([1, 1, 2, 4, 8]), skill_density=rng.choice([0.03, 0.08, 0.2]))
+        if index % 2 == 0:
+            documents.append(Document(f"resume-{index:03d}.pdf", "pdf", make_pdf(text), text))
+        else:
+            documents.append(Document(f"resume-{index:03d}.docx", "docx", make_docx(text), text))
+    return documents
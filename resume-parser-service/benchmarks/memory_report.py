@@ -0,0 +1,145 @@
+"""
+Memory of the prefork server (serve.py) at several worker counts: how much of
+each worker is shared with the master and the other workers, and how much is
+its own.
+
+For every worker count, serve.py is started on a free port, waits until the
+models are loaded, and gets --requests parse and /semantic-score requests per
+worker (so the numbers include what serving touches, not just a fresh fork).
+Each process is then read from /proc/<pid>/smaps_rollup (Linux only):
+    rss     resident memory as top/ps report it (shared pages counted in every process)
+    shared  resident pages also mapped by another process (model weights, code)
+    unique  pages only this process maps (its USS: what killing it frees)
+    pss     rss with shared pages split between their processes
+The sum of pss over the master and workers is the real footprint. With
+--no-preload-too, each worker count is also run with the models loaded per
+worker, as `uvicorn --workers` would.
+
+Usage: python benchmarks/memory_report.py [--workers 1 4 8] [--requests 10] [--no-preload-too]
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+import _path
+from documents import make_documents
+
+_FIELDS = {
+    "rss": ("Rss",),
+    "pss": ("Pss",),
+    "shared": ("Shared_Clean", "Shared_Dirty"),
+    "unique": ("Private_Clean", "Private_Dirty"),
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _children(pid: int) -> list:
+    children = []
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    # The ppid follows the parenthesised command name
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            if ppid == pid:
+                children.append(int(entry))
+    return sorted(children)
+
+
+def _memory_mb(pid: int) -> dict:
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if rest.strip().endswith("kB"):
+                values[name] = int(rest.split()[0])
+    return {key: round(sum(values.get(name, 0) for name in names) / 1024, 1) for key, names in _FIELDS.items()}
+
+
+def _wait_ready(base_url: str, process: subprocess.Popen, workers: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"serve.py exited with code {process.returncode}")
+        try:
+            if len(_children(process.pid)) == workers and httpx.get(f"{base_url}/readyz", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"serve.py was not ready within {timeout} s")
+
+
+def _exercise(base_url: str, count: int) -> None:
+    documents = make_documents(min(count, 20), seed=7)
+
+    def request(i):
+        with httpx.Client(base_url=base_url, timeout=120) as client:
+            doc = documents[i % len(documents)]
+            client.post("/parse-resume-file", files={"file": (doc.name, doc.content)}).raise_for_status()
+            client.post("/semantic-score", json={"resumeText": doc.text, "jobText": "Python backend engineer"}).raise_for_status()
+
+    # Concurrent requests, so the kernel hands connections to every worker
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(request, range(count)))
+
+
+def measure(workers: int, preload: bool, requests: int, timeout: float) -> dict:
+    port = _free_port()
+    command = [sys.executable, "serve.py", "--workers", str(workers), "--port", str(port), "--host", "127.0.0.1"]
+    if not preload:
+        command.append("--no-preload")
+    # Only the models should be resident: no cached parses or embeddings
+    env = dict(os.environ, MODEL_LOADING="startup", PARSE_CACHE_PATH="", EMBEDDING_CACHE_MAX_ENTRIES="0", LOG_LEVEL="WARNING")
+    process = subprocess.Popen(command, cwd=_path.SERVICE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_ready(base_url, process, workers, timeout)
+        _exercise(base_url, requests * workers)
+        master = _memory_mb(process.pid)
+        children = [_memory_mb(pid) for pid in _children(process.pid)]
+    finally:
+        process.terminate()
+        process.wait(timeout=60)
+
+    return {
+        "workers": workers,
+        "preload": preload,
+        "master": master,
+        "perWorker": {key: round(sum(c[key] for c in children) / len(children), 1) for key in _FIELDS},
+        "totalPssMb": round(master["pss"] + sum(c["pss"] for c in children), 1),
+        "totalRssMb": round(master["rss"] + sum(c["rss"] for c in children), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--requests", type=int, default=10, help="parse + score requests per worker before measuring")
+    parser.add_argument("--no-preload-too", action="store_true", help="also measure with models loaded in every worker")
+    parser.add_argument("--timeout", type=float, default=300.0, help="seconds to wait for the server to get ready")
+    args = parser.parse_args()
+
+    runs = [(workers, True) for workers in args.workers]
+    if args.no_preload_too:
+        runs += [(workers, False) for workers in args.workers]
+    results = [measure(workers, preload, args.requests, args.timeout) for workers, preload in runs]
+    print(json.dumps({"cpus": os.cpu_count(), "unit": "MB", "runs": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""
+Shared test fixtures: requests to the app in-process over ASGI, without loading
+the spaCy or sentence-transformer models.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+
+async def _ready():
+    pass
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """post(path, **kwargs) -> httpx.Response from main.app; the model loaders are no-ops."""
+    import main
+
+    monkeypatch.setattr(main, "_require_embedding_model", _ready)
+    monkeypatch.setattr(main, "_require_nlp", _ready)
+
+    def post(path, **kwargs):
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as c:
+                return await c.post(path, **kwargs)
+
+        return asyncio.run(run())
+
+    return post
@@ -0,0 +1,101 @@
+"""
+Async resume downloader: one pooled httpx client shared by all requests, with
+streamed bodies capped at a maximum size, separate connect/read timeouts and
+bounded retries for transient failures.
+"""
+import asyncio
+import logging
+from typing import Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying: throttling and transient upstream errors
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class DownloadError(Exception):
+    """The resume could not be downloaded."""
+
+
+class DownloadTooLarge(DownloadError):
+    """The resume exceeds the configured maximum size."""
+
+
+class _RetryableStatus(Exception):
+    """Internal: a response status that should be retried."""
+
+
+class ResumeDownloader:
+    """Downloads resume files over a shared keep-alive connection pool."""
+
+    def __init__(
+        self,
+        max_bytes: int,
+        connect_timeout: float,
+        read_timeout: float,
+        max_connections: int,
+        retries: int,
+        retry_backoff: float = 0.5,
+    ):
+        self.max_bytes = max_bytes
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self._timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                limits=self._limits,
+                follow_redirects=True,
+            )
+        return self._client
+
+    async def fetch(self, url: str) -> Tuple[bytes, str]:
+        """Return (body, content-type), retrying connection errors and 429/5xx responses."""
+        attempt = 0
+        while True:
+            try:
+                return await self._fetch_once(url)
+            except DownloadTooLarge:
+                raise
+            except (httpx.TransportError, _RetryableStatus) as e:
+                if attempt >= self.retries:
+                    raise DownloadError(str(e)) from e
+                delay = self.retry_backoff * (2 ** attempt)
+                attempt += 1
+                logger.warning(f"Download attempt {attempt} failed ({e}); retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            except httpx.HTTPError as e:
+                raise DownloadError(str(e)) from e
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _fetch_once(self, url: str) -> Tuple[bytes, str]:
+        async with self.client.stream("GET", url) as response:
+            if response.status_code in _RETRY_STATUSES:
+                raise _RetryableStatus(f"HTTP {response.status_code} from {url}")
+            response.raise_for_status()
+
+            declared = response.headers.get("content-length")
+            if declared and declared.isdigit() and int(declared) > self.max_bytes:
+                raise DownloadTooLarge(f"Resume is {declared} bytes; limit is {self.max_bytes}")
+
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body.extend(chunk)
+                if len(body) > self.max_bytes:
+                    raise DownloadTooLarge(f"Resume exceeds the {self.max_bytes}-byte limit")
+
+            return bytes(body), response.headers.get("content-type", "")
@@ -0,0 +1,66 @@
+"""
+Chunked embeddings for texts longer than the model's sequence length.
+
+The sentence-transformer truncates its input (256 word pieces for
+all-MiniLM-L6-v2), so a long resume would be scored on its first few hundred
+words only. With EMBEDDING_CHUNK_WORDS set, a longer text is split into
+overlapping windows of at most that many words; each window is embedded (and
+cached) on its own and the window vectors are pooled into one.
+
+Window boundaries follow the content rather than fixed offsets: a window may
+end once it is half full, after any word pair whose hash picks it, and must
+end when full. Inserting or deleting words therefore only moves the
+boundaries up to the next picked pair, and the windows after it stay
+byte-identical, so an edited profile only re-encodes the windows it touched.
+"""
+import zlib
+from typing import List, Sequence
+
+import numpy as np
+
+# About one word pair in 16 may end a window
+_CUT_MASK = 0xF
+
+
+def chunk_text(text: str, max_words: int, overlap_words: int = 0) -> List[str]:
+    """
+    Split cleaned text into windows of at most max_words words, each starting
+    with the last overlap_words words of the previous one. Texts that fit in one
+    window are returned unchanged.
+    """
+    words = text.split()
+    if max_words <= 0 or len(words) <= max_words:
+        return [text]
+
+    min_words = max(1, max_words // 2)
+    # Every window must add new words
+    overlap_words = max(0, min(overlap_words, min_words - 1))
+
+    chunks = []
+    start = 0
+    for end in range(1, len(words) + 1):
+        size = end - start
+        if end == len(words) or size >= max_words or (size >= min_words and _is_cut(words[end - 2], words[end - 1])):
+            chunks.append(" ".join(words[start:end]))
+            start = end - overlap_words
+    return chunks
+
+
+def pool_embeddings(vectors: np.ndarray, method: str = "mean") -> np.ndarray:
+    """One L2-normalized vector from normalized window vectors: their mean or elementwise max."""
+    pooled = vectors.max(axis=0) if method == "max" else vectors.mean(axis=0)
+    return pooled / max(float(np.linalg.norm(pooled)), 1e-12)
+
+
+def pool_chunked(vectors: np.ndarray, counts: Sequence[int], method: str = "mean") -> np.ndarray:
+    """Pool consecutive rows of vectors, counts[i] of them for text i, into one row per text."""
+    rows, offset = [], 0
+    for count in counts:
+        rows.append(vectors[offset] if count == 1 else pool_embeddings(vectors[offset:offset + count], method))
+        offset += count
+    return np.vstack(rows).astype(np.float32, copy=False)
+
+
+def _is_cut(previous: str, word: str) -> bool:
+    # crc32 rather than hash(): boundaries must agree across processes and restarts
+    return zlib.crc32(f"{previous} {word}".encode("utf-8")) & _CUT_MASK == 0
@@ -0,0 +1,132 @@
+"""
+Micro-batching of concurrent embedding requests.
+
+Requests that each need a few texts encoded are coalesced into one batched
+encode: a batch is dispatched once max_items texts are waiting, or max_wait
+seconds after the first of them arrived. At most max_concurrent batches run
+at once; while they do, new requests keep accumulating, so the busier the
+model, the larger the batches. Each request gets back the rows for its own
+texts.
+"""
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Optional, Set
+
+import numpy as np
+
+from metrics import ENCODE_BATCH_REQUESTS, ENCODE_BATCH_TEXTS, STAGE_SECONDS
+
+
+class _Waiter:
+    def __init__(self, texts: List[str], future: asyncio.Future):
+        self.texts = texts
+        self.future = future
+        self.queued_at = time.perf_counter()
+
+
+class EncodeBatcher:
+    """Coalesce encode(texts) calls into batched run_batch(texts) calls."""
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[str]], Awaitable[np.ndarray]],
+        max_items: int,
+        max_wait: float,
+        max_concurrent: int,
+    ):
+        self._run_batch = run_batch
+        self.max_items = max(1, max_items)
+        self.max_wait = max_wait
+        self.max_concurrent = max(1, max_concurrent)
+        self._pending: List[_Waiter] = []
+        self._pending_texts = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # The pending texts have waited max_wait or fill a batch
+        self._due = False
+        self._running = 0
+        # The event loop keeps only weak references to tasks; these are the batches in flight
+        self._tasks: Set[asyncio.Future] = set()
+        self.batches = 0
+        self.texts = 0
+
+    async def encode(self, texts: List[str]) -> np.ndarray:
+        """Embeddings for texts (one row each), encoded together with concurrent requests."""
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(texts, loop.create_future())
+        self._pending.append(waiter)
+        self._pending_texts += len(texts)
+        if self._pending_texts >= self.max_items:
+            self._due = True
+        elif self._timer is None and not self._due:
+            self._timer = loop.call_later(self.max_wait, self._on_timer)
+        self._dispatch()
+        return await waiter.future
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "texts": self.texts,
+            "avg_batch_texts": round(self.texts / self.batches, 2) if self.batches else 0.0,
+            "pending": self._pending_texts,
+            "running": self._running,
+        }
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._due = True
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        # Requests whose callers have gone away are not encoded
+        if any(waiter.future.done() for waiter in self._pending):
+            self._pending = [waiter for waiter in self._pending if not waiter.future.done()]
+            self._pending_texts = sum(len(waiter.texts) for waiter in self._pending)
+
+        while self._due and self._pending and self._running < self.max_concurrent:
+            # Whole requests, up to max_items texts (a larger request goes alone)
+            batch, size = [], 0
+            while self._pending and (not batch or size + len(self._pending[0].texts) <= self.max_items):
+                waiter = self._pending.pop(0)
+                batch.append(waiter)
+                size += len(waiter.texts)
+            self._pending_texts -= size
+            self._running += 1
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            # What is left over has waited as long as this batch, so it goes next
+            self._due = bool(self._pending)
+
+        if not self._pending:
+            self._due = False
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    async def _run(self, batch: List[_Waiter]) -> None:
+        started = time.perf_counter()
+        texts = [text for waiter in batch for text in waiter.texts]
+        for waiter in batch:
+            STAGE_SECONDS.observe(started - waiter.queued_at, stage="encode_queue")
+        ENCODE_BATCH_TEXTS.observe(len(texts))
+        ENCODE_BATCH_REQUESTS.observe(len(batch))
+        self.batches += 1
+        self.texts += len(texts)
+        try:
+            vectors = await self._run_batch(texts)
+            offset = 0
+            for waiter in batch:
+                if not waiter.future.done():  # the client may have gone away
+                    waiter.future.set_result(vectors[offset:offset + len(waiter.texts)])
+                offset += len(waiter.texts)
+        except asyncio.CancelledError:
+            for waiter in batch:
+                waiter.future.cancel()
+            raise
+        except Exception as e:
+            for waiter in batch:
+                if not waiter.future.done():
+                    waiter.future.set_exception(e)
+        finally:
+            self._running -= 1
+            self._dispatch()
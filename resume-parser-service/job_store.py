@@ -0,0 +1,230 @@
+"""
+Persistent job-embedding store backed by a memory-mapped float32 matrix.
+Rows are L2-normalized job embeddings, so a matrix-vector product with a
+normalized resume embedding yields cosine scores for every stored job at once.
+
+On-disk layout (inside the store directory):
+    embeddings.f32  contiguous float32 matrix of shape (capacity, dim)
+    meta.json       model name, dim, row count, capacity and row -> job id list
+    store.lock      advisory lock: exclusive for writers, shared for readers
+
+Workers reopen the mapping whenever meta.json changes, so several uvicorn
+workers can share the same pages and see each other's upserts. Readers hold
+the lock shared, so a delete, which moves the last row into the hole, is never
+seen with the moved vector paired with the old id list.
+"""
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process dev setups only
+    fcntl = None
+
+_INITIAL_CAPACITY = 1024
+
+
+class JobEmbeddingStore:
+    """Upsert/delete job embeddings by id and rank them against a query vector."""
+
+    def __init__(self, directory: str, dim: int, model_name: str):
+        self.directory = directory
+        self.dim = dim
+        self.model_name = model_name
+        self._matrix_path = os.path.join(directory, "embeddings.f32")
+        self._meta_path = os.path.join(directory, "meta.json")
+        self._lock_path = os.path.join(directory, "store.lock")
+        self._lock = threading.RLock()
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._capacity = 0
+        self._matrix: Optional[np.memmap] = None
+        self._meta_version = None
+        self._read_depth = 0
+        self._read_lock_file = None
+
+        os.makedirs(directory, exist_ok=True)
+        with self._write_lock():
+            if not os.path.exists(self._meta_path):
+                self._resize(_INITIAL_CAPACITY)
+                self._write_meta()
+            self._refresh()
+
+    def __len__(self) -> int:
+        with self.reading():
+            return len(self._ids)
+
+    @property
+    def version(self) -> tuple:
+        """Changes whenever any process writes to the store."""
+        with self.reading():
+            return self._meta_version
+
+    @contextmanager
+    def reading(self):
+        """
+        Hold the store still: writers in every process wait until the block
+        ends. Use it around ids() and vectors() when both must describe the
+        same rows; do not write to the store inside it.
+        """
+        with self._lock:
+            if fcntl is not None and self._read_depth == 0:
+                self._read_lock_file = open(self._lock_path, "a")
+                fcntl.flock(self._read_lock_file, fcntl.LOCK_SH)
+            self._read_depth += 1
+            try:
+                self._refresh()
+                yield
+            finally:
+                self._read_depth -= 1
+                if self._read_lock_file is not None and self._read_depth == 0:
+                    # Closing the file releases the lock
+                    self._read_lock_file.close()
+                    self._read_lock_file = None
+
+    def ids(self) -> List[str]:
+        with self.reading():
+            return list(self._ids)
+
+    def vectors(self) -> np.ndarray:
+        """
+        Read-only view of the populated rows, in the same order as ids(). A
+        delete may move rows once the view is used outside reading().
+        """
+        with self.reading():
+            view = self._matrix[: len(self._ids)].view(np.ndarray)
+            view.flags.writeable = False
+            return view
+
+    def vectors_for(self, job_ids: List[str]) -> Tuple[List[str], np.ndarray]:
+        """Return the job_ids that are present in the store and their vectors."""
+        with self.reading():
+            present = [job_id for job_id in job_ids if job_id in self._rows]
+            rows = np.fromiter((self._rows[job_id] for job_id in present), dtype=np.int64, count=len(present))
+            return present, np.asarray(self._matrix[rows])
+
+    def upsert(self, job_ids: List[str], vectors: np.ndarray) -> None:
+        """Insert or overwrite the embeddings for job_ids (row-aligned with vectors)."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.shape != (len(job_ids), self.dim):
+            raise ValueError(f"Expected vectors of shape ({len(job_ids)}, {self.dim}), got {vectors.shape}")
+
+        with self._write_lock():
+            self._refresh()
+            for job_id, vector in zip(job_ids, vectors):
+                row = self._rows.get(job_id)
+                if row is None:
+                    row = len(self._ids)
+                    if row >= self._capacity:
+                        self._resize(self._capacity * 2)
+                    self._ids.append(job_id)
+                    self._rows[job_id] = row
+                self._matrix[row] = vector
+            self._matrix.flush()
+            self._write_meta()
+
+    def delete(self, job_ids: List[str]) -> int:
+        """Remove job_ids from the store; returns how many were present."""
+        removed = 0
+        with self._write_lock():
+            self._refresh()
+            for job_id in job_ids:
+                row = self._rows.pop(job_id, None)
+                if row is None:
+                    continue
+                # Move the last row into the hole to keep the matrix contiguous
+                last = len(self._ids) - 1
+                if row != last:
+                    moved_id = self._ids[last]
+                    self._matrix[row] = self._matrix[last]
+                    self._ids[row] = moved_id
+                    self._rows[moved_id] = row
+                self._ids.pop()
+                removed += 1
+            if removed:
+                self._matrix.flush()
+                self._write_meta()
+        return removed
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """Exact top-k by cosine score for a normalized query vector."""
+        with self.reading():
+            count = len(self._ids)
+            if count == 0 or k <= 0:
+                return []
+            scores = np.asarray(self._matrix[:count]) @ np.asarray(query, dtype=np.float32)
+            top = top_k_indices(scores, k)
+            return [(self._ids[i], float(scores[i])) for i in top]
+
+    # --- internals ---
+
+    @contextmanager
+    def _write_lock(self):
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self._lock_path, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _refresh(self) -> None:
+        """Reload ids and remap the matrix if another process changed the store."""
+        stat = os.stat(self._meta_path)
+        version = (stat.st_ino, stat.st_mtime_ns)
+        if version == self._meta_version and self._matrix is not None:
+            return
+
+        with open(self._meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta["dim"] != self.dim or meta["model"] != self.model_name:
+            raise ValueError(
+                f"Job store at {self.directory} was built with {meta['model']} (dim {meta['dim']}); "
+                f"remove it to rebuild for {self.model_name} (dim {self.dim})"
+            )
+
+        self._ids = meta["ids"]
+        self._rows = {job_id: row for row, job_id in enumerate(self._ids)}
+        if meta["capacity"] != self._capacity or self._matrix is None:
+            self._capacity = meta["capacity"]
+            self._matrix = np.memmap(self._matrix_path, dtype=np.float32, mode="r+", shape=(self._capacity, self.dim))
+        self._meta_version = version
+
+    def _resize(self, capacity: int) -> None:
+        with open(self._matrix_path, "ab") as f:
+            f.truncate(capacity * self.dim * np.dtype(np.float32).itemsize)
+        self._capacity = capacity
+        self._matrix = np.memmap(self._matrix_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+    def _write_meta(self) -> None:
+        meta = {
+            "model": self.model_name,
+            "dim": self.dim,
+            "count": len(self._ids),
+            "capacity": self._capacity,
+            "ids": self._ids,
+        }
+        tmp_path = f"{self._meta_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path)
+        stat = os.stat(self._meta_path)
+        self._meta_version = (stat.st_ino, stat.st_mtime_ns)
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first."""
+    k = min(k, scores.shape[0])
+    if k < scores.shape[0]:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(scores.shape[0])
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
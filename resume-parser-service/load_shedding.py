@@ -0,0 +1,227 @@
+"""
+Load shedding: admission control in front of the worker pools and a request
+body limit for uploads.
+
+Every parse-pool and encode-pool task first takes a slot of its pool's
+WorkGate. A gate has as many slots as its pool has workers, so tasks wait in
+the gate's FIFO rather than inside the executor, where their wait could not be
+seen. AdmissionMiddleware refuses new requests for an overloaded pool before
+their body is read: with 429 when too many tasks already wait, with 503 when
+the oldest has waited too long. Both signals follow the live queue, so the
+service accepts work again as soon as the backlog drains.
+"""
+import asyncio
+import concurrent.futures
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Optional, Sequence, Tuple
+
+from starlette.responses import JSONResponse
+
+from metrics import POOL_QUEUE_SECONDS, REQUESTS_REJECTED
+
+
+class Overloaded(Exception):
+    """New work for a pool is refused; status is 429 or 503."""
+
+    def __init__(self, status: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class WorkGate:
+    """FIFO of tasks waiting for one of a pool's slots, with admission checks on its length and age."""
+
+    def __init__(self, name: str, slots: int, max_queued: int = 0, max_queue_seconds: float = 0.0):
+        self.name = name
+        self.slots = max(1, slots)
+        self.max_queued = max_queued
+        self.max_queue_seconds = max_queue_seconds
+        self._waiters: "deque[Tuple[asyncio.Future, float]]" = deque()
+        self.running = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def oldest_wait(self) -> float:
+        """Seconds the longest-waiting task has been queued (0 when none waits)."""
+        return time.perf_counter() - self._waiters[0][1] if self._waiters else 0.0
+
+    def check(self) -> None:
+        """Raise Overloaded if new work for this pool should be refused (0 disables either limit)."""
+        if self.max_queued and self.queued >= self.max_queued:
+            REQUESTS_REJECTED.inc(reason="queue_full", pool=self.name)
+            raise Overloaded(
+                429, f"Too many {self.name} tasks waiting ({self.queued}); retry later", self._retry_after()
+            )
+        waited = self.oldest_wait()
+        if self.max_queue_seconds and waited > self.max_queue_seconds:
+            REQUESTS_REJECTED.inc(reason="queue_latency", pool=self.name)
+            raise Overloaded(
+                503, f"The {self.name} queue is {waited:.1f} s behind; retry later", self._retry_after()
+            )
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one of the pool's slots, waiting in FIFO order for one to free up."""
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> dict:
+        return {"running": self.running, "queued": self.queued, "oldest_wait": round(self.oldest_wait(), 3)}
+
+    def _retry_after(self) -> int:
+        return max(1, math.ceil(self.oldest_wait()))
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting in FIFO order; pair with release() or release_when_done()."""
+        if self.running < self.slots and not self._waiters:
+            self.running += 1
+            POOL_QUEUE_SECONDS.observe(0.0, pool=self.name)
+            return
+        entry = (asyncio.get_running_loop().create_future(), time.perf_counter())
+        self._waiters.append(entry)
+        try:
+            await entry[0]
+        except asyncio.CancelledError:
+            if entry[0].done() and not entry[0].cancelled():
+                # The slot was handed over just as the caller went away
+                self.release()
+            else:
+                self._waiters.remove(entry)
+            raise
+
+    def release_when_done(self, future: concurrent.futures.Future) -> None:
+        """
+        Give the slot back when the pool finishes future, not when its caller
+        stops waiting: a task that timed out still occupies its worker.
+        """
+        loop = asyncio.get_running_loop()
+
+        def done(_):
+            try:
+                loop.call_soon_threadsafe(self.release)
+            except RuntimeError:
+                pass  # the event loop has already closed
+
+        future.add_done_callback(done)
+
+    def release(self) -> None:
+        # Hand the slot straight to the next live waiter, so the count stays the same
+        while self._waiters:
+            future, queued_at = self._waiters.popleft()
+            if not future.done():
+                POOL_QUEUE_SECONDS.observe(time.perf_counter() - queued_at, pool=self.name)
+                future.set_result(None)
+                return
+        self.running -= 1
+
+
+class AdmissionMiddleware:
+    """Refuse POSTs to the paths of an overloaded pool before their body is read."""
+
+    def __init__(self, app, routes: Sequence[Tuple[str, WorkGate]]):
+        self.app = app
+        # (path prefix, gate) pairs
+        self.routes = routes
+
+    async def __call__(self, scope, receive, send):
+        gate = self._gate(scope)
+        if gate is not None:
+            try:
+                gate.check()
+            except Overloaded as e:
+                response = JSONResponse({"detail": e.detail}, status_code=e.status, headers={"Retry-After": str(e.retry_after)})
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+    def _gate(self, scope) -> Optional[WorkGate]:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            return None
+        for prefix, gate in self.routes:
+            if scope["path"].startswith(prefix):
+                return gate
+        return None
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+class UploadLimitMiddleware:
+    """
+    Reject multipart uploads larger than max_bytes(path) with 413 while they
+    stream in: from Content-Length when the client sends one, otherwise as soon
+    as the received body passes the limit, before it is spooled in full. The
+    body may exceed the limit by allowance bytes of multipart framing (boundaries
+    and part headers); the 413 reports the configured limit.
+    """
+
+    def __init__(self, app, max_bytes, allowance: int = 0):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.allowance = allowance
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _is_multipart(scope):
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.max_bytes(scope["path"])
+        body_limit = limit + self.allowance
+        length = _header(scope, b"content-length")
+        if length is not None and length.isdigit() and int(length) > body_limit:
+            await self._reject(scope, receive, send, limit)
+            return
+
+        received = 0
+        exceeded = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > body_limit:
+                    exceeded = True
+                    raise _BodyTooLarge()
+            return message
+
+        async def guarded_send(message):
+            # Whatever the app makes of the aborted body is replaced by the 413 below
+            if not exceeded:
+                await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except _BodyTooLarge:
+            pass
+        if exceeded:
+            await self._reject(scope, receive, send, limit)
+
+    async def _reject(self, scope, receive, send, limit: int) -> None:
+        REQUESTS_REJECTED.inc(reason="upload_too_large", pool="")
+        response = JSONResponse(
+            {"detail": f"Upload exceeds the {limit} byte limit"}, status_code=413, headers={"Connection": "close"}
+        )
+        await response(scope, receive, send)
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", ()):
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _is_multipart(scope) -> bool:
+    return (_header(scope, b"content-type") or "").lower().startswith("multipart/")
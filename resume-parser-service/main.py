@@ -3,33 +3,72 @@ Resume Parser Microservice using FastAPI + spaCy
 Extracts structured data from resumes (PDF/DOCX) for auto-filling job seeker profiles.
 Also provides semantic similarity scoring via MiniLM embeddings.
 """
-from fastapi import FastAPI, HTTPException, UploadFile, File
+import time
+
+# Startup time is measured from here (see /readyz)
+_IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, UploadFile, File, Header
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, HttpUrl
-import requests
-import tempfile
-import os
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field, HttpUrl
 import re
-from typing import List, Optional
+import asyncio
+import hmac
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
 import logging
 import numpy as np
 
-# NLP and document parsing libraries
-import spacy
-from spacy.matcher import PhraseMatcher
-import pdfplumber
-import docx2txt
-
-# Sentence-transformer for semantic similarity
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+import settings
+import metrics
+import resume_parsing
+import request_profiling
+from resume_parsing import DocumentTooLargeError, UnsupportedDocumentError
+from skill_taxonomy import SkillTaxonomyError
+from downloader import DownloadError, DownloadTooLarge, ResumeDownloader
+from embedding_cache import EmbeddingCache
+from embedding_chunks import chunk_text, pool_chunked
+from encode_batcher import EncodeBatcher
+from parse_cache import ParseResultCache
+from parse_jobs import ParseJob, ParseJobQueue, QueueFull
+from job_store import JobEmbeddingStore
+from load_shedding import AdmissionMiddleware, UploadLimitMiddleware, WorkGate
+from request_profiling import ProfilingMiddleware
+from model_loader import ModelLoader
+from ann_index import IVFIndex, default_nlist, recall_report
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=settings.LOG_LEVEL.upper())
 logger = logging.getLogger(__name__)
 
+# Parse-pool workers started with "spawn" re-import this file as __mp_main__;
+# they only need spaCy, which resume_parsing.init_worker loads on its own.
+_IS_POOL_WORKER = __name__ == "__mp_main__"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info(f"✓ App imported in {IMPORT_SECONDS:.2f} s; loading models ({settings.MODEL_LOADING})")
+    if settings.MODEL_LOADING == "startup":
+        await asyncio.gather(*(_run_in_executor(None, loader.get) for loader in _MODEL_LOADERS))
+    elif settings.MODEL_LOADING != "lazy":
+        for loader in _MODEL_LOADERS:
+            loader.start()
+    parse_jobs.start()
+    yield
+    await parse_jobs.stop()
+    await resume_downloader.aclose()
+    _shutdown_executors()
+
+
 # Initialize FastAPI app
-app = FastAPI(title="Resume Parser Service", version="1.0.0")
+app = FastAPI(title="Resume Parser Service", version="1.0.0", lifespan=lifespan)
 
 # CORS configuration
 app.add_middleware(
@@ -40,49 +79,84 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Load spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-    logger.info("✓ spaCy model loaded successfully")
-except OSError:
-    logger.error("✗ spaCy model not found. Run: python -m spacy download en_core_web_sm")
-    nlp = None
+@app.middleware("http")
+async def track_in_flight(request, call_next):
+    metrics.IN_FLIGHT.inc()
+    try:
+        return await call_next(request)
+    finally:
+        metrics.IN_FLIGHT.dec()
+
+# --- Models ---
+# Loaded in the background once the app starts, before it, or on first use
+# (MODEL_LOADING), so importing this module stays fast.
+_SPACY_NOT_LOADED = "spaCy model not loaded. Run: python -m spacy download en_core_web_sm"
+
+
+def _load_spacy():
+    pipeline = resume_parsing.load_nlp()
+    if pipeline is None:
+        raise RuntimeError(_SPACY_NOT_LOADED)
+    return pipeline
+
+
+def _warm_up_parsing(_nlp):
+    """Compile the skill taxonomy and parse a sample; in process mode, also start the pool workers."""
+    resume_parsing.warm_up()
+    if settings.PARSE_EXECUTOR == "process":
+        # Each worker loads spaCy in resume_parsing.init_worker; wait until one can take work
+        try:
+            _get_parse_executor().submit(resume_parsing.warm_up).result()
+        except Exception as e:
+            logger.warning(f"Parse pool warmup failed: {e}")
+
+
+def _load_sentence_transformer():
+    if settings.EMBEDDING_BACKEND == "onnx":
+        from onnx_encoder import load_onnx_encoder
+
+        return load_onnx_encoder(
+            settings.EMBEDDING_MODEL_NAME,
+            settings.ONNX_MODEL_DIR,
+            quantize=settings.ONNX_QUANTIZE,
+            intra_op_threads=settings.ONNX_INTRA_OP_THREADS,
+            inter_op_threads=settings.ONNX_INTER_OP_THREADS,
+        )
+
+    # Deferred: importing sentence-transformers (and torch) alone takes seconds
+    from sentence_transformers import SentenceTransformer
 
-# Load MiniLM sentence-transformer model (singleton, loaded once at startup)
-try:
     # Prefer the locally cached model so startup also works without network.
-    st_model = SentenceTransformer("all-MiniLM-L6-v2", local_files_only=True)
-    logger.info("✓ MiniLM sentence-transformer model loaded successfully")
-except Exception as e:
-    logger.error(f"✗ Failed to load sentence-transformer model: {e}")
-    st_model = None
-
-# Comprehensive skills dictionary for PhraseMatcher
-SKILLS_DATABASE = [
-    # Programming Languages
-    "python", "javascript", "java", "c++", "c#", "ruby", "php", "swift", "kotlin",
-    "go", "rust", "typescript", "scala", "r", "matlab", "sql", "html", "css",
-    # Web Frameworks
-    "react", "angular", "vue", "node.js", "express", "django", "flask", "fastapi",
-    "spring boot", "asp.net", "laravel", "rails", "next.js", "nuxt.js",
-    # Databases
-    "mongodb", "mysql", "postgresql", "oracle", "sql server", "redis", "cassandra",
-    "dynamodb", "firebase", "elasticsearch", "mariadb", "sqlite",
-    # Cloud & DevOps
-    "aws", "azure", "gcp", "docker", "kubernetes", "jenkins", "terraform", "ansible",
-    "ci/cd", "git", "github", "gitlab", "bitbucket", "linux", "bash",
-    # Mobile
-    "android", "ios", "react native", "flutter", "xamarin", "ionic",
-    # Data Science & AI
-    "machine learning", "deep learning", "data science", "tensorflow", "pytorch",
-    "scikit-learn", "pandas", "numpy", "jupyter", "tableau", "power bi", "nlp",
-    # Other Technologies
-    "rest api", "graphql", "microservices", "agile", "scrum", "jira", "api",
-    "testing", "junit", "selenium", "jest", "mocha", "cypress",
-    # Soft Skills
-    "leadership", "communication", "teamwork", "problem solving", "project management",
-    "time management", "analytical thinking", "creativity", "adaptability"
-]
+    return SentenceTransformer(settings.EMBEDDING_MODEL_NAME, local_files_only=True)
+
+
+def _warm_up_sentence_transformer(model):
+    model.encode(["Python developer with FastAPI experience"], normalize_embeddings=True)
+
+
+spacy_loader = ModelLoader("spaCy", _load_spacy, _warm_up_parsing)
+embedding_loader = ModelLoader("sentence-transformer", _load_sentence_transformer, _warm_up_sentence_transformer)
+_MODEL_LOADERS = (spacy_loader, embedding_loader)
+
+# Shared pooled HTTP client for /parse-resume downloads
+resume_downloader = ResumeDownloader(
+    max_bytes=settings.DOWNLOAD_MAX_BYTES,
+    connect_timeout=settings.DOWNLOAD_CONNECT_TIMEOUT,
+    read_timeout=settings.DOWNLOAD_READ_TIMEOUT,
+    max_connections=settings.DOWNLOAD_MAX_CONNECTIONS,
+    retries=settings.DOWNLOAD_RETRIES,
+)
+
+# Normalized embeddings keyed by (model, cleaned text); shared by every encode path
+embedding_cache = EmbeddingCache(
+    max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+    max_bytes=settings.EMBEDDING_CACHE_MAX_BYTES,
+)
+
+# Parse results of previously seen documents, persisted across restarts
+parse_cache = None
+if not _IS_POOL_WORKER and settings.PARSE_CACHE_PATH:
+    parse_cache = ParseResultCache(settings.PARSE_CACHE_PATH, max_bytes=settings.PARSE_CACHE_MAX_BYTES)
 
 # Request/Response models
 class ParseResumeRequest(BaseModel):
@@ -99,6 +173,36 @@ class ParseResumeResponse(BaseModel):
     educationFound: bool = False
     experienceFound: bool = False
 
+class ParseJobResponse(BaseModel):
+    jobId: str
+    # queued | processing | done | failed
+    status: str
+    source: str
+    createdAt: float
+    startedAt: Optional[float] = None
+    finishedAt: Optional[float] = None
+    result: Optional[ParseResumeResponse] = None
+    error: Optional[str] = None
+    # Status the synchronous endpoint would have returned for the failure
+    errorStatus: Optional[int] = None
+
+class ParseResumeBatchRequest(BaseModel):
+    resumeUrls: List[HttpUrl] = Field(..., min_length=1, max_length=settings.PARSE_BATCH_MAX_ITEMS)
+
+class ParseResumeBatchItem(BaseModel):
+    index: int
+    # Resume URL or uploaded filename
+    source: str
+    # Status the single-document endpoint would have returned for this document
+    status: int
+    result: Optional[ParseResumeResponse] = None
+    error: Optional[str] = None
+
+class ParseResumeBatchResponse(BaseModel):
+    results: List[ParseResumeBatchItem]
+    parsed: int
+    failed: int
+
 # --- Semantic similarity schemas ---
 class SemanticScoreRequest(BaseModel):
     resumeText: str
@@ -108,17 +212,447 @@ class SemanticScoreResponse(BaseModel):
     semanticScore: float
     semanticPercent: int
 
+class SemanticScoreBatchJob(BaseModel):
+    id: str
+    jobText: str
+
+class SemanticScoreBatchRequest(BaseModel):
+    resumeText: str
+    jobs: List[SemanticScoreBatchJob] = Field(..., max_length=settings.SEMANTIC_BATCH_MAX_JOBS)
+
+class SemanticScoreBatchItem(BaseModel):
+    id: str
+    semanticScore: float
+    semanticPercent: int
+
+class SemanticScoreBatchResponse(BaseModel):
+    results: List[SemanticScoreBatchItem]
+
+class SemanticScoreStreamError(BaseModel):
+    """NDJSON line for a job that could not be scored (the 200 status is already sent)."""
+    id: str
+    error: str
+
+# --- Job embedding store / recommendation schemas ---
+class JobEmbeddingUpsertRequest(BaseModel):
+    jobs: List[SemanticScoreBatchJob]
+
+class JobEmbeddingUpsertResponse(BaseModel):
+    upserted: int
+    removed: int
+    total: int
+
+class JobEmbeddingDeleteResponse(BaseModel):
+    deleted: bool
+    total: int
+
+class RecommendRequest(BaseModel):
+    resumeText: str
+    topK: int = Field(default=20, ge=1, le=settings.RECOMMEND_MAX_K)
+    # Lists probed by the approximate index; higher = better recall, slower
+    nprobe: Optional[int] = Field(default=None, ge=1)
+
+class IndexRebuildRequest(BaseModel):
+    nlist: Optional[int] = Field(default=None, ge=1)
+    iterations: int = Field(default=10, ge=1, le=50)
+
+class IndexRebuildResponse(BaseModel):
+    jobs: int
+    nlist: int
+    minListSize: int
+    maxListSize: int
+
+class SkillTaxonomyResponse(BaseModel):
+    version: str
+    skills: int
+    aliases: int
+    categories: int
+
+class IndexRecallRequest(BaseModel):
+    k: int = Field(default=10, ge=1, le=settings.RECOMMEND_MAX_K)
+    nprobe: List[int] = [1, 4, 8, 16, 32, 64]
+    # Realistic queries; when omitted, a sample of stored job embeddings is used
+    resumeTexts: List[str] = []
+    sampleSize: int = Field(default=200, ge=1, le=5000)
+
 @app.get("/")
 def health_check():
-    """Health check endpoint"""
+    """Service overview: model state, caches, parse jobs and skill taxonomy"""
     return {
-        "status": "healthy",
+        "status": _service_status(),
         "service": "Resume Parser",
-        "spacy_loaded": nlp is not None,
-        "sentence_transformer_loaded": st_model is not None,
+        "spacy_loaded": spacy_loader.ready,
+        "sentence_transformer_loaded": embedding_loader.ready,
+        "embedding_cache": embedding_cache.stats(),
+        "encode_batching": encode_batcher.stats(),
+        "pools": {"parse": parse_gate.stats(), "encode": encode_gate.stats()},
+        "parse_cache": parse_cache.stats() if parse_cache else None,
+        "parse_jobs": parse_jobs.stats(),
+        "skill_taxonomy": resume_parsing.get_skill_matcher().taxonomy.stats() if spacy_loader.ready else None,
     }
 
 
+@app.get("/healthz")
+def liveness():
+    """Liveness probe: the process is up and serving requests. Never touches the models."""
+    return {"status": "alive"}
+
+
+@app.get("/readyz")
+def readiness():
+    """
+    Readiness probe: 200 once the models are loaded and warmed up, 503 while
+    they load or if one failed. With MODEL_LOADING=lazy the service is ready
+    before first use, unless a model already failed to load.
+    """
+    ready = _is_ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "ready": ready,
+            "models": {loader.name: loader.status() for loader in _MODEL_LOADERS},
+            "startup": _startup_report(),
+        },
+    )
+
+
+def _is_ready() -> bool:
+    if settings.MODEL_LOADING == "lazy":
+        return not any(loader.state == "failed" for loader in _MODEL_LOADERS)
+    return all(loader.ready for loader in _MODEL_LOADERS)
+
+
+def _service_status() -> str:
+    if _is_ready():
+        return "healthy"
+    if any(loader.state == "failed" for loader in _MODEL_LOADERS):
+        return "degraded"
+    return "starting"
+
+
+def _startup_report() -> dict:
+    """Seconds to import this module and, once every model is loaded, to become ready."""
+    ready_seconds = None
+    if all(loader.ready for loader in _MODEL_LOADERS):
+        ready_seconds = round(max(loader.finished_at for loader in _MODEL_LOADERS) - _IMPORT_STARTED, 3)
+    return {"importSeconds": round(IMPORT_SECONDS, 3), "readySeconds": ready_seconds}
+
+
+async def _load_model(loader: ModelLoader):
+    """The loader's model, waiting for (or, when lazy, doing) the load off the event loop."""
+    if loader.ready:
+        return loader.model
+    return await _run_in_executor(None, loader.get)
+
+
+async def _require_nlp():
+    if await _load_model(spacy_loader) is None:
+        raise HTTPException(status_code=500, detail=spacy_loader.error or _SPACY_NOT_LOADED)
+
+
+async def _require_embedding_model():
+    if await _load_model(embedding_loader) is None:
+        raise HTTPException(status_code=500, detail="Sentence-transformer model not loaded.")
+
+
+def _collect_service_metrics():
+    """Cache and job-queue figures kept by those objects themselves, read at scrape time."""
+    caches = [("embedding", embedding_cache)] + ([("parse", parse_cache)] if parse_cache else [])
+    yield ("resume_parser_cache_hits_total", "counter", "Cache lookups that found an entry",
+           [({"cache": name}, cache.hits) for name, cache in caches])
+    yield ("resume_parser_cache_misses_total", "counter", "Cache lookups that found no entry",
+           [({"cache": name}, cache.misses) for name, cache in caches])
+    yield ("resume_parser_cache_evictions_total", "counter", "Entries evicted to stay within cache limits",
+           [({"cache": name}, cache.evictions) for name, cache in caches])
+    jobs = parse_jobs.stats()
+    yield ("resume_parser_parse_jobs", "gauge", "Parse jobs waiting or running",
+           [({"state": "queued"}, jobs["queued"]), ({"state": "processing"}, jobs["processing"])])
+    yield ("resume_parser_parse_jobs_rejected_total", "counter", "Parse job submissions rejected with 429",
+           [({}, jobs["rejected"])])
+    startup = _startup_report()
+    yield ("resume_parser_startup_seconds", "gauge", "Seconds to import the app and to become ready",
+           [({"phase": phase}, startup[key]) for phase, key in (("import", "importSeconds"), ("ready", "readySeconds"))
+            if startup[key] is not None])
+    gates = (parse_gate, encode_gate)
+    yield ("resume_parser_pool_tasks", "gauge", "Pool tasks running or waiting for a worker",
+           [({"pool": gate.name, "state": state}, count) for gate in gates
+            for state, count in (("running", gate.running), ("queued", gate.queued))])
+    yield ("resume_parser_pool_queue_oldest_seconds", "gauge", "How long the oldest waiting pool task has waited",
+           [({"pool": gate.name}, gate.oldest_wait()) for gate in gates])
+    yield ("resume_parser_model_ready", "gauge", "1 once a model is loaded and warmed up",
+           [({"model": loader.name}, int(loader.ready)) for loader in _MODEL_LOADERS])
+    yield ("resume_parser_model_load_seconds", "gauge", "Seconds spent loading and warming up each model",
+           [({"model": loader.name, "phase": phase}, seconds) for loader in _MODEL_LOADERS
+            for phase, seconds in (("load", loader.load_seconds), ("warmup", loader.warmup_seconds))
+            if seconds is not None])
+
+
+metrics.REGISTRY.add_collector(_collect_service_metrics)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Prometheus metrics: per-stage latency histograms, byte/page/error counters, caches and in-flight requests."""
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+# --- Worker pools ---
+# CPU-bound work never runs on the event loop: parsing (text extraction + spaCy)
+# goes to the parse pool, encoding and vector search to the encode thread pool.
+_parse_executor: Optional[Executor] = None
+_encode_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_parse_executor() -> Executor:
+    """Process pool (one spaCy model per worker) or thread pool, per PARSE_EXECUTOR."""
+    global _parse_executor
+    with _executor_lock:
+        if _parse_executor is None:
+            if settings.PARSE_EXECUTOR == "process":
+                _parse_executor = ProcessPoolExecutor(
+                    max_workers=settings.PARSE_WORKERS,
+                    mp_context=multiprocessing.get_context(settings.PARSE_MP_START_METHOD),
+                    initializer=resume_parsing.init_worker,
+                )
+            else:
+                _parse_executor = ThreadPoolExecutor(
+                    max_workers=settings.PARSE_WORKERS,
+                    thread_name_prefix="parse",
+                )
+        return _parse_executor
+
+
+def _get_encode_executor() -> Executor:
+    """Thread pool for embedding and vector search (torch/numpy release the GIL)."""
+    global _encode_executor
+    with _executor_lock:
+        if _encode_executor is None:
+            _encode_executor = ThreadPoolExecutor(
+                max_workers=settings.ENCODE_WORKERS,
+                thread_name_prefix="encode",
+            )
+        return _encode_executor
+
+
+def _shutdown_executors():
+    global _parse_executor, _encode_executor
+    with _executor_lock:
+        for executor in (_parse_executor, _encode_executor):
+            if executor is not None:
+                executor.shutdown(wait=False)
+        _parse_executor = None
+        _encode_executor = None
+
+
+async def _run_in_executor(executor: Optional[Executor], fn, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(fn, *args))
+
+
+async def _run_parse(fn, *args):
+    """
+    Run a parsing stage in the parse pool once a worker is free (parse_gate),
+    within PARSE_TIMEOUT; replaces the pool if a worker died. The gate slot is
+    held until the worker finishes, so a timed-out stage still counts as load.
+    For a profiled request the stage runs under cProfile in the worker and its
+    stats are added to the request's profile.
+    """
+    global _parse_executor
+    profile = request_profiling.current()
+    if profile is not None:
+        fn, args = request_profiling.run_profiled, (fn, *args)
+    await parse_gate.acquire()
+    executor = None
+    try:
+        try:
+            executor = _get_parse_executor()
+            in_processes = isinstance(executor, ProcessPoolExecutor)
+            # Workers record metrics in their own process; fold them into ours
+            future = executor.submit(resume_parsing.run_with_metrics, fn, *args) if in_processes else executor.submit(fn, *args)
+        except BaseException:
+            parse_gate.release()
+            raise
+        # The slot stays taken until the worker is done, even past PARSE_TIMEOUT
+        parse_gate.release_when_done(future)
+        result = await _with_timeout(asyncio.wrap_future(future), settings.PARSE_TIMEOUT, "Parsing")
+    except BrokenProcessPool:
+        with _executor_lock:
+            if _parse_executor is executor:
+                _parse_executor = None
+        raise
+    if in_processes:
+        result, recorded = result
+        metrics.REGISTRY.merge(recorded)
+    if profile is not None:
+        result, stats = result
+        profile.add(stats)
+    return result
+
+
+async def _run_encode(fn, *args):
+    async with encode_gate.slot():
+        return await _run_in_executor(_get_encode_executor(), fn, *args)
+
+
+async def _with_timeout(awaitable, seconds: float, stage: str):
+    """Await within seconds (0 = no limit). A task already running in the pool still finishes there."""
+    if not seconds:
+        return await awaitable
+    # Not wait_for(): a TimeoutError raised by the task itself must keep its own message
+    task = asyncio.ensure_future(awaitable)
+    try:
+        done, _ = await asyncio.wait({task}, timeout=seconds)
+    finally:
+        if not task.done():
+            task.cancel()
+    if not done:
+        raise asyncio.TimeoutError(f"{stage} took longer than {seconds:g} s")
+    return task.result()
+
+
+# --- Load shedding ---
+# Pool tasks wait here for a free worker, so the queue is visible; requests for
+# an overloaded pool are refused before their body is read (load_shedding.py)
+parse_gate = WorkGate("parse", settings.PARSE_WORKERS, settings.ADMISSION_MAX_QUEUED, settings.ADMISSION_MAX_QUEUE_SECONDS)
+encode_gate = WorkGate("encode", settings.ENCODE_WORKERS, settings.ADMISSION_MAX_QUEUED, settings.ADMISSION_MAX_QUEUE_SECONDS)
+# Room for the multipart boundaries and headers around a single file
+_MULTIPART_OVERHEAD = 64 * 1024
+
+
+def _max_upload_bytes(path: str) -> int:
+    if path.endswith("/batch"):
+        return settings.UPLOAD_MAX_REQUEST_BYTES
+    return settings.UPLOAD_MAX_BYTES
+
+
+app.add_middleware(UploadLimitMiddleware, max_bytes=_max_upload_bytes, allowance=_MULTIPART_OVERHEAD)
+app.add_middleware(
+    AdmissionMiddleware,
+    routes=[
+        ("/parse-resume", parse_gate),
+        ("/semantic-score", encode_gate),
+        ("/job-embeddings", encode_gate),
+        ("/recommend", encode_gate),
+    ],
+)
+
+
+# --- Request profiling ---
+def _log_profile(profile: request_profiling.RequestProfile, path: str):
+    logger.info(
+        f"Profiled request {profile.request_id}: {profile.tasks} parse task(s), "
+        f"{time.perf_counter() - profile.started:.2f} s; stats in {path}"
+    )
+
+
+# Only installed when enabled, so unprofiled deployments run none of it
+if settings.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        prefixes=["/parse-resume"],
+        header=settings.PROFILING_HEADER,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        directory=settings.PROFILING_DIR,
+        max_dumps=settings.PROFILING_MAX_DUMPS,
+        on_saved=_log_profile,
+    )
+
+
+# --- Streaming batch responses (?stream=true) ---
+def _ndjson_response(items: AsyncIterator) -> StreamingResponse:
+    """Send each model yielded by items as one line of newline-delimited JSON."""
+    async def lines():
+        async for item in items:
+            yield item.model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+async def _as_completed_bounded(count: int, run: Callable[[int], Awaitable], max_in_flight: int) -> AsyncIterator:
+    """
+    Yield run(0) .. run(count - 1) results in completion order, with at most
+    max_in_flight running. New ones start only as results are consumed, so a
+    slow client holds back the work instead of letting results pile up.
+    """
+    running = set()
+    started = 0
+    try:
+        while started < count or running:
+            while started < count and len(running) < max(1, max_in_flight):
+                running.add(asyncio.ensure_future(run(started)))
+                started += 1
+            done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        # The client went away: stop the work it no longer waits for
+        for task in running:
+            task.cancel()
+
+
+async def _parse_content(content: bytes) -> dict:
+    """
+    Parse a document in the parse pool, or return its cached result for the
+    current parser and taxonomy. A profiled request always parses, so the
+    profile shows the work.
+    """
+    if parse_cache is None:
+        return await _run_parse(resume_parsing.parse_document, content)
+
+    version = resume_parsing.parse_result_version()
+    [(key, parsed_data)] = await _run_in_executor(
+        None, _cache_lookups, [content], version, request_profiling.current() is None
+    )
+    if parsed_data is not None:
+        logger.debug("Parse cache hit: %s", key[:12])
+        return parsed_data
+
+    parsed_data = await _run_parse(resume_parsing.parse_document, content)
+    await _run_in_executor(None, _cache_store, [(key, parsed_data)], version)
+    return parsed_data
+
+
+# Hashing large documents and SQLite calls (which may wait up to the busy
+# timeout for another process) run in the default executor, off the event loop
+def _cache_lookups(contents: List[bytes], version: str, use_cached: bool) -> list:
+    """(cache key, cached result or None) per document; only keys when not use_cached."""
+    keys = [ParseResultCache.make_key(content) for content in contents]
+    return [(key, parse_cache.get(key, version) if use_cached else None) for key in keys]
+
+
+def _cache_store(entries: list, version: str):
+    for key, parsed_data in entries:
+        parse_cache.put(key, version, parsed_data)
+
+
+async def _download(url: str) -> bytes:
+    """Download a resume (streamed, size-capped, pooled connections)."""
+    with metrics.STAGE_SECONDS.time(stage="download"):
+        content, _ = await resume_downloader.fetch(url)
+    metrics.DOCUMENT_BYTES.inc(len(content), source="download")
+    return content
+
+
+async def _read_upload(file: UploadFile) -> bytes:
+    """Read an uploaded file, refusing more than UPLOAD_MAX_BYTES."""
+    content = await file.read(settings.UPLOAD_MAX_BYTES + 1)
+    if len(content) > settings.UPLOAD_MAX_BYTES:
+        raise DocumentTooLargeError(f"Upload exceeds {settings.UPLOAD_MAX_BYTES} bytes")
+    metrics.DOCUMENT_BYTES.inc(len(content), source="upload")
+    return content
+
+
+def _recycle_parse_executor():
+    """Replace the parse pool; new workers start with current settings and data files."""
+    global _parse_executor
+    with _executor_lock:
+        executor, _parse_executor = _parse_executor, None
+    if executor is not None:
+        # Queued and running parses finish on the old workers
+        executor.shutdown(wait=False)
+
+
 def _clean_text(text: str) -> str:
     """Strip and collapse whitespace for embedding input."""
     text = text.strip()
@@ -126,17 +660,140 @@ def _clean_text(text: str) -> str:
     return text
 
 
+def _encode_texts(texts: List[str]) -> np.ndarray:
+    """
+    Return L2-normalized embeddings for already-cleaned texts, one row per text.
+    Cached vectors are reused; all misses are encoded together in one batch.
+    Long texts are embedded as pooled windows (EMBEDDING_CHUNK_*).
+    """
+    chunks, counts = _chunk_texts(texts)
+    keys, vectors, missing = _lookup_embeddings(chunks)
+    if missing:
+        fresh = _encode_missing(missing)
+        vectors = [fresh[key] if vector is None else vector for key, vector in zip(keys, vectors)]
+    return _pool_chunks(np.vstack(vectors), counts)
+
+
+async def _encode_texts_coalesced(texts: List[str]) -> np.ndarray:
+    """_encode_texts, with cache misses encoded in one batch with those of concurrent requests."""
+    chunks, counts = _chunk_texts(texts)
+    keys, vectors, missing = _lookup_embeddings(chunks)
+    if missing:
+        fresh = dict(zip(missing.keys(), await encode_batcher.encode(list(missing.values()))))
+        vectors = [fresh[key] if vector is None else vector for key, vector in zip(keys, vectors)]
+    return _pool_chunks(np.vstack(vectors), counts)
+
+
+def _chunk_texts(texts: List[str]) -> tuple:
+    """(windows of all texts in order, number of windows per text); texts as-is when chunking is off."""
+    if settings.EMBEDDING_CHUNK_WORDS <= 0:
+        return texts, None
+    chunked = [chunk_text(text, settings.EMBEDDING_CHUNK_WORDS, settings.EMBEDDING_CHUNK_OVERLAP) for text in texts]
+    return [chunk for chunks in chunked for chunk in chunks], [len(chunks) for chunks in chunked]
+
+
+def _pool_chunks(vectors: np.ndarray, counts: Optional[List[int]]) -> np.ndarray:
+    if counts is None or len(counts) == len(vectors):
+        return vectors
+    return pool_chunked(vectors, counts, settings.EMBEDDING_CHUNK_POOLING)
+
+
+def _lookup_embeddings(texts: List[str]) -> tuple:
+    """(cache keys, cached vector or None per text, {key: text} of the distinct misses)."""
+    keys = [EmbeddingCache.make_key(settings.EMBEDDING_MODEL_NAME, text) for text in texts]
+    vectors = [embedding_cache.get(key) for key in keys]
+
+    # Deduplicate misses so repeated texts in one request are encoded once
+    missing = {}
+    for i, vector in enumerate(vectors):
+        if vector is None:
+            missing.setdefault(keys[i], texts[i])
+    return keys, vectors, missing
+
+
+def _encode_missing(missing: dict) -> dict:
+    """Encode {key: text} in one model call and cache the vectors; returns {key: vector}."""
+    with metrics.STAGE_SECONDS.time(stage="encode"):
+        encoded = embedding_loader.get().encode(list(missing.values()), normalize_embeddings=True)
+    fresh = dict(zip(missing.keys(), np.asarray(encoded, dtype=np.float32)))
+    for key, vector in fresh.items():
+        embedding_cache.put(key, vector)
+    return fresh
+
+
+def _encode_batch(texts: List[str]) -> np.ndarray:
+    """Encode-pool task for a coalesced batch: texts from several requests, repeats encoded once."""
+    keys = [EmbeddingCache.make_key(settings.EMBEDDING_MODEL_NAME, text) for text in texts]
+    fresh = _encode_missing(dict(zip(keys, texts)))
+    return np.vstack([fresh[key] for key in keys])
+
+
+# Concurrent /semantic-score requests share batched encodes (ENCODE_BATCH_*)
+encode_batcher = EncodeBatcher(
+    functools.partial(_run_encode, _encode_batch),
+    max_items=settings.ENCODE_BATCH_MAX_ITEMS,
+    max_wait=settings.ENCODE_BATCH_MAX_WAIT_MS / 1000,
+    max_concurrent=settings.ENCODE_WORKERS,
+)
+
+
+_job_store: Optional[JobEmbeddingStore] = None
+_ann_index: Optional[IVFIndex] = None
+_job_store_lock = threading.Lock()
+
+
+def _get_job_store() -> JobEmbeddingStore:
+    """Open the on-disk job-embedding store on first use (needs the model's dimension)."""
+    global _job_store
+    with _job_store_lock:
+        if _job_store is None:
+            _job_store = JobEmbeddingStore(
+                settings.JOB_STORE_DIR,
+                dim=embedding_loader.get().get_sentence_embedding_dimension(),
+                model_name=settings.EMBEDDING_MODEL_NAME,
+            )
+            logger.info(f"✓ Job embedding store opened: {len(_job_store)} jobs")
+        return _job_store
+
+
+def _get_ann_index(store: JobEmbeddingStore) -> Optional[IVFIndex]:
+    """
+    IVF index to search the job store with, trained on first use. None means
+    exact (brute-force) search should be used: with ANN disabled, and while the
+    store holds fewer than ANN_MIN_JOBS jobs, even if centroids exist (e.g.
+    from a manual rebuild or before jobs were deleted).
+    """
+    if not settings.ANN_ENABLED:
+        return None
+    count = len(store)
+    if count < settings.ANN_MIN_JOBS:
+        return None
+    with _job_store_lock:
+        index = _load_ann_index(store)
+        if not index.is_trained:
+            nlist = settings.ANN_NLIST or default_nlist(count)
+            logger.info(f"Training IVF index: {count} jobs, {nlist} lists")
+            index.train(nlist)
+        return index
+
+
+def _load_ann_index(store: JobEmbeddingStore) -> IVFIndex:
+    """The IVF index over the store, with persisted centroids if any (call with _job_store_lock held)."""
+    global _ann_index
+    if _ann_index is None:
+        _ann_index = IVFIndex(store)
+        _ann_index.load()
+    return _ann_index
+
+
 @app.post("/semantic-score", response_model=SemanticScoreResponse)
 async def semantic_score(request: SemanticScoreRequest):
     """
     Compute cosine-similarity between resume text and job text using MiniLM embeddings.
     Returns a float score (0..1) and an integer percent (0..100).
+    Texts of concurrent requests are encoded together (see encode_batcher.py).
     """
-    if st_model is None:
-        raise HTTPException(
-            status_code=500,
-            detail="Sentence-transformer model not loaded.",
-        )
+    await _require_embedding_model()
 
     resume_text = _clean_text(request.resumeText)
     job_text = _clean_text(request.jobText)
@@ -146,18 +803,279 @@ async def semantic_score(request: SemanticScoreRequest):
         return SemanticScoreResponse(semanticScore=0.0, semanticPercent=0)
 
     try:
-        embeddings = st_model.encode([resume_text, job_text])
-        sim = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
-        # Clamp to 0..1
-        sim = float(max(0.0, min(1.0, sim)))
-        return SemanticScoreResponse(
-            semanticScore=round(sim, 4),
-            semanticPercent=round(sim * 100),
-        )
+        if settings.ENCODE_BATCH_MAX_ITEMS > 1:
+            embeddings = await _encode_texts_coalesced([resume_text, job_text])
+        else:
+            embeddings = await _run_encode(_encode_texts, [resume_text, job_text])
+        with metrics.STAGE_SECONDS.time(stage="cosine"):
+            sim = embeddings[1] @ embeddings[0]
+        return SemanticScoreResponse(**_score_fields(sim))
     except Exception as e:
+        metrics.ERRORS.inc(type=type(e).__name__)
         logger.error(f"Semantic score computation failed: {e}")
         raise HTTPException(status_code=500, detail=f"Semantic scoring failed: {str(e)}")
 
+
+@app.post("/semantic-score/batch", response_model=SemanticScoreBatchResponse)
+async def semantic_score_batch(request: SemanticScoreBatchRequest, stream: bool = False):
+    """
+    Score one resume against many jobs in a single pass.
+    The resume and all non-empty job texts are encoded in one batched call and
+    compared with a single normalized dot-product; scores follow the same
+    clamping/rounding rules as /semantic-score.
+    With ?stream=true, results are sent as NDJSON lines while jobs are scored.
+    """
+    await _require_embedding_model()
+    if stream:
+        return _ndjson_response(_stream_semantic_scores(request))
+
+    resume_text = _clean_text(request.resumeText)
+    job_texts = [_clean_text(job.jobText) for job in request.jobs]
+
+    # Empty resume or job text => score 0 for that job, without encoding it
+    sims = np.zeros(len(job_texts), dtype=np.float64)
+    scored = [i for i, text in enumerate(job_texts) if text]
+
+    if resume_text and scored:
+        try:
+            embeddings = await _run_encode(_encode_texts, [resume_text] + [job_texts[i] for i in scored])
+            with metrics.STAGE_SECONDS.time(stage="cosine"):
+                sims[scored] = embeddings[1:] @ embeddings[0]
+        except Exception as e:
+            metrics.ERRORS.inc(type=type(e).__name__)
+            logger.error(f"Batch semantic score computation failed: {e}")
+            raise HTTPException(status_code=500, detail=f"Semantic scoring failed: {str(e)}")
+
+    return SemanticScoreBatchResponse(
+        results=[
+            SemanticScoreBatchItem(id=job.id, **_score_fields(sim))
+            for job, sim in zip(request.jobs, sims)
+        ]
+    )
+
+
+async def _stream_semantic_scores(request: SemanticScoreBatchRequest) -> AsyncIterator:
+    """
+    SemanticScoreBatchItems as they are scored: jobs with empty text first, then
+    groups of STREAM_SCORE_GROUP_SIZE jobs, each encoded in one call against the
+    resume vector. A group that fails yields SemanticScoreStreamErrors instead.
+    """
+    resume_text = _clean_text(request.resumeText)
+    job_texts = [_clean_text(job.jobText) for job in request.jobs]
+    scored = [i for i, text in enumerate(job_texts) if text] if resume_text else []
+
+    # Empty resume or job text => score 0 for that job, without encoding it
+    zero = _score_fields(0.0)
+    to_score = set(scored)
+    for i, job in enumerate(request.jobs):
+        if i not in to_score:
+            yield SemanticScoreBatchItem(id=job.id, **zero)
+    if not scored:
+        return
+
+    def failed(indices: List[int], error: Exception) -> list:
+        metrics.ERRORS.inc(type=type(error).__name__)
+        logger.error(f"Batch semantic score computation failed: {error}")
+        return [SemanticScoreStreamError(id=request.jobs[i].id, error=f"Semantic scoring failed: {error}") for i in indices]
+
+    try:
+        resume_vector = (await _run_encode(_encode_texts, [resume_text]))[0]
+    except Exception as e:
+        for item in failed(scored, e):
+            yield item
+        return
+
+    size = max(1, settings.STREAM_SCORE_GROUP_SIZE)
+    groups = [scored[start:start + size] for start in range(0, len(scored), size)]
+
+    async def score(group: int) -> list:
+        indices = groups[group]
+        try:
+            embeddings = await _run_encode(_encode_texts, [job_texts[i] for i in indices])
+        except Exception as e:
+            return failed(indices, e)
+        with metrics.STAGE_SECONDS.time(stage="cosine"):
+            sims = embeddings @ resume_vector
+        return [SemanticScoreBatchItem(id=request.jobs[i].id, **_score_fields(sim)) for i, sim in zip(indices, sims)]
+
+    async for items in _as_completed_bounded(len(groups), score, settings.ENCODE_WORKERS):
+        for item in items:
+            yield item
+
+
+@app.post("/job-embeddings", response_model=JobEmbeddingUpsertResponse)
+async def upsert_job_embeddings(request: JobEmbeddingUpsertRequest):
+    """
+    Encode and store job embeddings for /recommend.
+    Jobs whose text is empty are removed from the store instead.
+    """
+    await _require_embedding_model()
+
+    job_texts = {job.id: _clean_text(job.jobText) for job in request.jobs}
+
+    try:
+        upserted, removed, total = await _run_encode(_store_job_embeddings, job_texts)
+        return JobEmbeddingUpsertResponse(upserted=upserted, removed=removed, total=total)
+    except Exception as e:
+        metrics.ERRORS.inc(type=type(e).__name__)
+        logger.error(f"Job embedding upsert failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Job embedding upsert failed: {str(e)}")
+
+
+@app.delete("/job-embeddings/{job_id}", response_model=JobEmbeddingDeleteResponse)
+async def delete_job_embedding(job_id: str):
+    """Remove a job from the recommendation store (e.g. when it is closed or deleted)."""
+    await _require_embedding_model()
+
+    _, removed, total = await _run_encode(_store_job_embeddings, {job_id: ""})
+    return JobEmbeddingDeleteResponse(deleted=removed > 0, total=total)
+
+
+@app.post("/recommend", response_model=SemanticScoreBatchResponse)
+async def recommend(request: RecommendRequest):
+    """
+    Rank stored jobs for a resume: one encode plus one matrix-vector product over
+    the stored job embeddings, returning the top-k job ids best first.
+    Large stores are searched through the IVF index (see `nprobe`).
+    """
+    await _require_embedding_model()
+
+    resume_text = _clean_text(request.resumeText)
+    if not resume_text:
+        return SemanticScoreBatchResponse(results=[])
+
+    try:
+        matches = await _run_encode(_rank_jobs, resume_text, request.topK, request.nprobe)
+    except Exception as e:
+        metrics.ERRORS.inc(type=type(e).__name__)
+        logger.error(f"Recommendation failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Recommendation failed: {str(e)}")
+
+    return SemanticScoreBatchResponse(
+        results=[SemanticScoreBatchItem(id=job_id, **_score_fields(sim)) for job_id, sim in matches]
+    )
+
+
+@app.post("/job-embeddings/index/rebuild", response_model=IndexRebuildResponse)
+async def rebuild_job_index(request: IndexRebuildRequest):
+    """Retrain the IVF coarse quantizer on the current store and reassign every job."""
+    await _require_embedding_model()
+
+    try:
+        return await _run_encode(_rebuild_job_index, request.nlist, request.iterations)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/job-embeddings/index/recall")
+async def job_index_recall(request: IndexRecallRequest):
+    """
+    Report recall@k and latency of the IVF index against exact search for
+    several nprobe values, to help choose ANN_NPROBE / ANN_NLIST.
+    """
+    await _require_embedding_model()
+
+    resume_texts = [text for text in (_clean_text(t) for t in request.resumeTexts) if text]
+    try:
+        return await _run_encode(_job_index_recall, resume_texts, request.k, request.nprobe, request.sampleSize)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _store_job_embeddings(job_texts: dict) -> tuple:
+    """Upsert jobs with text, remove jobs without; returns (upserted, removed, total)."""
+    to_store = [job_id for job_id, text in job_texts.items() if text]
+    to_remove = [job_id for job_id, text in job_texts.items() if not text]
+
+    store = _get_job_store()
+    if to_store:
+        vectors = _encode_texts([job_texts[job_id] for job_id in to_store])
+        store.upsert(to_store, vectors)
+        if _ann_index is not None:
+            _ann_index.add(to_store, vectors)
+    removed = store.delete(to_remove) if to_remove else 0
+    if removed and _ann_index is not None:
+        _ann_index.remove(to_remove)
+    return len(to_store), removed, len(store)
+
+
+def _rank_jobs(resume_text: str, k: int, nprobe: Optional[int]) -> list:
+    """Top-k (job id, cosine) pairs for a cleaned resume text."""
+    query = _encode_texts([resume_text])[0]
+    store = _get_job_store()
+    index = _get_ann_index(store)
+    with metrics.STAGE_SECONDS.time(stage="cosine"):
+        if index is not None:
+            return index.search(query, k, nprobe or settings.ANN_NPROBE)
+        return store.search(query, k)
+
+
+def _rebuild_job_index(nlist: Optional[int], iterations: int) -> IndexRebuildResponse:
+    store = _get_job_store()
+    nlist = nlist or settings.ANN_NLIST or default_nlist(len(store))
+    with _job_store_lock:
+        index = _load_ann_index(store)
+        index.train(nlist, iterations=iterations)
+        sizes = index.list_sizes()
+    return IndexRebuildResponse(jobs=len(store), nlist=nlist, minListSize=min(sizes), maxListSize=max(sizes))
+
+
+def _job_index_recall(resume_texts: List[str], k: int, nprobes: List[int], sample_size: int) -> dict:
+    store = _get_job_store()
+    # Measured whether or not searches use it yet (ANN_MIN_JOBS)
+    with _job_store_lock:
+        index = _load_ann_index(store)
+    if not index.is_trained:
+        raise ValueError("IVF index is not trained. Call /job-embeddings/index/rebuild first.")
+
+    if resume_texts:
+        queries = _encode_texts(resume_texts)
+    else:
+        with store.reading():
+            vectors = store.vectors()
+            rng = np.random.default_rng(0)
+            queries = np.asarray(vectors[rng.choice(vectors.shape[0], min(sample_size, vectors.shape[0]), replace=False)])
+
+    return recall_report(index, queries, k, nprobes)
+
+
+def _score_fields(sim: float) -> dict:
+    """Clamp a cosine similarity to 0..1 and derive the rounded score/percent pair."""
+    sim = float(max(0.0, min(1.0, sim)))
+    return {
+        "semanticScore": round(sim, 4),
+        "semanticPercent": round(sim * 100),
+    }
+
+def _require_admin(token: Optional[str]):
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled. Set ADMIN_TOKEN to enable them.")
+    if token is None or not hmac.compare_digest(token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@app.post("/admin/skills/reload", response_model=SkillTaxonomyResponse)
+async def reload_skills(x_admin_token: Optional[str] = Header(default=None)):
+    """
+    Reload the skill taxonomy from SKILLS_TAXONOMY_PATH without a restart.
+    The file is validated and compiled before it replaces the current taxonomy;
+    an invalid file is rejected with 400 and the current taxonomy stays active.
+    Process-pool workers are recycled so they compile the new taxonomy too.
+    """
+    _require_admin(x_admin_token)
+
+    try:
+        taxonomy = await _run_in_executor(None, resume_parsing.reload_skill_taxonomy)
+    except SkillTaxonomyError as e:
+        logger.error(f"Skill taxonomy reload rejected: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if settings.PARSE_EXECUTOR == "process":
+        _recycle_parse_executor()
+    logger.info(f"Skill taxonomy reloaded: version {taxonomy.version}")
+    return SkillTaxonomyResponse(**taxonomy.stats())
+
+
 @app.post("/parse-resume", response_model=ParseResumeResponse)
 async def parse_resume(request: ParseResumeRequest):
     """
@@ -165,55 +1083,27 @@ async def parse_resume(request: ParseResumeRequest):
     
     Process:
     1. Download file from resumeUrl
-    2. Extract text based on file type (PDF/DOCX)
+    2. Extract text in memory based on file type (PDF/DOCX, sniffed from magic bytes)
     3. Use spaCy NLP + PhraseMatcher to extract skills
     4. Extract sections using heading markers
     5. Return structured JSON
     """
-    if not nlp:
-        raise HTTPException(
-            status_code=500,
-            detail="spaCy model not loaded. Run: python -m spacy download en_core_web_sm"
-        )
+    await _require_nlp()
     
     try:
         resume_url = str(request.resumeUrl)
-        logger.info(f"Parsing resume from: {resume_url}")
-        
-        # Download resume file
-        response = requests.get(resume_url, timeout=30)
-        response.raise_for_status()
+        logger.debug("Parsing resume from: %s", resume_url)
         
-        # Detect file type from URL or content-type
-        file_extension = _get_file_extension(resume_url, response.headers.get('content-type', ''))
+        # Download resume file (streamed, size-capped, pooled connections)
+        content = await _download(resume_url)
         
-        # Save to temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-            temp_file.write(response.content)
-            temp_file_path = temp_file.name
-        
-        try:
-            # Extract text based on file type
-            text = _extract_text(temp_file_path, file_extension)
-            logger.info(f"Extracted {len(text)} characters from resume")
-            
-            # Parse structured data
-            parsed_data = _parse_resume_text(text)
-            logger.info(f"Parsing complete: {len(parsed_data['skills'])} skills found")
-            
-            return ParseResumeResponse(**parsed_data)
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+        # Extract text and parse structured data in the parse pool (or from the cache)
+        parsed_data = await _parse_content(content)
+        return ParseResumeResponse(**parsed_data)
                 
-    except requests.RequestException as e:
-        logger.error(f"Failed to download resume: {e}")
-        raise HTTPException(status_code=400, detail=f"Failed to download resume: {str(e)}")
     except Exception as e:
-        logger.error(f"Resume parsing error: {e}")
-        raise HTTPException(status_code=500, detail=f"Resume parsing failed: {str(e)}")
+        status, detail = _describe_parse_error(e)
+        raise HTTPException(status_code=status, detail=detail)
 
 @app.post("/parse-resume-file", response_model=ParseResumeResponse)
 async def parse_resume_file(file: UploadFile = File(...)):
@@ -221,373 +1111,270 @@ async def parse_resume_file(file: UploadFile = File(...)):
     Parse resume from direct file upload (multipart/form-data).
     This is the preferred endpoint — avoids Cloudinary URL access issues.
     """
-    if not nlp:
+    await _require_nlp()
+
+    try:
+        logger.debug("Parsing uploaded file: %s, content_type: %s", file.filename, file.content_type)
+
+        # Read file content; the format is sniffed from its bytes, not the filename
+        content = await _read_upload(file)
+        logger.debug("Received %d bytes", len(content))
+
+        parsed_data = await _parse_content(content)
+        return ParseResumeResponse(**parsed_data)
+
+    except Exception as e:
+        status, detail = _describe_parse_error(e)
+        raise HTTPException(status_code=status, detail=detail)
+
+
+@app.post("/parse-resume/batch", response_model=ParseResumeBatchResponse)
+async def parse_resume_batch(request: ParseResumeBatchRequest, stream: bool = False):
+    """
+    Parse many resumes from URLs in one request.
+    Downloads and text extraction run concurrently; the NLP stage runs over
+    batches of documents with nlp.pipe(). Each document gets its own result or
+    error, so one bad URL or file does not fail the batch.
+    With ?stream=true, each result is sent as an NDJSON line once it is parsed.
+    """
+    await _require_nlp()
+
+    resume_urls = [str(url) for url in request.resumeUrls]
+    logger.debug("Parsing batch of %d resumes from URLs", len(resume_urls))
+    if stream:
+        return _ndjson_response(_stream_parse_batch(resume_urls, lambda index: _download(resume_urls[index])))
+
+    # Bound concurrent downloads by the connection pool so queued ones do not time out waiting
+    download_slots = asyncio.Semaphore(settings.DOWNLOAD_MAX_CONNECTIONS)
+
+    async def download(url: str) -> bytes:
+        async with download_slots:
+            return await _download(url)
+
+    contents = await asyncio.gather(*(download(url) for url in resume_urls), return_exceptions=True)
+    return await _parse_batch(resume_urls, contents)
+
+
+@app.post("/parse-resume-file/batch", response_model=ParseResumeBatchResponse)
+async def parse_resume_file_batch(files: List[UploadFile] = File(...), stream: bool = False):
+    """
+    Parse many uploaded resumes (multipart/form-data, repeated `files` field).
+    Same pipeline and per-document results as /parse-resume/batch, and the same ?stream=true.
+    """
+    await _require_nlp()
+    if len(files) > settings.PARSE_BATCH_MAX_ITEMS:
         raise HTTPException(
-            status_code=500,
-            detail="spaCy model not loaded. Run: python -m spacy download en_core_web_sm"
+            status_code=413,
+            detail=f"Too many files: {len(files)}; at most {settings.PARSE_BATCH_MAX_ITEMS} per batch",
         )
 
-    try:
-        logger.info(f"Parsing uploaded file: {file.filename}, content_type: {file.content_type}")
+    logger.debug("Parsing batch of %d uploaded files", len(files))
+    sources = [file.filename or "" for file in files]
+    if stream:
+        return _ndjson_response(_stream_parse_batch(sources, lambda index: _read_upload(files[index])))
+    contents = []
+    for file in files:
+        try:
+            contents.append(await _read_upload(file))
+        except DocumentTooLargeError as e:
+            contents.append(e)
+    return await _parse_batch(sources, contents)
+
 
-        # Detect file extension
-        file_extension = _get_file_extension(
-            file.filename or "",
-            file.content_type or ""
+async def _parse_batch(sources: List[str], contents: list) -> ParseResumeBatchResponse:
+    """
+    Parse documents whose contents are bytes, or the exception raised while
+    fetching them. Cached results are returned as is; for the rest, text is
+    extracted concurrently in the parse pool and then parsed in chunks of at
+    most NLP_BATCH_SIZE, one nlp.pipe() call per parse-pool task.
+    """
+    items: List[Optional[ParseResumeBatchItem]] = [None] * len(sources)
+
+    def fail(index: int, error: BaseException):
+        status, detail = _describe_parse_error(error)
+        items[index] = ParseResumeBatchItem(index=index, source=sources[index], status=status, error=detail)
+
+    def succeed(index: int, parsed_data: dict):
+        items[index] = ParseResumeBatchItem(
+            index=index, source=sources[index], status=200, result=ParseResumeResponse(**parsed_data)
         )
 
-        # Read file content and write to temp file
-        content = await file.read()
-        logger.info(f"Received {len(content)} bytes")
+    cache_keys = {}
+    version = resume_parsing.parse_result_version() if parse_cache else None
+    # A profiled request parses every document, so the profile shows the work
+    use_cached = request_profiling.current() is None
+    pending = []
+    for index, content in enumerate(contents):
+        if isinstance(content, BaseException):
+            fail(index, content)
+        else:
+            pending.append(index)
+    if parse_cache is not None:
+        lookups = await _run_in_executor(None, _cache_lookups, [contents[index] for index in pending], version, use_cached)
+        uncached = []
+        for index, (key, cached) in zip(pending, lookups):
+            cache_keys[index] = key
+            if cached is not None:
+                succeed(index, cached)
+            else:
+                uncached.append(index)
+        pending = uncached
+
+    extracted = await asyncio.gather(
+        *(_run_parse(resume_parsing.extract_document_text, contents[index]) for index in pending),
+        return_exceptions=True,
+    )
+    texts = {}
+    for index, text in zip(pending, extracted):
+        if isinstance(text, BaseException):
+            fail(index, text)
+        else:
+            texts[index] = text
+
+    # Spread the texts over the pool's workers, at most NLP_BATCH_SIZE per nlp.pipe() call
+    pending = list(texts)
+    chunk_size = max(1, min(settings.NLP_BATCH_SIZE, -(-len(pending) // max(1, settings.PARSE_WORKERS))))
+    chunks = [pending[start:start + chunk_size] for start in range(0, len(pending), chunk_size)]
+    parsed_chunks = await asyncio.gather(
+        *(_run_parse(resume_parsing.parse_texts, [texts[index] for index in chunk]) for chunk in chunks),
+        return_exceptions=True,
+    )
+    parsed_results = []
+    for chunk, parsed in zip(chunks, parsed_chunks):
+        if isinstance(parsed, BaseException):
+            for index in chunk:
+                fail(index, parsed)
+            continue
+        for index, (result, error) in zip(chunk, parsed):
+            if error is not None:
+                fail(index, error)
+            else:
+                succeed(index, result)
+                parsed_results.append((cache_keys.get(index), result))
+    if parse_cache is not None and parsed_results:
+        await _run_in_executor(None, _cache_store, parsed_results, version)
+
+    failed = sum(item.error is not None for item in items)
+    logger.debug("Batch parse complete: %d parsed, %d failed", len(items) - failed, failed)
+    return ParseResumeBatchResponse(results=items, parsed=len(items) - failed, failed=failed)
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-            temp_file.write(content)
-            temp_file_path = temp_file.name
 
+def _stream_parse_batch(sources: List[str], load: Callable[[int], Awaitable[bytes]]) -> AsyncIterator:
+    """
+    ParseResumeBatchItems in completion order. Each document is loaded (downloaded
+    or read) and parsed on its own, like /parse-resume-file, so it is sent as soon
+    as it is done; at most STREAM_MAX_IN_FLIGHT are held at once.
+    """
+    async def parse(index: int) -> ParseResumeBatchItem:
         try:
-            text = _extract_text(temp_file_path, file_extension)
-            logger.info(f"Extracted {len(text)} characters from resume")
+            parsed_data = await _parse_content(await load(index))
+        except Exception as e:
+            status, detail = _describe_parse_error(e)
+            return ParseResumeBatchItem(index=index, source=sources[index], status=status, error=detail)
+        return ParseResumeBatchItem(
+            index=index, source=sources[index], status=200, result=ParseResumeResponse(**parsed_data)
+        )
 
-            parsed_data = _parse_resume_text(text)
-            logger.info(f"Parsing complete: {len(parsed_data['skills'])} skills found")
+    return _as_completed_bounded(len(sources), parse, settings.STREAM_MAX_IN_FLIGHT)
 
-            return ParseResumeResponse(**parsed_data)
-        finally:
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
 
-    except Exception as e:
-        logger.error(f"Resume file parsing error: {e}")
-        raise HTTPException(status_code=500, detail=f"Resume parsing failed: {str(e)}")
+def _describe_parse_error(error: BaseException) -> tuple:
+    """(status, detail) for a failed parse request, batch document or job; counted by error type."""
+    metrics.ERRORS.inc(type=type(error).__name__)
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+        return 504, str(error)
+    if isinstance(error, DownloadTooLarge):
+        logger.error(f"Resume download rejected: {error}")
+        return 413, str(error)
+    if isinstance(error, DocumentTooLargeError):
+        return 413, str(error)
+    if isinstance(error, DownloadError):
+        logger.error(f"Failed to download resume: {error}")
+        return 400, f"Failed to download resume: {error}"
+    if isinstance(error, UnsupportedDocumentError):
+        return 415, str(error)
+    logger.error(f"Resume parsing error: {error}")
+    return 500, f"Resume parsing failed: {error}"
 
 
-def _get_file_extension(url: str, content_type: str) -> str:
-    """Determine file extension from URL or content-type"""
-    url_lower = url.lower()
-    
-    if '.pdf' in url_lower or 'pdf' in content_type:
-        return '.pdf'
-    elif '.docx' in url_lower or 'wordprocessingml' in content_type:
-        return '.docx'
-    elif '.doc' in url_lower or 'msword' in content_type:
-        return '.doc'
-    else:
-        # Default to PDF
-        return '.pdf'
+# Asynchronous parse jobs; errors are reported as the synchronous endpoints would
+parse_jobs = ParseJobQueue(
+    workers=settings.PARSE_JOB_WORKERS,
+    max_queued=settings.PARSE_JOB_QUEUE_SIZE,
+    timeout=settings.PARSE_JOB_TIMEOUT,
+    result_ttl=settings.PARSE_JOB_RESULT_TTL,
+    describe_error=_describe_parse_error,
+)
 
-def _extract_text(file_path: str, extension: str) -> str:
-    """Extract text from PDF or DOCX file"""
-    text = ""
-    
+
+@app.post("/jobs/parse-resume", response_model=ParseJobResponse, status_code=202)
+async def submit_parse_resume_job(request: ParseResumeRequest):
+    """
+    Queue a resume URL for parsing and return the job at once; poll
+    GET /jobs/{jobId} for the result. Download and parsing happen in the
+    background, within PARSE_JOB_TIMEOUT. Returns 429 with Retry-After when
+    PARSE_JOB_QUEUE_SIZE jobs are already waiting.
+    """
+    await _require_nlp()
+    resume_url = str(request.resumeUrl)
+
+    async def work() -> dict:
+        return await _parse_content(await _download(resume_url))
+
+    return _job_response(_submit_job(resume_url, work))
+
+
+@app.post("/jobs/parse-resume-file", response_model=ParseJobResponse, status_code=202)
+async def submit_parse_resume_file_job(file: UploadFile = File(...)):
+    """Queue an uploaded resume for parsing; same job lifecycle as /jobs/parse-resume."""
+    await _require_nlp()
     try:
-        if extension == '.pdf':
-            # Extract text from PDF using pdfplumber
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-        
-        elif extension in ['.doc', '.docx']:
-            # Extract text from Word document
-            text = docx2txt.process(file_path)
-        
-        else:
-            raise ValueError(f"Unsupported file type: {extension}")
-        
-        return text.strip()
-        
-    except Exception as e:
-        logger.error(f"Text extraction failed: {e}")
-        raise
+        content = await _read_upload(file)
+    except DocumentTooLargeError as e:
+        status, detail = _describe_parse_error(e)
+        raise HTTPException(status_code=status, detail=detail)
 
-def _parse_resume_text(text: str) -> dict:
-    """Parse resume text and extract structured information"""
-    
-    logger.info("Starting resume text parsing...")
-    logger.info(f"Text length: {len(text)} characters")
-    
-    # Process text with spaCy
-    doc = nlp(text.lower())
-    
-    # Extract skills using PhraseMatcher
-    skills = _extract_skills(doc)
-    logger.info(f"Skills extracted: {len(skills)} - {skills[:10]}")
-    
-    # Extract sections by headings
-    sections = _extract_sections(text)
-    logger.info(f"Sections extracted - Education: {sections.get('educationFound', False)}, Experience: {sections.get('experienceFound', False)}")
-    
-    # Extract title/role from first section or near the top
-    title = _extract_title(text)
-    logger.info(f"Title extracted: '{title}'")
-    
-    # Extract years of experience
-    experience_years = _extract_experience_years(text)
-    logger.info(f"Experience years: {experience_years}")
-    
-    # Extract summary (first few sentences after header)
-    summary = _extract_summary(text)
-    logger.info(f"Summary extracted: {len(summary)} chars")
-    
-    result = {
-        "title": title,
-        "skills": skills,
-        "education": sections.get("education", ""),
-        "experience": sections.get("experience", ""),
-        "summary": summary,
-        "experienceYears": experience_years,
-        # Debug fields
-        "educationFound": sections.get("educationFound", False),
-        "experienceFound": sections.get("experienceFound", False)
-    }
-    
-    logger.info(f"Parse complete. Education length: {len(result['education'])}, Experience length: {len(result['experience'])}")
-    
-    return result
+    async def work() -> dict:
+        return await _parse_content(content)
 
-def _extract_skills(doc) -> List[str]:
-    """Extract skills using spaCy PhraseMatcher"""
-    matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
-    
-    # Add skill patterns
-    patterns = [nlp.make_doc(skill) for skill in SKILLS_DATABASE]
-    matcher.add("SKILLS", patterns)
-    
-    # Find matches
-    matches = matcher(doc)
-    
-    # Extract unique skills (case-preserved from database)
-    found_skills = set()
-    for match_id, start, end in matches:
-        skill_text = doc[start:end].text.lower()
-        # Map back to original casing from SKILLS_DATABASE
-        for skill in SKILLS_DATABASE:
-            if skill.lower() == skill_text:
-                found_skills.add(skill)
-                break
-    
-    return sorted(list(found_skills))
-
-def _extract_sections(text: str) -> dict:
-    """Extract education, experience sections based on headings with improved detection"""
-    sections = {
-        "education": "",
-        "experience": "",
-        "educationFound": False,
-        "experienceFound": False
-    }
-    
-    # Comprehensive section headers (case-insensitive, word boundaries)
-    education_headers = [
-        r'\beducation\b',
-        r'\bacademic\s+(?:background|qualifications?|history)\b',
-        r'\bqualifications?\b',
-        r'\bdegrees?\b',
-        r'\buniversity\b',
-        r'\bcertifications?\b',
-        r'\beducational\s+background\b'
-    ]
-    
-    experience_headers = [
-        r'\b(?:work\s+)?experience\b',
-        r'\bwork\s+history\b',
-        r'\bemployment(?:\s+history)?\b',
-        r'\bprofessional\s+(?:experience|background|history)\b',
-        r'\bcareer\s+(?:history|summary)\b',
-        r'\bpositions?\s+held\b'
-    ]
-    
-    # Other section headers to detect boundaries
-    other_headers = [
-        r'\bskills?\b',
-        r'\bprojects?\b',
-        r'\bsummary\b',
-        r'\bobjective\b',
-        r'\bprofile\b',
-        r'\bachievements?\b',
-        r'\bawards?\b',
-        r'\bcertifications?\b',
-        r'\bhonors?\b',
-        r'\bpublications?\b',
-        r'\breferences?\b',
-        r'\bcontact\b',
-        r'\bpersonal\s+(?:information|details)\b'
-    ]
-    
-    lines = text.split('\n')
-    current_section = None
-    section_content = []
-    
-    def matches_headers(line_text, header_patterns):
-        """Check if line matches any header pattern"""
-        line_lower = line_text.lower().strip()
-        for pattern in header_patterns:
-            if re.search(pattern, line_lower):
-                # Additional check: header line should be relatively short
-                if len(line_text.strip()) < 60:
-                    return True
-        return False
-    
-    for i, line in enumerate(lines):
-        line_stripped = line.strip()
-        
-        # Skip empty lines between sections
-        if not line_stripped:
-            continue
-        
-        # Check for education section header
-        if matches_headers(line_stripped, education_headers):
-            if current_section and section_content:
-                sections[current_section] = '\n'.join(section_content).strip()
-            current_section = "education"
-            sections["educationFound"] = True
-            section_content = []
-            continue
-        
-        # Check for experience section header
-        elif matches_headers(line_stripped, experience_headers):
-            if current_section and section_content:
-                sections[current_section] = '\n'.join(section_content).strip()
-            current_section = "experience"
-            sections["experienceFound"] = True
-            section_content = []
-            continue
-        
-        # Check for other section headers (marks end of current section)
-        elif matches_headers(line_stripped, other_headers):
-            if current_section and section_content:
-                sections[current_section] = '\n'.join(section_content).strip()
-            current_section = None
-            section_content = []
-            continue
-        
-        # Add content to current section
-        elif current_section and line_stripped:
-            section_content.append(line_stripped)
-    
-    # Save last section
-    if current_section and section_content:
-        sections[current_section] = '\n'.join(section_content).strip()
-    
-    # Fallback: Detect education by degree keywords if section not found
-    if not sections["educationFound"]:
-        degree_patterns = [
-            r'\b(?:bachelor|master|phd|doctorate|diploma|associate|mba|m\.?s\.?c?|b\.?s\.?c?|b\.?tech|m\.?tech)\b',
-            r'\buniversity\b',
-            r'\bcollege\b',
-            r'\bdegree\b'
-        ]
-        edu_lines = []
-        for line in lines:
-            if any(re.search(p, line.lower()) for p in degree_patterns):
-                edu_lines.append(line.strip())
-                if len('\n'.join(edu_lines)) > 300:
-                    break
-        if edu_lines:
-            sections["education"] = '\n'.join(edu_lines)
-            sections["educationFound"] = True
-    
-    # Fallback: Detect experience by date patterns if section not found
-    if not sections["experienceFound"]:
-        date_patterns = [
-            r'\b(?:19|20)\d{2}\s*[-–—]\s*(?:(?:19|20)\d{2}|present|current)\b',
-            r'\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+(?:19|20)\d{2}\b'
-        ]
-        exp_lines = []
-        for line in lines:
-            if any(re.search(p, line.lower()) for p in date_patterns):
-                exp_lines.append(line.strip())
-                if len('\n'.join(exp_lines)) > 400:
-                    break
-        if exp_lines:
-            sections["experience"] = '\n'.join(exp_lines)
-            sections["experienceFound"] = True
-    
-    # Limit section length to avoid too much data (increased limit)
-    if len(sections["education"]) > 800:
-        sections["education"] = sections["education"][:800] + "..."
-    if len(sections["experience"]) > 1000:
-        sections["experience"] = sections["experience"][:1000] + "..."
-    
-    # Debug logging
-    logger.info(f"Education found: {sections['educationFound']}, length: {len(sections['education'])}")
-    logger.info(f"Experience found: {sections['experienceFound']}, length: {len(sections['experience'])}")
-    
-    return sections
+    return _job_response(_submit_job(file.filename or "", work))
 
-def _extract_title(text: str) -> str:
-    """Extract job title/role from resume (usually near the top)"""
-    lines = text.split('\n')
-    
-    # Common title indicators
-    title_patterns = [
-        r'(?i)^(software engineer|developer|data scientist|analyst|manager|consultant|designer)',
-        r'(?i)(senior|junior|lead|principal)\s+(engineer|developer|analyst)',
-    ]
-    
-    # Check first 10 lines
-    for line in lines[:10]:
-        line_stripped = line.strip()
-        if not line_stripped or len(line_stripped) > 50:
-            continue
-        
-        for pattern in title_patterns:
-            if re.search(pattern, line_stripped):
-                return line_stripped
-    
-    return ""
-
-def _extract_experience_years(text: str) -> int:
-    """Extract total years of experience from resume"""
-    # Look for patterns like "5+ years", "3 years of experience"
-    patterns = [
-        r'(\d+)\+?\s*years?\s+(?:of\s+)?experience',
-        r'experience[:\s]+(\d+)\+?\s*years?',
-    ]
-    
-    years_found = []
-    for pattern in patterns:
-        matches = re.findall(pattern, text.lower())
-        years_found.extend([int(m) for m in matches])
-    
-    return max(years_found) if years_found else 0
 
-def _extract_summary(text: str) -> str:
-    """Extract professional summary/objective"""
-    lines = text.split('\n')
-    
-    # Look for summary section
-    summary_headers = r'(?i)\b(summary|objective|profile|about)\b'
-    
-    in_summary = False
-    summary_lines = []
-    
-    for line in lines:
-        line_stripped = line.strip()
-        
-        if re.search(summary_headers, line_stripped):
-            in_summary = True
-            continue
-        
-        if in_summary:
-            if line_stripped:
-                summary_lines.append(line_stripped)
-                if len(' '.join(summary_lines)) > 200:
-                    break
-            else:
-                # Empty line might indicate section end
-                if summary_lines:
-                    break
-    
-    summary = ' '.join(summary_lines)
-    
-    # If no summary section found, use first few sentences
-    if not summary:
-        first_paragraph = ' '.join(lines[:5])
-        summary = first_paragraph[:200]
-    
-    return summary.strip()
+@app.get("/jobs/{job_id}", response_model=ParseJobResponse)
+async def get_parse_job(job_id: str):
+    """Status of a parse job, with its result once done. Unknown and expired jobs are 404."""
+    job = parse_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Parse job not found (unknown id or result expired)")
+    return _job_response(job)
+
+
+def _submit_job(source: str, work) -> ParseJob:
+    try:
+        job = parse_jobs.submit(source, work)
+    except QueueFull as e:
+        logger.warning(f"Parse job rejected: {e}")
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    logger.debug("Parse job %s queued: %s", job.id, source)
+    return job
+
+
+def _job_response(job: ParseJob) -> ParseJobResponse:
+    return ParseJobResponse(
+        jobId=job.id,
+        status=job.status,
+        source=job.source,
+        createdAt=job.created_at,
+        startedAt=job.started_at,
+        finishedAt=job.finished_at,
+        result=ParseResumeResponse(**job.result) if job.result is not None else None,
+        error=job.error,
+        errorStatus=job.error_status,
+    )
+
+
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,247 @@
+"""
+Minimal Prometheus metrics: counters, gauges and histograms with labels,
+rendered in the Prometheus text exposition format by GET /metrics.
+
+Parse-pool worker processes record into their own registry; each task ships
+what it recorded back with its result (Registry.drain) and the API process
+merges it (Registry.merge), so /metrics covers every process.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from sub-millisecond matching to multi-second PDFs
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# (name, type, help, [(labels, value), ...]) produced by a collector at scrape time
+MetricFamily = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = (f'{name}="{_escape_label_value(str(value))}"' for name, value in labels.items())
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], lock: threading.Lock):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = lock
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...], **extra) -> Dict[str, str]:
+        labels = dict(zip(self.labelnames, key))
+        labels.update(extra)
+        return labels
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _render(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self._labels(key))} {_format_value(value)}" for key, value in self._values.items()]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name, help, labelnames, lock, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames, lock)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (non-cumulative, last is +Inf), sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the with-block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return sum(entry[0]) if entry else 0
+
+    def _render(self) -> List[str]:
+        lines = []
+        for key, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(self._labels(key, le=_format_value(bound)))} {cumulative}")
+            labels = _format_labels(self._labels(key))
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Named metrics plus collectors that report externally kept values at scrape time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames, self._lock))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames, self._lock))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, self._lock, buckets))
+
+    def add_collector(self, collect: Callable[[], Iterable[MetricFamily]]) -> None:
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for metric in self._metrics.values():
+                lines.append(f"# HELP {metric.name} {metric.help}")
+                lines.append(f"# TYPE {metric.name} {metric.type}")
+                lines.extend(metric._render())
+        for collect in self._collectors:
+            for name, metric_type, help, samples in collect():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+    def drain(self) -> Dict[str, dict]:
+        """Counter and histogram values recorded since the last drain, which are then reset."""
+        recorded = {}
+        with self._lock:
+            for name, metric in self._metrics.items():
+                if isinstance(metric, Gauge) or not metric._values:
+                    continue
+                recorded[name] = metric._values
+                metric._values = {}
+        return recorded
+
+    def merge(self, recorded: Optional[Dict[str, dict]]) -> None:
+        """Add values drained from another process's registry."""
+        if not recorded:
+            return
+        with self._lock:
+            for name, values in recorded.items():
+                metric = self._metrics.get(name)
+                if isinstance(metric, Histogram):
+                    for key, (counts, total) in values.items():
+                        entry = metric._values.setdefault(key, [[0] * (len(metric.buckets) + 1), 0.0])
+                        entry[0] = [a + b for a, b in zip(entry[0], counts)]
+                        entry[1] += total
+                elif isinstance(metric, Counter):
+                    for key, value in values.items():
+                        metric._values[key] = metric._values.get(key, 0) + value
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "resume_parser_stage_seconds",
+    "Time spent per document or request in each processing stage",
+    ["stage"],
+)
+DOCUMENT_BYTES = REGISTRY.counter(
+    "resume_parser_document_bytes_total",
+    "Bytes of resume documents received, by source",
+    ["source"],
+)
+PDF_PAGES = REGISTRY.counter("resume_parser_pdf_pages_total", "PDF pages whose text was extracted")
+DOCUMENTS_PARSED = REGISTRY.counter("resume_parser_documents_parsed_total", "Resume texts parsed into profile fields")
+ERRORS = REGISTRY.counter("resume_parser_errors_total", "Failed requests, batch items and jobs by error type", ["type"])
+IN_FLIGHT = REGISTRY.gauge("resume_parser_requests_in_flight", "HTTP requests currently being handled")
+
+# Realized sizes of coalesced /semantic-score encodes (encode_batcher.py)
+_BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+ENCODE_BATCH_TEXTS = REGISTRY.histogram(
+    "resume_parser_encode_batch_texts", "Texts per micro-batched encode", buckets=_BATCH_SIZE_BUCKETS
+)
+ENCODE_BATCH_REQUESTS = REGISTRY.histogram(
+    "resume_parser_encode_batch_requests", "Requests coalesced into each micro-batched encode", buckets=_BATCH_SIZE_BUCKETS
+)
+
+# Load shedding (load_shedding.py)
+POOL_QUEUE_SECONDS = REGISTRY.histogram(
+    "resume_parser_pool_queue_seconds", "Time tasks waited for a parse or encode pool slot", ["pool"]
+)
+REQUESTS_REJECTED = REGISTRY.counter(
+    "resume_parser_requests_rejected_total",
+    "Requests refused before any work: overloaded pool (429/503) or oversized upload (413)",
+    ["reason", "pool"],
+)
+
+# Per-request profiling (request_profiling.py)
+PROFILES_WRITTEN = REGISTRY.counter("resume_parser_profiles_written_total", "Request profiles dumped to PROFILING_DIR")
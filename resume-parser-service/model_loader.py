@@ -0,0 +1,95 @@
+"""
+Load-once holders for the service's models (spaCy, sentence-transformer).
+
+A ModelLoader loads its model at most once: in a background thread (start())
+or in the first caller that needs it (get()). Callers arriving while it loads
+wait for that load instead of starting another. A warmup inference runs right
+after loading so the first request does not pay for lazily built state, and
+the load and warmup times are kept for /readyz and /metrics.
+"""
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ModelLoader:
+    """A model loaded once; state goes not_loaded -> loading -> ready | failed."""
+
+    def __init__(self, name: str, load: Callable[[], Any], warmup: Optional[Callable[[Any], None]] = None):
+        self.name = name
+        self._load = load
+        self._warmup = warmup
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self.state = "not_loaded"
+        self.model = None
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.warmup_seconds: Optional[float] = None
+        # time.perf_counter() when loading finished (successfully or not)
+        self.finished_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def start(self) -> None:
+        """Load in a background thread, unless loading has already begun."""
+        if self._begin():
+            threading.Thread(target=self._run, name=f"load-{self.name}", daemon=True).start()
+
+    def get(self) -> Optional[Any]:
+        """The model, loading it in this thread if nobody has yet; None if loading failed."""
+        if self._begin():
+            self._run()
+        self._done.wait()
+        return self.model
+
+    def status(self) -> dict:
+        return {
+            "state": self.state,
+            "loadSeconds": _rounded(self.load_seconds),
+            "warmupSeconds": _rounded(self.warmup_seconds),
+            "error": self.error,
+        }
+
+    def _begin(self) -> bool:
+        with self._lock:
+            if self.state != "not_loaded":
+                return False
+            self.state = "loading"
+            return True
+
+    def _run(self) -> None:
+        try:
+            started = time.perf_counter()
+            model = self._load()
+            if model is None:
+                raise RuntimeError("loader returned no model")
+            self.load_seconds = time.perf_counter() - started
+
+            if self._warmup is not None:
+                started = time.perf_counter()
+                self._warmup(model)
+                self.warmup_seconds = time.perf_counter() - started
+
+            self.model = model
+            self.state = "ready"
+            logger.info(
+                f"✓ {self.name} ready: loaded in {self.load_seconds:.2f} s, "
+                f"warmed up in {self.warmup_seconds or 0:.2f} s"
+            )
+        except Exception as e:
+            self.error = str(e)
+            self.state = "failed"
+            logger.error(f"✗ Failed to load {self.name}: {e}")
+        finally:
+            self.finished_at = time.perf_counter()
+            self._done.set()
+
+
+def _rounded(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds, 3) if seconds is not None else None
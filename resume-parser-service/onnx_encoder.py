@@ -0,0 +1,184 @@
+"""
+ONNX Runtime backend for the sentence-transformer (EMBEDDING_BACKEND=onnx).
+
+The whole sentence-transformer (transformer, pooling and any normalization
+module) is exported once to ONNX with torch.onnx, optionally quantized with
+ONNX Runtime's dynamic int8 quantization, and kept with its tokenizer in a
+directory per model:
+    model.onnx        float32 graph: token ids -> sentence embedding
+    model_qint8.onnx  int8-weight graph (ONNX_QUANTIZE)
+    tokenizer.json    the model's fast tokenizer
+    encoder.json      graph inputs, max sequence length and embedding size
+
+Later starts only load onnxruntime and tokenizers, not torch.
+OnnxSentenceEncoder.encode() matches SentenceTransformer.encode() as used by
+the service, so it is a drop-in for _encode_texts.
+"""
+import importlib
+import json
+import logging
+import os
+import re
+from typing import List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_FLOAT_MODEL = "model.onnx"
+_QUANTIZED_MODEL = "model_qint8.onnx"
+_TOKENIZER = "tokenizer.json"
+_CONFIG = "encoder.json"
+
+_INSTALL_HINT = "EMBEDDING_BACKEND=onnx needs the optional ONNX packages: pip install -r requirements-onnx.txt"
+
+
+class OnnxSentenceEncoder:
+    """Tokenize with the model's tokenizer and run the exported graph with ONNX Runtime."""
+
+    def __init__(self, directory: str, quantized: bool = True, intra_op_threads: int = 0, inter_op_threads: int = 0):
+        onnxruntime = _require("onnxruntime")
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(directory, _CONFIG)) as f:
+            config = json.load(f)
+        self.input_names: List[str] = config["inputs"]
+        self.max_seq_length: int = config["max_seq_length"]
+        self.dimension: int = config["dimension"]
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(directory, _TOKENIZER))
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self.tokenizer.enable_padding(pad_id=config["pad_id"], pad_token=config["pad_token"])
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = inter_op_threads
+        self.model_path = os.path.join(directory, _QUANTIZED_MODEL if quantized else _FLOAT_MODEL)
+        self.session = onnxruntime.InferenceSession(self.model_path, options, providers=["CPUExecutionProvider"])
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(self, texts: List[str], normalize_embeddings: bool = False, batch_size: int = 32) -> np.ndarray:
+        """Sentence embeddings, one row per text, batched like SentenceTransformer.encode."""
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+
+        # Longest first, so each batch pads to similar lengths
+        order = sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+        embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            encodings = self.tokenizer.encode_batch([texts[i].strip() for i in batch])
+            features = {
+                "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+                "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+                "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+            }
+            outputs = self.session.run(None, {name: features[name] for name in self.input_names})[0]
+            embeddings[batch] = outputs
+
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings /= np.maximum(norms, 1e-12)
+        return embeddings
+
+
+def load_onnx_encoder(
+    model_name: str,
+    export_dir: str,
+    quantize: bool = True,
+    intra_op_threads: int = 0,
+    inter_op_threads: int = 0,
+) -> OnnxSentenceEncoder:
+    """Encoder for model_name, exporting (and quantizing) it into export_dir/<model> on first use."""
+    directory = os.path.join(export_dir, _directory_name(model_name))
+    if not os.path.exists(os.path.join(directory, _CONFIG)):
+        export_onnx_model(model_name, directory)
+    if quantize and not os.path.exists(os.path.join(directory, _QUANTIZED_MODEL)):
+        quantize_onnx_model(directory)
+    return OnnxSentenceEncoder(directory, quantize, intra_op_threads, inter_op_threads)
+
+
+def export_onnx_model(model_name: str, directory: str, opset: int = 17) -> None:
+    """Export the sentence-transformer model_name (all of its modules) to directory/model.onnx."""
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    _require("onnx")  # torch.onnx.export writes the graph through it
+    logger.info(f"Exporting {model_name} to ONNX in {directory}")
+    model = SentenceTransformer(model_name, device="cpu", local_files_only=True)
+    model.eval()
+    os.makedirs(directory, exist_ok=True)
+
+    # Two inputs of different lengths so padding is part of the traced example
+    features = model.tokenize(["Python developer", "Senior backend engineer with FastAPI and PostgreSQL"])
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in features]
+
+    class SentenceEmbedding(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *inputs):
+            return self.model(dict(zip(input_names, inputs)))["sentence_embedding"]
+
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["sentence_embedding"] = {0: "batch"}
+    with torch.no_grad():
+        torch.onnx.export(
+            SentenceEmbedding(),
+            tuple(features[name] for name in input_names),
+            _partial(directory, _FLOAT_MODEL),
+            input_names=input_names,
+            output_names=["sentence_embedding"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            dynamo=False,
+        )
+    os.replace(_partial(directory, _FLOAT_MODEL), os.path.join(directory, _FLOAT_MODEL))
+
+    model.tokenizer.backend_tokenizer.save(os.path.join(directory, _TOKENIZER))
+    config = {
+        "model": model_name,
+        "inputs": input_names,
+        "max_seq_length": model.max_seq_length,
+        "dimension": model.get_sentence_embedding_dimension(),
+        "pad_id": model.tokenizer.pad_token_id,
+        "pad_token": model.tokenizer.pad_token,
+    }
+    # Written last: its presence marks a complete export
+    with open(_partial(directory, _CONFIG), "w") as f:
+        json.dump(config, f, indent=2)
+    os.replace(_partial(directory, _CONFIG), os.path.join(directory, _CONFIG))
+
+
+def quantize_onnx_model(directory: str) -> None:
+    """Write model_qint8.onnx: model.onnx with weights dynamically quantized to int8."""
+    quantization = _require("onnxruntime.quantization")
+
+    logger.info(f"Quantizing {directory}/{_FLOAT_MODEL} to int8")
+    quantization.quantize_dynamic(
+        os.path.join(directory, _FLOAT_MODEL),
+        _partial(directory, _QUANTIZED_MODEL),
+        weight_type=quantization.QuantType.QInt8,
+    )
+    os.replace(_partial(directory, _QUANTIZED_MODEL), os.path.join(directory, _QUANTIZED_MODEL))
+
+
+def _require(module_name: str):
+    """Import an optional ONNX dependency, pointing at requirements-onnx.txt when it is missing."""
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        raise ImportError(f"{_INSTALL_HINT} ({e})") from e
+
+
+def _directory_name(model_name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", model_name).strip("_.") or "model"
+
+
+def _partial(directory: str, name: str) -> str:
+    # Per-process temporary name; os.replace() publishes finished files atomically
+    return os.path.join(directory, f".{name}.{os.getpid()}.tmp")
@@ -0,0 +1,136 @@
+"""
+Persistent cache of resume parse results in a local SQLite file.
+Entries are keyed by the SHA-256 of the document bytes and tagged with the
+version of the parser and skill taxonomy that produced them; a lookup under
+any other version is a miss, and the next parse of that document replaces the
+entry. Total result size is bounded, evicting least recently used entries.
+
+The file may be shared by several service processes (WAL mode).
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parse_results (
+    key TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    result TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS parse_results_last_used ON parse_results (last_used);
+"""
+
+# Hits refresh last_used at most this often, so repeated hits stay read-only
+_TOUCH_INTERVAL_SECONDS = 60.0
+# Eviction frees space down to this fraction of max_bytes, not just below it
+_EVICT_TO_FRACTION = 0.9
+# Each process keeps a running total of result bytes and re-sums the table when
+# an insert takes it past max_bytes, or once it is this old, to also count
+# what other processes sharing the file have written
+_RESUM_INTERVAL_SECONDS = 30.0
+
+
+class ParseResultCache:
+    """Thread-safe map from document hash to its parse result for one parser/taxonomy version."""
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._resum()
+
+    @staticmethod
+    def make_key(content: bytes) -> str:
+        """Hash the document bytes into a cache key."""
+        return hashlib.sha256(content).hexdigest()
+
+    def get(self, key: str, version: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT result, last_used FROM parse_results WHERE key = ? AND version = ?",
+                (key, version),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            now = time.time()
+            if now - row[1] > _TOUCH_INTERVAL_SECONDS:
+                self._db.execute("UPDATE parse_results SET last_used = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, version: str, result: dict) -> None:
+        payload = json.dumps(result, separators=(",", ":"))
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            replaced = self._db.execute("SELECT size FROM parse_results WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO parse_results (key, version, result, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, version, payload, len(payload), time.time()),
+            )
+            self._bytes += len(payload) - (replaced[0] if replaced else 0)
+            if self._bytes > self.max_bytes or time.monotonic() - self._summed_at > _RESUM_INTERVAL_SECONDS:
+                self._resum()
+                self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM parse_results")
+            self._resum()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parse_results").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _resum(self) -> None:
+        (self._bytes,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM parse_results").fetchone()
+        self._summed_at = time.monotonic()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries while the results (as last summed) exceed max_bytes."""
+        if self._bytes <= self.max_bytes:
+            return
+        excess = self._bytes - int(self.max_bytes * _EVICT_TO_FRACTION)
+        evicted = []
+        cursor = self._db.execute("SELECT key, size FROM parse_results ORDER BY last_used")
+        for key, entry_size in cursor:
+            evicted.append((key,))
+            excess -= entry_size
+            self._bytes -= entry_size
+            if excess <= 0:
+                break
+        cursor.close()
+        self._db.executemany("DELETE FROM parse_results WHERE key = ?", evicted)
+        self.evictions += len(evicted)
@@ -0,0 +1,176 @@
+"""
+In-process queue of asynchronous parse jobs.
+
+Submitting a job returns its id at once; a fixed number of worker tasks drain
+a bounded queue and run each job under a timeout, and callers poll for the
+result. Finished jobs are kept for a TTL and then forgotten. When the queue is
+full, submit() raises QueueFull with a Retry-After estimate derived from the
+queue depth and recent job durations, so spikes are shed instead of queued
+into timeouts.
+
+Statuses follow the backend's resume parse status: queued, processing, done, failed.
+"""
+import asyncio
+import logging
+import math
+import time
+import uuid
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Weight of the latest job in the moving average of job durations
+_DURATION_SMOOTHING = 0.2
+
+
+class QueueFull(Exception):
+    """The job queue is at capacity; retry after `retry_after` seconds."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Parse job queue is full; retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class ParseJob:
+    """One submitted document and, once finished, its result or error."""
+
+    def __init__(self, source: str, work: Callable[[], Awaitable[dict]]):
+        self.id = uuid.uuid4().hex
+        self.source = source
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[dict] = None
+        self.error: Optional[str] = None
+        # HTTP status the synchronous endpoint would have returned for the failure
+        self.error_status: Optional[int] = None
+        self._work: Optional[Callable[[], Awaitable[dict]]] = work
+
+
+class ParseJobQueue:
+    """Bounded FIFO of parse jobs drained by `workers` asyncio tasks."""
+
+    def __init__(
+        self,
+        workers: int,
+        max_queued: int,
+        timeout: float,
+        result_ttl: float,
+        describe_error: Callable[[BaseException], Tuple[int, str]],
+    ):
+        self.workers = workers
+        self.max_queued = max_queued
+        self.timeout = timeout
+        self.result_ttl = result_ttl
+        self.describe_error = describe_error
+        self._jobs: Dict[str, ParseJob] = {}
+        # (expiry time, job id) in finishing order; the TTL is fixed, so expiries are sorted
+        self._expiries: Deque[Tuple[float, str]] = deque()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._running = 0
+        self._avg_duration = 1.0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def start(self) -> None:
+        """Start the worker tasks on the running event loop."""
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Jobs still queued can no longer run
+        for job in self._jobs.values():
+            if job.status == "queued":
+                self._finish(job, error=RuntimeError("Service shut down before the job ran"))
+
+    def submit(self, source: str, work: Callable[[], Awaitable[dict]]) -> ParseJob:
+        """Queue work() as a job, or raise QueueFull."""
+        self._expire()
+        job = ParseJob(source, work)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise QueueFull(self.retry_after()) from None
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[ParseJob]:
+        self._expire()
+        return self._jobs.get(job_id)
+
+    def retry_after(self) -> int:
+        """Seconds until a queue slot is likely to free up, from queue depth and recent job durations."""
+        waiting = self._queue.qsize() if self._queue else 0
+        return max(1, math.ceil(waiting * self._avg_duration / max(1, self.workers)))
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "processing": self._running,
+            "max_queued": self.max_queued,
+            "workers": self.workers,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_job_seconds": round(self._avg_duration, 3),
+        }
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            job.status = "processing"
+            job.started_at = time.time()
+            self._running += 1
+            # asyncio.wait (unlike wait_for) never swallows the worker's own cancellation
+            task = asyncio.ensure_future(job._work())
+            try:
+                await asyncio.wait({task}, timeout=self.timeout)
+            except asyncio.CancelledError:
+                task.cancel()
+                self._finish(job, error=RuntimeError("Service shut down while the job was running"))
+                raise
+            finally:
+                self._running -= 1
+                self._queue.task_done()
+
+            if not task.done():
+                task.cancel()
+                logger.warning(f"Parse job {job.id} timed out after {self.timeout:g}s")
+                self._finish(job, error=asyncio.TimeoutError(f"Parse job timed out after {self.timeout:g}s"))
+            elif task.cancelled():
+                self._finish(job, error=RuntimeError("Parse job was cancelled"))
+            elif task.exception() is not None:
+                self._finish(job, error=task.exception())
+            else:
+                self._finish(job, result=task.result())
+
+    def _finish(self, job: ParseJob, result: Optional[dict] = None, error: Optional[BaseException] = None) -> None:
+        job.finished_at = time.time()
+        job._work = None  # release the document bytes
+        if error is None:
+            job.status = "done"
+            job.result = result
+            self.completed += 1
+        else:
+            job.status = "failed"
+            job.error_status, job.error = self.describe_error(error)
+            self.failed += 1
+        if job.started_at is not None:
+            duration = job.finished_at - job.started_at
+            self._avg_duration += _DURATION_SMOOTHING * (duration - self._avg_duration)
+        self._expiries.append((job.finished_at + self.result_ttl, job.id))
+
+    def _expire(self) -> None:
+        now = time.time()
+        while self._expiries and self._expiries[0][0] <= now:
+            _, job_id = self._expiries.popleft()
+            self._jobs.pop(job_id, None)
@@ -0,0 +1,177 @@
+"""
+Opt-in profiling of single parse requests.
+
+With PROFILING_ENABLED, ProfilingMiddleware marks a parse request for profiling
+when it carries the X-Profile header or falls in the PROFILING_SAMPLE_RATE
+sample. Every parse-pool task of a marked request then runs under cProfile in
+the worker that executes it (text extraction, spaCy and section extraction run
+there, not in the event loop), and returns its stats with its result. Once the
+response is sent, the stats of all its tasks are merged into one pstats file
+named after the request id, and the oldest dumps beyond PROFILING_MAX_DUMPS are
+deleted. When profiling is disabled the middleware is not installed, and
+current() is a single context-variable lookup.
+"""
+import asyncio
+import contextvars
+import cProfile
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from typing import List, Optional
+
+from metrics import PROFILES_WRITTEN
+
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+_current: "contextvars.ContextVar[Optional[RequestProfile]]" = contextvars.ContextVar("request_profile", default=None)
+
+
+class _RawStats:
+    """What pstats.Stats accepts besides a file name: an object with create_stats() and stats."""
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class RequestProfile:
+    """cProfile stats collected from the pool tasks of one request."""
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.file_name = f"{time.strftime('%Y%m%dT%H%M%S')}-{request_id}.prof"
+        self.started = time.perf_counter()
+        self._parts: List[dict] = []
+        self._lock = threading.Lock()
+
+    @property
+    def tasks(self) -> int:
+        return len(self._parts)
+
+    def add(self, stats: Optional[dict]) -> None:
+        if stats:
+            with self._lock:
+                self._parts.append(stats)
+
+    def save(self, directory: str, max_dumps: int) -> Optional[str]:
+        """Write the merged stats to <directory>/<file_name> and prune old dumps; None if nothing ran."""
+        if not self._parts:
+            return None
+        merged = pstats.Stats(_RawStats(self._parts[0]))
+        for part in self._parts[1:]:
+            merged.add(_RawStats(part))
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, self.file_name)
+        merged.dump_stats(path)
+        PROFILES_WRITTEN.inc()
+        prune_dumps(directory, max_dumps)
+        return path
+
+
+def current() -> Optional[RequestProfile]:
+    """The profile of the request being handled, if it is profiled."""
+    return _current.get()
+
+
+def run_profiled(fn, *args):
+    """
+    Pool task wrapper: run fn(*args) under cProfile and return (result, stats).
+    The stats are None when another profiler is already active in this process
+    (Python 3.12+ allows only one at a time); the task still runs.
+    """
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        return fn(*args), None
+    try:
+        result = fn(*args)
+    finally:
+        profiler.disable()
+    profiler.create_stats()
+    return result, profiler.stats
+
+
+def prune_dumps(directory: str, max_dumps: int) -> None:
+    """Delete the oldest .prof files in directory beyond the newest max_dumps."""
+    try:
+        dumps = [entry for entry in os.scandir(directory) if entry.name.endswith(".prof")]
+    except FileNotFoundError:
+        return
+    dumps.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in dumps[max(0, max_dumps):]:
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+
+class ProfilingMiddleware:
+    """
+    Profile POSTs to the given path prefixes that ask for it (header) or are
+    sampled. The response carries X-Request-ID, and X-Profile with the dump's
+    file name; the dump itself is written after the response body is sent.
+    """
+
+    def __init__(self, app, prefixes, header: str, sample_rate: float, directory: str, max_dumps: int, on_saved=None):
+        self.app = app
+        self.prefixes = tuple(prefixes)
+        self.header = header.lower().encode("latin-1")
+        self.sample_rate = sample_rate
+        self.directory = directory
+        self.max_dumps = max_dumps
+        # Called with (profile, path) once a dump is written, e.g. to log it
+        self.on_saved = on_saved
+
+    async def __call__(self, scope, receive, send):
+        if not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(_request_id(scope))
+
+        async def send_with_ids(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-request-id", profile.request_id.encode("latin-1")))
+                headers.append((b"x-profile", profile.file_name.encode("latin-1")))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        token = _current.set(profile)
+        try:
+            await self.app(scope, receive, send_with_ids)
+        finally:
+            _current.reset(token)
+            path = await asyncio.get_running_loop().run_in_executor(None, profile.save, self.directory, self.max_dumps)
+            if path is not None and self.on_saved is not None:
+                self.on_saved(profile, path)
+
+    def _wanted(self, scope) -> bool:
+        if scope["type"] != "http" or scope["method"] != "POST" or not scope["path"].startswith(self.prefixes):
+            return False
+        value = _header(scope, self.header)
+        if value is not None:
+            return value.strip().lower() in ("1", "true", "yes", "on")
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+
+def _request_id(scope) -> str:
+    # A caller-supplied id is kept if it is safe to use in a file name
+    supplied = _header(scope, b"x-request-id")
+    if supplied and _REQUEST_ID.match(supplied):
+        return supplied
+    return uuid.uuid4().hex
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", ()):
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
@@ -0,0 +1,502 @@
+"""
+Resume parsing pipeline: text extraction (PDF/DOCX), spaCy-based skill
+extraction from the taxonomy data file (skills.json, see skill_taxonomy.py) and
+line-based extraction of sections, title, summary and years of experience
+(resume_sections.py).
+
+Kept separate from the FastAPI app so parse worker processes only load spaCy,
+never the sentence-transformer model.
+"""
+import hashlib
+import io
+import logging
+import multiprocessing
+import multiprocessing.util
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+
+# spaCy, pdfplumber and docx2txt are imported on first use: importing spaCy
+# alone takes seconds, and the API process should start before it is needed.
+import settings
+from metrics import DOCUMENTS_PARSED, PDF_PAGES, REGISTRY, STAGE_SECONDS
+from resume_sections import scan_resume
+from skill_taxonomy import CompiledSkillMatcher, SkillTaxonomy, SkillTaxonomyError
+from skill_trie import TokenizerRules, TokenTrieSkillMatcher
+
+logger = logging.getLogger(__name__)
+
+# Magic-byte signatures of the formats we can read
+_PDF_MAGIC = b"%PDF-"
+_ZIP_MAGIC = b"PK\x03\x04"
+_OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"  # legacy .doc (and .xls/.ppt)
+
+# Source accepted by _extract_text: raw bytes, a binary stream, or a file path
+DocumentSource = Union[bytes, bytearray, memoryview, BinaryIO, str, os.PathLike]
+
+
+# Modules whose code shapes a parse result; see PARSER_VERSION
+_PARSER_SOURCES = ["resume_parsing.py", "resume_sections.py", "skill_taxonomy.py", "skill_trie.py"]
+
+
+def _parser_version() -> str:
+    """Hash of the parsing code and the extraction budgets, which also change results."""
+    digest = hashlib.sha256()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in _PARSER_SOURCES:
+        with open(os.path.join(directory, name), "rb") as f:
+            digest.update(f.read())
+    digest.update(f"{settings.PDF_MAX_PAGES}:{settings.EXTRACT_MAX_CHARS}".encode())
+    return digest.hexdigest()[:12]
+
+
+# Changes whenever parsing logic or budgets change, invalidating cached results
+PARSER_VERSION = _parser_version()
+
+
+class UnsupportedDocumentError(ValueError):
+    """The document is not a PDF or DOCX file."""
+
+
+class DocumentTooLargeError(ValueError):
+    """The document exceeds a size budget (upload size, uncompressed DOCX size)."""
+
+
+# spaCy pipeline, loaded by load_nlp() in the API process and in each pool worker
+nlp = None
+
+# en_core_web_sm components. Skill matching only needs tokens (PhraseMatcher on
+# LOWER), so the parse path excludes all of them unless SPACY_PIPELINE=full.
+SPACY_COMPONENTS = ["tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer", "ner"]
+
+
+def load_nlp():
+    """Load the spaCy model once per process; returns None if it is not installed."""
+    global nlp
+    if nlp is None:
+        nlp = _load_spacy_pipeline(settings.SPACY_PIPELINE)
+    return nlp
+
+
+def _load_spacy_pipeline(mode: str):
+    """'tokenizer': tokenizer-only pipeline; 'full': every trained component."""
+    import spacy
+
+    exclude = SPACY_COMPONENTS if mode == "tokenizer" else []
+    try:
+        pipeline = spacy.load("en_core_web_sm", exclude=exclude)
+        logger.info(f"✓ spaCy model loaded successfully ({mode} pipeline: {pipeline.pipe_names or 'tokenizer only'})")
+        return pipeline
+    except OSError:
+        logger.error("✗ spaCy model not found. Run: python -m spacy download en_core_web_sm")
+        return None
+
+
+def init_worker():
+    """Process-pool initializer: configure logging, load spaCy and compile the skill taxonomy once per worker."""
+    logging.basicConfig(level=settings.LOG_LEVEL.upper())
+    if load_nlp() is not None:
+        try:
+            warm_up()
+        except SkillTaxonomyError as e:
+            # Leave the pool usable; the parse itself reports the error
+            logger.error(f"✗ {e}")
+
+
+# A short resume that exercises every parsing stage
+_WARMUP_TEXT = """Software Engineer
+Summary
+Backend developer building APIs with Python, FastAPI and PostgreSQL.
+Experience
+Senior Developer, Acme Corp, 2019 - 2023
+Built services with Docker, Kubernetes and React.
+Education
+B.Sc. Computer Science
+Skills
+Python, JavaScript, AWS, Git"""
+
+
+def warm_up() -> None:
+    """
+    Compile the skill taxonomy, import the document readers and run a short
+    resume through skill matching and section scanning, so the first real
+    parse does not pay for any of it. Requires load_nlp(); nothing is recorded
+    in metrics.
+    """
+    import docx2txt  # noqa: F401
+    import pdfplumber  # noqa: F401
+
+    matcher = get_skill_matcher()
+    lower_text = _WARMUP_TEXT.lower()
+    matcher(lower_text if isinstance(matcher, TokenTrieSkillMatcher) else nlp(lower_text))
+    scan_resume(_WARMUP_TEXT, lower_text)
+
+
+def parse_document(source: DocumentSource) -> dict:
+    """Extract text from a resume document and parse it into profile fields."""
+    text = extract_document_text(source)
+
+    parsed_data = _parse_resume_text(text)
+    logger.debug("Parsing complete: %d skills found", len(parsed_data["skills"]))
+    return parsed_data
+
+
+def extract_document_text(source: DocumentSource) -> str:
+    """Extract the text of a resume document (first stage of parse_document)."""
+    with STAGE_SECONDS.time(stage="extract_text"):
+        text = _extract_text(source)
+    logger.debug("Extracted %d characters from resume", len(text))
+    return text
+
+
+def run_with_metrics(fn, *args):
+    """
+    Process-pool task wrapper: run fn(*args) and return (result, metrics recorded
+    in this worker since its last task) for the API process to merge.
+    """
+    result = fn(*args)
+    return result, REGISTRY.drain()
+
+
+def parse_texts(texts: List[str]) -> List[Tuple[Optional[dict], Optional[Exception]]]:
+    """
+    Parse many extracted resume texts, running the spaCy stage for the whole
+    batch through nlp.pipe(). Returns a (result, exception) pair per text so
+    one bad document does not fail the others; the API reports the exception
+    as it would for a single parse.
+    """
+    lower_texts = [text.lower() for text in texts]
+    try:
+        skills_per_text = _extract_skills_batch(lower_texts)
+    except Exception as e:
+        # e.g. a text over nlp.max_length; retry one by one so only it fails
+        logger.error(f"Batch skill extraction failed ({e}); parsing documents individually")
+        skills_per_text = [None] * len(texts)
+
+    results = []
+    for text, lower_text, skills in zip(texts, lower_texts, skills_per_text):
+        try:
+            results.append((_parse_resume_text(text, lower_text, skills), None))
+        except Exception as e:
+            results.append((None, e))
+    logger.debug("Batch parsing complete: %d/%d documents", sum(error is None for _, error in results), len(texts))
+    return results
+
+
+# Skill taxonomy compiled against this process's spaCy pipeline on first use.
+# reload_skill_taxonomy() builds the replacement first and swaps it in with a
+# single assignment, so in-flight parses keep the matcher they started with.
+SkillMatcher = Union[CompiledSkillMatcher, TokenTrieSkillMatcher]
+_skill_matcher: Optional[SkillMatcher] = None
+_skill_matcher_lock = threading.Lock()
+# spaCy tokenizer boundaries for the token-trie engine (kept across reloads)
+_tokenizer_rules: Optional[TokenizerRules] = None
+
+
+def get_skill_matcher() -> SkillMatcher:
+    global _skill_matcher
+    with _skill_matcher_lock:
+        if _skill_matcher is None:
+            _skill_matcher = _compile_skill_taxonomy(settings.SKILLS_TAXONOMY_PATH)
+        return _skill_matcher
+
+
+def reload_skill_taxonomy(path: Optional[str] = None) -> SkillTaxonomy:
+    """
+    Load and compile the taxonomy at path (default SKILLS_TAXONOMY_PATH) and make
+    it current. Raises SkillTaxonomyError and keeps the old one if it is invalid.
+    """
+    global _skill_matcher
+    matcher = _compile_skill_taxonomy(path or settings.SKILLS_TAXONOMY_PATH)
+    with _skill_matcher_lock:
+        _skill_matcher = matcher
+    return matcher.taxonomy
+
+
+def parse_result_version() -> str:
+    """Version tag of results parsed now: parser code plus the current skill taxonomy."""
+    return f"{PARSER_VERSION}-{get_skill_matcher().taxonomy.version}"
+
+
+def _compile_skill_taxonomy(path: str) -> SkillMatcher:
+    """PhraseMatcher (SKILL_ENGINE=spacy) or token trie (SKILL_ENGINE=trie) for the taxonomy at path."""
+    global _tokenizer_rules
+    started = time.perf_counter()
+    taxonomy = SkillTaxonomy.load(path)
+    pipeline = load_nlp()
+    if pipeline is None:
+        import spacy
+        pipeline = spacy.blank("en")
+    if settings.SKILL_ENGINE == "trie":
+        if _tokenizer_rules is None:
+            _tokenizer_rules = TokenizerRules.from_spacy(pipeline.tokenizer)
+        matcher = TokenTrieSkillMatcher(taxonomy, _tokenizer_rules)
+    else:
+        matcher = taxonomy.compile(pipeline)
+    logger.info(
+        f"Skill taxonomy {taxonomy.version} compiled ({settings.SKILL_ENGINE}): {len(taxonomy.skills)} skills "
+        f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+    )
+    return matcher
+
+
+def _detect_file_type(stream: BinaryIO) -> str:
+    """Identify the document format from its magic bytes ('.pdf' or '.docx')"""
+    head = stream.read(1024)
+    stream.seek(0)
+
+    # Some generators prepend junk before the PDF header; readers tolerate it
+    if _PDF_MAGIC in head:
+        return '.pdf'
+    if head.startswith(_ZIP_MAGIC):
+        try:
+            with zipfile.ZipFile(stream) as archive:
+                is_docx = 'word/document.xml' in archive.namelist()
+                # Declared sizes bound what reading the entries can inflate to
+                uncompressed = sum(info.file_size for info in archive.infolist())
+        except zipfile.BadZipFile:
+            is_docx = False
+        stream.seek(0)
+        if is_docx:
+            limit = settings.DOCX_MAX_UNCOMPRESSED_BYTES
+            if limit and uncompressed > limit:
+                raise DocumentTooLargeError(f"DOCX expands to {uncompressed} bytes; at most {limit} are allowed")
+            return '.docx'
+        raise UnsupportedDocumentError("ZIP file is not a Word (.docx) document")
+    if head.startswith(_OLE_MAGIC):
+        raise UnsupportedDocumentError("Legacy .doc files are not supported; please upload a PDF or DOCX")
+    raise UnsupportedDocumentError("Unrecognised file type; please upload a PDF or DOCX")
+
+
+def _extract_text(source: DocumentSource) -> str:
+    """
+    Extract text from a PDF or DOCX document held in memory or on disk.
+    The format is sniffed from magic bytes; pdfplumber and docx2txt both read
+    from in-memory streams, so bytes are never written to a temp file.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        stream = io.BytesIO(source)
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            return _extract_text(f)
+    else:
+        stream = source
+
+    try:
+        extension = _detect_file_type(stream)
+
+        if extension == '.pdf':
+            # Extract text from PDF using pdfplumber, page by page within budget
+            text = _extract_pdf_text(stream)
+        else:
+            # Extract text from Word document
+            import docx2txt
+            text = docx2txt.process(stream)
+            if settings.EXTRACT_MAX_CHARS:
+                text = text[:settings.EXTRACT_MAX_CHARS]
+
+        return text.strip()
+
+    except Exception as e:
+        logger.error(f"Text extraction failed: {e}")
+        raise
+
+def _iter_pdf_pages(pdf, first: int = 0, last: Optional[int] = None) -> Iterator[str]:
+    """Lazily yield the text of pages [first, last), releasing each page's cached objects."""
+    for page_number, page in enumerate(pdf.pages[first:last], start=first + 1):
+        started = time.perf_counter()
+        page_text = page.extract_text() or ""
+        page.close()
+        logger.debug(
+            "PDF page %d: %d chars in %.1f ms",
+            page_number, len(page_text), (time.perf_counter() - started) * 1000,
+        )
+        yield page_text
+
+
+def _extract_pdf_text(stream: BinaryIO) -> str:
+    """
+    Extract PDF text within the PDF_MAX_PAGES / EXTRACT_MAX_CHARS budget,
+    stopping as soon as enough text is collected. Large PDFs are split into
+    page ranges extracted in parallel when PDF_PARALLEL_WORKERS > 1.
+    """
+    import pdfplumber
+
+    max_pages = settings.PDF_MAX_PAGES or None
+    max_chars = settings.EXTRACT_MAX_CHARS
+    started = time.perf_counter()
+    deadline = started + settings.EXTRACT_TIMEOUT if settings.EXTRACT_TIMEOUT else None
+
+    parts = []
+    collected = 0
+    pages_read = 0
+    with pdfplumber.open(stream) as pdf:
+        page_count = len(pdf.pages)
+        last_page = min(page_count, max_pages) if max_pages else page_count
+
+        # With a page budget below PDF_PARALLEL_MIN_PAGES every PDF is read serially
+        if settings.PDF_PARALLEL_WORKERS > 1 and last_page >= settings.PDF_PARALLEL_MIN_PAGES:
+            stream.seek(0)
+            page_texts = _iter_pdf_pages_parallel(stream.read(), last_page)
+        else:
+            page_texts = _iter_pdf_pages(pdf, 0, last_page)
+
+        for page_text in page_texts:
+            pages_read += 1
+            if page_text:
+                parts.append(page_text)
+                collected += len(page_text) + 1
+            if max_chars and collected >= max_chars:
+                break
+            if deadline and time.perf_counter() > deadline and pages_read < last_page:
+                page_texts.close()
+                PDF_PAGES.inc(pages_read)
+                raise TimeoutError(
+                    f"Text extraction exceeded {settings.EXTRACT_TIMEOUT:g} s after {pages_read} of {page_count} pages"
+                )
+        page_texts.close()
+
+    text = "\n".join(parts)
+    if max_chars:
+        text = text[:max_chars]
+    PDF_PAGES.inc(pages_read)
+    logger.debug(
+        "PDF extraction: %d/%d pages, %d chars in %.0f ms",
+        pages_read, page_count, len(text), (time.perf_counter() - started) * 1000,
+    )
+    return text
+
+
+# Process pool for page-range extraction of large PDFs (created on first use)
+_page_pool: Optional[ProcessPoolExecutor] = None
+_page_pool_lock = threading.Lock()
+
+
+def _get_page_pool() -> ProcessPoolExecutor:
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = ProcessPoolExecutor(
+                max_workers=settings.PDF_PARALLEL_WORKERS,
+                mp_context=multiprocessing.get_context(settings.PARSE_MP_START_METHOD),
+            )
+            # A parse-pool worker joins its child processes on exit, before the
+            # executors' own exit hook runs, so stop the page workers first. The
+            # priority puts this ahead of the finalizers (10) that close the
+            # pool's queues, which would keep the stop signal from reaching them.
+            multiprocessing.util.Finalize(None, _shutdown_page_pool, exitpriority=100)
+        return _page_pool
+
+
+def _shutdown_page_pool() -> None:
+    global _page_pool
+    with _page_pool_lock:
+        pool, _page_pool = _page_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+def _extract_pdf_page_range(data: bytes, first: int, last: int) -> List[str]:
+    """Page-pool task: text of pages [first, last) of an in-memory PDF."""
+    import pdfplumber
+
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return list(_iter_pdf_pages(pdf, first, last))
+
+
+def _iter_pdf_pages_parallel(data: bytes, last_page: int) -> Iterator[str]:
+    """
+    Yield page texts in order while page ranges are extracted concurrently.
+    Ranges not yet started are cancelled when the caller stops iterating.
+    """
+    chunk = settings.PDF_PARALLEL_CHUNK_PAGES
+    pool = _get_page_pool()
+    futures = [
+        pool.submit(_extract_pdf_page_range, data, first, min(first + chunk, last_page))
+        for first in range(0, last_page, chunk)
+    ]
+    try:
+        for future in futures:
+            yield from future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _parse_resume_text(text: str, lower_text: Optional[str] = None, skills: Optional[List[str]] = None) -> dict:
+    """
+    Parse resume text and extract structured information.
+    Bulk parsing passes the lowercased text and the skills it already matched.
+    """
+    
+    logger.debug("Starting resume text parsing: %d characters", len(text))
+    
+    # Lowercase once for skill matching and the line scanner
+    if lower_text is None:
+        lower_text = text.lower()
+    
+    # Extract skills (spaCy PhraseMatcher or token trie, per SKILL_ENGINE)
+    if skills is None:
+        skills = _extract_skills(lower_text)
+    
+    # Sections, title, summary and years of experience in one pass over the lines
+    with STAGE_SECONDS.time(stage="extract_sections"):
+        fields = scan_resume(text, lower_text)
+    
+    # Per-field details are only formatted when debug logging is on
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Skills extracted: %d - %s", len(skills), skills[:10])
+        logger.debug("Sections extracted - Education: %s, Experience: %s", fields["educationFound"], fields["experienceFound"])
+        logger.debug("Title extracted: '%s'", fields["title"])
+        logger.debug("Experience years: %d", fields["experienceYears"])
+        logger.debug("Summary extracted: %d chars", len(fields["summary"]))
+    
+    result = {
+        "title": fields["title"],
+        "skills": skills,
+        "education": fields["education"],
+        "experience": fields["experience"],
+        "summary": fields["summary"],
+        "experienceYears": fields["experienceYears"],
+        # Debug fields
+        "educationFound": fields["educationFound"],
+        "experienceFound": fields["experienceFound"]
+    }
+    DOCUMENTS_PARSED.inc()
+    logger.debug("Parse complete. Education length: %d, Experience length: %d", len(result["education"]), len(result["experience"]))
+    
+    return result
+
+def _extract_skills(lower_text: str) -> List[str]:
+    """Extract canonical skills (aliases resolved) from lowercased text using the compiled taxonomy"""
+    matcher = get_skill_matcher()
+    if isinstance(matcher, TokenTrieSkillMatcher):
+        # Splits the text with spaCy's token boundaries itself; no Doc is built
+        with STAGE_SECONDS.time(stage="extract_skills"):
+            return matcher(lower_text)
+    # Process text with spaCy (tokenizer only unless SPACY_PIPELINE=full)
+    with STAGE_SECONDS.time(stage="spacy"):
+        doc = nlp(lower_text)
+    with STAGE_SECONDS.time(stage="extract_skills"):
+        return matcher(doc)
+
+
+def _extract_skills_batch(lower_texts: List[str]) -> List[List[str]]:
+    """_extract_skills for many texts, with Docs built by nlp.pipe() (NLP_BATCH_SIZE / NLP_N_PROCESS)"""
+    matcher = get_skill_matcher()
+    if isinstance(matcher, TokenTrieSkillMatcher):
+        return [_extract_skills(lower_text) for lower_text in lower_texts]
+
+    started = time.perf_counter()
+    docs = list(nlp.pipe(lower_texts, batch_size=settings.NLP_BATCH_SIZE, n_process=settings.NLP_N_PROCESS))
+    # nlp.pipe() works in batches, so its time is recorded amortised per document
+    per_doc = (time.perf_counter() - started) / max(1, len(docs))
+    skills = []
+    for doc in docs:
+        STAGE_SECONDS.observe(per_doc, stage="spacy")
+        with STAGE_SECONDS.time(stage="extract_skills"):
+            skills.append(matcher(doc))
+    return skills
@@ -0,0 +1,225 @@
+"""
+Single-pass extraction of the line-oriented resume fields: education and
+experience sections, title, summary and years of experience.
+
+The text is split and lowercased once. Each line is classified against one
+precompiled alternation of every section header, and the same walk feeds the
+title, summary and section extractors. Only resumes without an education or
+experience header take a second look at the (already lowercased) lines, for
+the degree/date fallbacks.
+"""
+import re
+from typing import List, Optional
+
+# Section headers, matched against the lowercased line (headers are < 60 chars).
+# Education is checked first, then experience, then the others that only end a section.
+_EDUCATION_HEADERS = [
+    r'\beducation\b',
+    r'\bacademic\s+(?:background|qualifications?|history)\b',
+    r'\bqualifications?\b',
+    r'\bdegrees?\b',
+    r'\buniversity\b',
+    r'\bcertifications?\b',
+    r'\beducational\s+background\b',
+]
+
+_EXPERIENCE_HEADERS = [
+    r'\b(?:work\s+)?experience\b',
+    r'\bwork\s+history\b',
+    r'\bemployment(?:\s+history)?\b',
+    r'\bprofessional\s+(?:experience|background|history)\b',
+    r'\bcareer\s+(?:history|summary)\b',
+    r'\bpositions?\s+held\b',
+]
+
+_OTHER_HEADERS = [
+    r'\bskills?\b',
+    r'\bprojects?\b',
+    r'\bsummary\b',
+    r'\bobjective\b',
+    r'\bprofile\b',
+    r'\bachievements?\b',
+    r'\bawards?\b',
+    r'\bcertifications?\b',
+    r'\bhonors?\b',
+    r'\bpublications?\b',
+    r'\breferences?\b',
+    r'\bcontact\b',
+    r'\bpersonal\s+(?:information|details)\b',
+]
+
+# Fallbacks when no heading is found: degree keywords / date ranges, on lowercased lines
+_DEGREE_PATTERNS = [
+    r'\b(?:bachelor|master|phd|doctorate|diploma|associate|mba|m\.?s\.?c?|b\.?s\.?c?|b\.?tech|m\.?tech)\b',
+    r'\buniversity\b',
+    r'\bcollege\b',
+    r'\bdegree\b',
+]
+
+_DATE_PATTERNS = [
+    r'\b(?:19|20)\d{2}\s*[-–—]\s*(?:(?:19|20)\d{2}|present|current)\b',
+    r'\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+(?:19|20)\d{2}\b',
+]
+
+# Title (first 10 lines) and summary heading, case-insensitive on the original line
+_TITLE_PATTERNS = [
+    r'^(software engineer|developer|data scientist|analyst|manager|consultant|designer)',
+    r'(senior|junior|lead|principal)\s+(engineer|developer|analyst)',
+]
+_SUMMARY_HEADER = r'\b(summary|objective|profile|about)\b'
+
+# Years of experience, e.g. "5+ years of experience", "experience: 3 years".
+# Matched separately over the whole lowercased text since they can span lines.
+_EXPERIENCE_YEARS_PATTERNS = [
+    r'(\d+)\+?\s*years?\s+(?:of\s+)?experience',
+    r'experience[:\s]+(\d+)\+?\s*years?',
+]
+
+
+def _any_of(patterns: List[str], flags: int = 0) -> "re.Pattern":
+    return re.compile("|".join(f"(?:{p})" for p in patterns), flags)
+
+
+_ANY_HEADER_RE = _any_of(_EDUCATION_HEADERS + _EXPERIENCE_HEADERS + _OTHER_HEADERS)
+_EDUCATION_RE = _any_of(_EDUCATION_HEADERS)
+_EXPERIENCE_RE = _any_of(_EXPERIENCE_HEADERS)
+_DEGREE_RE = _any_of(_DEGREE_PATTERNS)
+_DATE_RE = _any_of(_DATE_PATTERNS)
+_TITLE_RE = _any_of(_TITLE_PATTERNS, re.IGNORECASE)
+_SUMMARY_HEADER_RE = re.compile(_SUMMARY_HEADER, re.IGNORECASE)
+_EXPERIENCE_YEARS_RES = [re.compile(p) for p in _EXPERIENCE_YEARS_PATTERNS]
+
+_HEADER_MAX_CHARS = 60
+_TITLE_MAX_LINES = 10
+_TITLE_MAX_CHARS = 50
+_SUMMARY_MAX_CHARS = 200
+_EDUCATION_FALLBACK_CHARS = 300
+_EXPERIENCE_FALLBACK_CHARS = 400
+_EDUCATION_MAX_CHARS = 800
+_EXPERIENCE_MAX_CHARS = 1000
+
+
+def scan_resume(text: str, lower_text: Optional[str] = None) -> dict:
+    """
+    Extract title, education, experience, summary and experienceYears (plus the
+    educationFound / experienceFound flags) from resume text in one line pass.
+    `lower_text` is text.lower() when the caller already has it.
+    """
+    if lower_text is None:
+        lower_text = text.lower()
+    lines = text.split('\n')
+    lower_lines = lower_text.split('\n')
+
+    sections = {
+        "education": "",
+        "experience": "",
+        "educationFound": False,
+        "experienceFound": False,
+    }
+    current_section = None
+    section_content: List[str] = []
+
+    title = ""
+    in_summary = False
+    summary_done = False
+    summary_lines: List[str] = []
+    summary_chars = -1  # length of ' '.join(summary_lines)
+
+    for index, line in enumerate(lines):
+        line_stripped = line.strip()
+
+        if not title and index < _TITLE_MAX_LINES and line_stripped and len(line_stripped) <= _TITLE_MAX_CHARS:
+            if _TITLE_RE.search(line_stripped):
+                title = line_stripped
+
+        if not summary_done:
+            if _SUMMARY_HEADER_RE.search(line_stripped):
+                in_summary = True
+            elif in_summary:
+                if line_stripped:
+                    summary_lines.append(line_stripped)
+                    summary_chars += len(line_stripped) + 1
+                    summary_done = summary_chars > _SUMMARY_MAX_CHARS
+                elif summary_lines:
+                    # Empty line after summary text ends the section
+                    summary_done = True
+
+        # Skip empty lines between sections
+        if not line_stripped:
+            continue
+
+        header = None
+        if len(line_stripped) < _HEADER_MAX_CHARS:
+            line_lower = lower_lines[index].strip()
+            if _ANY_HEADER_RE.search(line_lower):
+                if _EDUCATION_RE.search(line_lower):
+                    header = "education"
+                elif _EXPERIENCE_RE.search(line_lower):
+                    header = "experience"
+                else:
+                    header = "other"
+
+        if header is not None:
+            if current_section and section_content:
+                sections[current_section] = '\n'.join(section_content).strip()
+            # Other headers only mark the end of the current section
+            current_section = header if header != "other" else None
+            if current_section:
+                sections[f"{current_section}Found"] = True
+            section_content = []
+        elif current_section:
+            section_content.append(line_stripped)
+
+    # Save last section
+    if current_section and section_content:
+        sections[current_section] = '\n'.join(section_content).strip()
+
+    if not sections["educationFound"]:
+        education = _fallback_lines(lines, lower_lines, _DEGREE_RE, _EDUCATION_FALLBACK_CHARS)
+        if education:
+            sections["education"] = education
+            sections["educationFound"] = True
+    if not sections["experienceFound"]:
+        experience = _fallback_lines(lines, lower_lines, _DATE_RE, _EXPERIENCE_FALLBACK_CHARS)
+        if experience:
+            sections["experience"] = experience
+            sections["experienceFound"] = True
+
+    # Limit section length to avoid too much data
+    if len(sections["education"]) > _EDUCATION_MAX_CHARS:
+        sections["education"] = sections["education"][:_EDUCATION_MAX_CHARS] + "..."
+    if len(sections["experience"]) > _EXPERIENCE_MAX_CHARS:
+        sections["experience"] = sections["experience"][:_EXPERIENCE_MAX_CHARS] + "..."
+
+    summary = ' '.join(summary_lines)
+    # If no summary section found, use the start of the first few lines
+    if not summary:
+        summary = ' '.join(lines[:5])[:_SUMMARY_MAX_CHARS]
+
+    return {
+        "title": title,
+        "summary": summary.strip(),
+        "experienceYears": _experience_years(lower_text),
+        **sections,
+    }
+
+
+def _fallback_lines(lines: List[str], lower_lines: List[str], pattern: "re.Pattern", max_chars: int) -> str:
+    """Lines matching pattern, stopping once more than max_chars are collected."""
+    found: List[str] = []
+    chars = -1  # length of '\n'.join(found)
+    for line, line_lower in zip(lines, lower_lines):
+        if pattern.search(line_lower):
+            found.append(line.strip())
+            chars += len(found[-1]) + 1
+            if chars > max_chars:
+                break
+    return '\n'.join(found)
+
+
+def _experience_years(lower_text: str) -> int:
+    """Largest "N years (of) experience" / "experience: N years" figure, or 0."""
+    if "experience" not in lower_text:
+        return 0
+    years = [int(m.group(1)) for regex in _EXPERIENCE_YEARS_RES for m in regex.finditer(lower_text)]
+    return max(years) if years else 0
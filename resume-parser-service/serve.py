@@ -0,0 +1,184 @@
+"""
+Production entry point: several uvicorn workers forked from one master process.
+
+`python main.py` (or `uvicorn main:app`) serves from a single process, and
+`uvicorn --workers N` spawns fresh interpreters that each load spaCy and the
+sentence-transformer again. Here the master loads and warms up both models
+once, moves everything it allocated out of the garbage collector's reach
+(gc.freeze), binds the listening socket and forks the workers. The workers
+share the model weights copy-on-write and accept connections on the same
+socket. Each worker runs torch (or ONNX Runtime) with its share of the cores,
+so N workers do not start N × cores threads.
+
+The master only supervises: a worker that dies is replaced by a fresh fork,
+and SIGTERM/SIGINT are passed on to every worker for a graceful shutdown.
+
+Usage: python serve.py [--workers 4] [--threads-per-worker 1] [--host 0.0.0.0] [--port 8000]
+                       [--no-preload]
+"""
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+# Each worker is already a process of its own: a nested parse process pool would
+# load spaCy again per pool process, and tokenizers must not start threads before fork
+os.environ["PARSE_EXECUTOR"] = "thread"
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+import settings  # noqa: E402
+
+logger = logging.getLogger("serve")
+
+# A worker that exits sooner than this after being forked is restarted after a pause
+_MIN_WORKER_LIFETIME = 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.SERVE_WORKERS)
+    parser.add_argument(
+        "--threads-per-worker", type=int, default=settings.SERVE_THREADS_PER_WORKER,
+        help="torch / ONNX Runtime threads in each worker (0 = cores / workers)",
+    )
+    parser.add_argument(
+        "--no-preload", dest="preload", action="store_false",
+        help="load the models in every worker after forking (for comparison)",
+    )
+    args = parser.parse_args()
+    workers = max(1, args.workers)
+    threads = args.threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+
+    logging.basicConfig(level=settings.LOG_LEVEL.upper())
+    if args.preload:
+        app_module = _preload()
+    else:
+        import main as app_module
+
+    # Close what must not be shared across fork; workers reopen it
+    if app_module.parse_cache is not None:
+        app_module.parse_cache.close()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.host, args.port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    # Objects allocated so far are never collected in the workers, so the
+    # collector does not write to (and un-share) the pages holding them
+    gc.collect()
+    gc.freeze()
+
+    logger.info(f"Serving on http://{args.host}:{args.port} with {workers} workers × {threads} threads")
+    _supervise(lambda: _run_worker(app_module, sock, threads), workers)
+
+
+def _preload():
+    """Import the app and load and warm up its models in this (the master) process."""
+    if settings.EMBEDDING_BACKEND != "onnx":
+        import torch
+
+        # No OpenMP thread pool in the master: threads do not survive fork
+        torch.set_num_threads(1)
+
+    import main as app_module
+
+    started = time.perf_counter()
+    app_module.spacy_loader.get()
+    if settings.EMBEDDING_BACKEND == "onnx":
+        # ONNX Runtime sessions own thread pools and do not survive fork; the
+        # int8 model is small, so each worker loads its own
+        logger.info("EMBEDDING_BACKEND=onnx: the embedding model is loaded in each worker")
+    else:
+        app_module.embedding_loader.get()
+    logger.info(f"✓ Models loaded in the master in {time.perf_counter() - started:.2f} s")
+    return app_module
+
+
+def _run_worker(app_module, sock: socket.socket, threads: int) -> None:
+    """Body of a forked worker: per-worker thread counts and connections, then uvicorn."""
+    import uvicorn
+
+    if "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(threads)
+    if settings.ONNX_INTRA_OP_THREADS == 0:
+        settings.ONNX_INTRA_OP_THREADS = threads
+    if settings.PARSE_CACHE_PATH:
+        from parse_cache import ParseResultCache
+
+        app_module.parse_cache = ParseResultCache(settings.PARSE_CACHE_PATH, max_bytes=settings.PARSE_CACHE_MAX_BYTES)
+
+    config = uvicorn.Config(app_module.app, log_level=settings.LOG_LEVEL.lower())
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _supervise(run_worker, count: int) -> None:
+    """Fork count workers, replace any that die, and pass SIGTERM/SIGINT on to them."""
+    workers = {}  # pid -> fork time
+    stopping = False
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                run_worker()
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else 1
+            except BaseException:
+                logger.exception("Worker failed")
+                code = 1
+            finally:
+                os._exit(code)
+        workers[pid] = time.monotonic()
+        logger.info(f"Started worker {pid}")
+
+    def stop(_signum, _frame):
+        nonlocal stopping
+        stopping = True
+        # SIGTERM is uvicorn's graceful shutdown whatever the master received
+        # (a second SIGINT, e.g. after Ctrl+C reached the workers too, would force it)
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for _ in range(count):
+        spawn()
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        started = workers.pop(pid, None)
+        if started is None or stopping:
+            continue
+        logger.warning(f"Worker {pid} exited ({_describe(status)}); starting a new one")
+        if time.monotonic() - started < _MIN_WORKER_LIFETIME:
+            time.sleep(_MIN_WORKER_LIFETIME)
+        if not stopping:
+            spawn()
+    logger.info("All workers stopped")
+
+
+def _describe(status: int) -> str:
+    if os.WIFSIGNALED(status):
+        return f"signal {os.WTERMSIG(status)}"
+    return f"code {os.WEXITSTATUS(status)}"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Runtime settings for the resume parser service.
+Every value can be overridden with an environment variable of the same name.
+"""
+import os
+
+
+def _env_str(name: str, default: str) -> str:
+    return os.getenv(name, default)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+# Per-request and per-stage details are logged at DEBUG
+LOG_LEVEL = _env_str("LOG_LEVEL", "INFO")
+
+# --- Startup ---
+# How the spaCy and sentence-transformer models are loaded:
+# "background": in background threads once the app starts; it answers /healthz
+#               at once and /readyz with 503 until both are loaded and warmed up
+# "startup":    before the app accepts any request
+# "lazy":       on the first request that needs each model
+MODEL_LOADING = _env_str("MODEL_LOADING", "background")
+
+# --- Prefork server (serve.py) ---
+# Worker processes forked from a master that has loaded and warmed up the models,
+# so the weights are shared copy-on-write instead of loaded once per worker.
+# Torch / ONNX Runtime threads per worker: 0 = cores / workers (at least 1)
+SERVE_WORKERS = _env_int("SERVE_WORKERS", os.cpu_count() or 1)
+SERVE_THREADS_PER_WORKER = _env_int("SERVE_THREADS_PER_WORKER", 0)
+
+# --- Resume downloads (/parse-resume) ---
+DOWNLOAD_MAX_BYTES = _env_int("DOWNLOAD_MAX_BYTES", 10 * 1024 * 1024)
+DOWNLOAD_CONNECT_TIMEOUT = _env_float("DOWNLOAD_CONNECT_TIMEOUT", 5.0)
+DOWNLOAD_READ_TIMEOUT = _env_float("DOWNLOAD_READ_TIMEOUT", 30.0)
+DOWNLOAD_MAX_CONNECTIONS = _env_int("DOWNLOAD_MAX_CONNECTIONS", 20)
+DOWNLOAD_RETRIES = _env_int("DOWNLOAD_RETRIES", 2)
+
+# --- Worker pools ---
+# "process": text extraction + spaCy run in a process pool (one spaCy model per
+# worker) so concurrent parses use several cores; "thread": a thread pool.
+PARSE_EXECUTOR = _env_str("PARSE_EXECUTOR", "process")
+PARSE_WORKERS = _env_int("PARSE_WORKERS", os.cpu_count() or 2)
+PARSE_MP_START_METHOD = _env_str("PARSE_MP_START_METHOD", "spawn")
+# Threads for embedding and vector search; torch already parallelises each encode
+ENCODE_WORKERS = _env_int("ENCODE_WORKERS", 2)
+
+# --- Text extraction budgets (0 = unlimited) ---
+# Parsing only needs the first few thousand characters, so long portfolios stop early
+PDF_MAX_PAGES = _env_int("PDF_MAX_PAGES", 12)
+EXTRACT_MAX_CHARS = _env_int("EXTRACT_MAX_CHARS", 40000)
+# Wall-clock seconds for extracting one document's text, checked between PDF pages
+# in the worker itself, so a pathological file frees its worker (fails with 504)
+EXTRACT_TIMEOUT = _env_float("EXTRACT_TIMEOUT", 20.0)
+# Total uncompressed size of a DOCX archive; larger ones (zip bombs) fail with 413
+DOCX_MAX_UNCOMPRESSED_BYTES = _env_int("DOCX_MAX_UNCOMPRESSED_BYTES", 50 * 1024 * 1024)
+# Extract page ranges of large PDFs in parallel processes (<= 1 disables). Only
+# PDFs with at least PDF_PARALLEL_MIN_PAGES pages within PDF_MAX_PAGES qualify,
+# so keep it at or below the page budget
+PDF_PARALLEL_WORKERS = _env_int("PDF_PARALLEL_WORKERS", 0)
+PDF_PARALLEL_MIN_PAGES = _env_int("PDF_PARALLEL_MIN_PAGES", 8)
+PDF_PARALLEL_CHUNK_PAGES = _env_int("PDF_PARALLEL_CHUNK_PAGES", 4)
+
+# --- NLP ---
+# "tokenizer": skill matching only needs tokens, so tagger/parser/NER are not
+# loaded; "full": load every en_core_web_sm component
+SPACY_PIPELINE = _env_str("SPACY_PIPELINE", "tokenizer")
+# Skill matching engine: "spacy" (PhraseMatcher over a spaCy Doc) or "trie"
+# (token trie over the text, same token boundaries, no Doc construction)
+SKILL_ENGINE = _env_str("SKILL_ENGINE", "spacy")
+# Skill taxonomy (categories, canonical skills, aliases); reload with POST /admin/skills/reload
+SKILLS_TAXONOMY_PATH = _env_str("SKILLS_TAXONOMY_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills.json"))
+
+# --- Bulk parsing (/parse-resume/batch, /parse-resume-file/batch) ---
+PARSE_BATCH_MAX_ITEMS = _env_int("PARSE_BATCH_MAX_ITEMS", 50)
+# Documents per nlp.pipe() call; each call runs as one parse-pool task
+NLP_BATCH_SIZE = _env_int("NLP_BATCH_SIZE", 16)
+# nlp.pipe() processes per task. The parse pool already spreads batches over
+# PARSE_WORKERS, so raise this only with PARSE_EXECUTOR=thread.
+NLP_N_PROCESS = _env_int("NLP_N_PROCESS", 1)
+
+# --- Streaming batch responses (?stream=true) ---
+# The batch endpoints answer with NDJSON, one line per item as soon as it is done.
+# At most STREAM_MAX_IN_FLIGHT documents per request are read, downloaded or
+# parsed at once; jobs are scored STREAM_SCORE_GROUP_SIZE per encode, with at
+# most ENCODE_WORKERS groups at once.
+STREAM_MAX_IN_FLIGHT = _env_int("STREAM_MAX_IN_FLIGHT", 8)
+STREAM_SCORE_GROUP_SIZE = _env_int("STREAM_SCORE_GROUP_SIZE", 16)
+
+# --- Load shedding ---
+# Uploaded file size, and the whole multipart body of the /batch upload endpoint;
+# larger uploads get 413 while they stream in
+UPLOAD_MAX_BYTES = _env_int("UPLOAD_MAX_BYTES", 10 * 1024 * 1024)
+UPLOAD_MAX_REQUEST_BYTES = _env_int("UPLOAD_MAX_REQUEST_BYTES", 50 * 1024 * 1024)
+# Wall-clock seconds the API waits for one parse-pool task (extraction + spaCy)
+# once it has a worker, before answering 504 (0 = no limit)
+PARSE_TIMEOUT = _env_float("PARSE_TIMEOUT", 30.0)
+# Pool tasks wait for a free worker in a FIFO; new parse/scoring requests are
+# refused with 429 while ADMISSION_MAX_QUEUED tasks wait for that pool, and with
+# 503 while the oldest has waited over ADMISSION_MAX_QUEUE_SECONDS (0 = no limit)
+ADMISSION_MAX_QUEUED = _env_int("ADMISSION_MAX_QUEUED", 64)
+ADMISSION_MAX_QUEUE_SECONDS = _env_float("ADMISSION_MAX_QUEUE_SECONDS", 10.0)
+
+# --- Request profiling ---
+# Off by default; when off, no profiling code runs. When on, parse requests
+# (/parse-resume*) sent with "X-Profile: 1", plus a PROFILING_SAMPLE_RATE share
+# of the rest, run their parse-pool tasks under cProfile. Each request's stats
+# are written as one pstats file (<time>-<request id>.prof) to PROFILING_DIR,
+# which keeps only the newest PROFILING_MAX_DUMPS.
+PROFILING_ENABLED = _env_bool("PROFILING_ENABLED", False)
+PROFILING_HEADER = _env_str("PROFILING_HEADER", "X-Profile")
+PROFILING_SAMPLE_RATE = _env_float("PROFILING_SAMPLE_RATE", 0.0)
+PROFILING_DIR = _env_str("PROFILING_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "profiles"))
+PROFILING_MAX_DUMPS = _env_int("PROFILING_MAX_DUMPS", 50)
+
+# --- Parse jobs (/jobs) ---
+# Jobs processed concurrently (parsing itself still runs in the parse pool),
+# jobs allowed to wait before submissions get 429, and per-job limits
+PARSE_JOB_WORKERS = _env_int("PARSE_JOB_WORKERS", 4)
+PARSE_JOB_QUEUE_SIZE = _env_int("PARSE_JOB_QUEUE_SIZE", 100)
+PARSE_JOB_TIMEOUT = _env_float("PARSE_JOB_TIMEOUT", 60.0)
+# Seconds a finished job's result stays available to GET /jobs/{id}
+PARSE_JOB_RESULT_TTL = _env_float("PARSE_JOB_RESULT_TTL", 600.0)
+
+# --- Parse result cache ---
+# SQLite file of parse results keyed by document hash + parser/taxonomy version
+# (empty disables it); least recently used results are evicted past the size limit
+PARSE_CACHE_PATH = _env_str("PARSE_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "parse-cache.sqlite3"))
+PARSE_CACHE_MAX_BYTES = _env_int("PARSE_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+
+# --- Embeddings ---
+EMBEDDING_MODEL_NAME = _env_str("EMBEDDING_MODEL_NAME", "all-MiniLM-L6-v2")
+# "torch": sentence-transformers on PyTorch; "onnx": the same model exported to
+# ONNX once (into ONNX_MODEL_DIR) and run with ONNX Runtime
+EMBEDDING_BACKEND = _env_str("EMBEDDING_BACKEND", "torch")
+ONNX_MODEL_DIR = _env_str("ONNX_MODEL_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "onnx"))
+# Run the dynamically int8-quantized export (smaller and faster on CPU)
+ONNX_QUANTIZE = _env_bool("ONNX_QUANTIZE", True)
+# ONNX Runtime threads within one operator / across independent operators (0 = ORT default).
+# Each of the ENCODE_WORKERS threads runs its own inference, so keep their product near the core count.
+ONNX_INTRA_OP_THREADS = _env_int("ONNX_INTRA_OP_THREADS", 0)
+ONNX_INTER_OP_THREADS = _env_int("ONNX_INTER_OP_THREADS", 0)
+
+# LRU cache of normalized embeddings; whichever bound is hit first evicts
+EMBEDDING_CACHE_MAX_ENTRIES = _env_int("EMBEDDING_CACHE_MAX_ENTRIES", 20000)
+EMBEDDING_CACHE_MAX_BYTES = _env_int("EMBEDDING_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+
+# --- Chunked embeddings ---
+# Texts longer than EMBEDDING_CHUNK_WORDS words are embedded as overlapping windows
+# (cached per window) pooled into one vector, instead of being truncated by the
+# model; 0 embeds whole texts. Keep windows under the model's max sequence length
+# (256 word pieces for all-MiniLM-L6-v2, roughly 150-190 words).
+EMBEDDING_CHUNK_WORDS = _env_int("EMBEDDING_CHUNK_WORDS", 0)
+EMBEDDING_CHUNK_OVERLAP = _env_int("EMBEDDING_CHUNK_OVERLAP", 16)
+# "mean" or "max" over the window vectors
+EMBEDDING_CHUNK_POOLING = _env_str("EMBEDDING_CHUNK_POOLING", "mean")
+
+# --- Batch scoring (/semantic-score/batch) ---
+# Most jobs scored against one resume per request (larger requests get 422)
+SEMANTIC_BATCH_MAX_JOBS = _env_int("SEMANTIC_BATCH_MAX_JOBS", 500)
+
+# --- Micro-batching (/semantic-score) ---
+# Concurrent requests are encoded together: a batch runs once ENCODE_BATCH_MAX_ITEMS
+# texts wait or ENCODE_BATCH_MAX_WAIT_MS after the first one arrived, with at most
+# ENCODE_WORKERS batches at a time. ENCODE_BATCH_MAX_ITEMS <= 1 encodes each request alone.
+ENCODE_BATCH_MAX_ITEMS = _env_int("ENCODE_BATCH_MAX_ITEMS", 64)
+ENCODE_BATCH_MAX_WAIT_MS = _env_float("ENCODE_BATCH_MAX_WAIT_MS", 5.0)
+
+# --- Job recommendations ---
+# Directory holding the memory-mapped job-embedding matrix (shared by all workers)
+JOB_STORE_DIR = _env_str("JOB_STORE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "job-embeddings"))
+RECOMMEND_MAX_K = _env_int("RECOMMEND_MAX_K", 100)
+
+# Approximate (IVF) search kicks in once the store holds ANN_MIN_JOBS jobs
+ANN_ENABLED = _env_bool("ANN_ENABLED", True)
+ANN_MIN_JOBS = _env_int("ANN_MIN_JOBS", 20000)
+ANN_NLIST = _env_int("ANN_NLIST", 0)  # 0 = about 4 * sqrt(number of jobs)
+ANN_NPROBE = _env_int("ANN_NPROBE", 16)
+
+# --- Admin endpoints ---
+# Required in the X-Admin-Token header of /admin/* requests; empty disables them
+ADMIN_TOKEN = _env_str("ADMIN_TOKEN", "")
@@ -0,0 +1,104 @@
+"""
+Skill taxonomy: canonical skills grouped by category, with aliases
+(e.g. "k8s" -> "kubernetes"), loaded from a JSON data file.
+
+Data file format (skills.json):
+    {"categories": {"Databases": ["mongodb", {"skill": "postgresql", "aliases": ["postgres"]}]}}
+
+A taxonomy is compiled once per spaCy pipeline into a PhraseMatcher with one
+match id per canonical skill, so mapping a match back to its skill is a dict
+lookup and per-request cost does not grow with the size of the taxonomy.
+"""
+import hashlib
+import json
+from typing import Dict, List
+
+
+class SkillTaxonomyError(ValueError):
+    """The taxonomy file is missing or malformed."""
+
+
+class SkillTaxonomy:
+    """Canonical skills, their categories and aliases, plus a content version."""
+
+    def __init__(self, categories: Dict[str, List[str]], aliases: Dict[str, List[str]], version: str):
+        self.categories = categories
+        self.aliases = aliases
+        self.version = version
+        self.skills = [skill for skills in categories.values() for skill in skills]
+        self.category_of = {skill: category for category, skills in categories.items() for skill in skills}
+
+    @classmethod
+    def load(cls, path: str) -> "SkillTaxonomy":
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+            data = json.loads(raw)
+        except (OSError, ValueError) as e:
+            raise SkillTaxonomyError(f"Cannot read skill taxonomy {path}: {e}") from e
+
+        if not isinstance(data, dict) or not isinstance(data.get("categories"), dict):
+            raise SkillTaxonomyError(f"{path}: expected an object with a 'categories' mapping")
+
+        categories: Dict[str, List[str]] = {}
+        aliases: Dict[str, List[str]] = {}
+        owner: Dict[str, str] = {}
+        for category, entries in data["categories"].items():
+            if not isinstance(entries, list):
+                raise SkillTaxonomyError(f"{path}: '{category}' must be a list of skills")
+            categories[category] = []
+            for entry in entries:
+                if isinstance(entry, str):
+                    skill, skill_aliases = entry, []
+                elif isinstance(entry, dict) and isinstance(entry.get("skill"), str):
+                    skill, skill_aliases = entry["skill"], entry.get("aliases", [])
+                    if not isinstance(skill_aliases, list) or not all(isinstance(a, str) for a in skill_aliases):
+                        raise SkillTaxonomyError(f"{path}: aliases of '{skill}' must be a list of strings")
+                else:
+                    raise SkillTaxonomyError(f"{path}: invalid entry in '{category}': {entry!r}")
+
+                skill = skill.strip().lower()
+                skill_aliases = [alias.strip().lower() for alias in skill_aliases]
+                for term in [skill] + skill_aliases:
+                    if owner.get(term, skill) != skill:
+                        raise SkillTaxonomyError(f"{path}: '{term}' is listed for both '{owner[term]}' and '{skill}'")
+                    owner[term] = skill
+
+                if skill not in aliases:
+                    categories[category].append(skill)
+                    aliases[skill] = []
+                aliases[skill].extend(a for a in skill_aliases if a not in aliases[skill])
+
+        version = hashlib.sha256(raw).hexdigest()[:12]
+        return cls(categories, aliases, version)
+
+    def compile(self, nlp) -> "CompiledSkillMatcher":
+        return CompiledSkillMatcher(self, nlp)
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "skills": len(self.skills),
+            "aliases": sum(len(a) for a in self.aliases.values()),
+            "categories": len(self.categories),
+        }
+
+
+class CompiledSkillMatcher:
+    """PhraseMatcher over every skill and alias, keyed by canonical skill."""
+
+    def __init__(self, taxonomy: SkillTaxonomy, nlp):
+        from spacy.matcher import PhraseMatcher
+
+        self.taxonomy = taxonomy
+        self.matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+        self._canonical: Dict[int, str] = {}
+
+        for skill in taxonomy.skills:
+            terms = [skill] + taxonomy.aliases[skill]
+            self.matcher.add(skill, list(nlp.tokenizer.pipe(terms)))
+            self._canonical[nlp.vocab.strings[skill]] = skill
+
+    def __call__(self, doc) -> List[str]:
+        """Sorted canonical skills mentioned in doc."""
+        return sorted({self._canonical[match_id] for match_id, _, _ in self.matcher(doc)})
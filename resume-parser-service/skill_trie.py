@@ -0,0 +1,297 @@
+"""
+Doc-free skill matching: a token trie over the skill taxonomy, matched against
+text split with the same boundaries as spaCy's tokenizer.
+
+PhraseMatcher only matches whole tokens, so "c++" must be a token of its own
+while "c#" is two ("c", "#"), "ci/cd" three, and "r" must not match inside
+"r&d" or the abbreviation "r.". To reproduce those boundaries exactly,
+TokenizerRules ports spaCy's tokenizer algorithm (whitespace chunks, special
+cases, prefix/suffix/infix rules, token/URL matches) to plain Python, driven by
+the rule regexes and special cases copied from a spaCy tokenizer at compile
+time. Nothing on the matching path builds a Doc, and each distinct chunk is
+tokenized once and then served from a cache.
+"""
+import re
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+# Chunks are runs of non-whitespace. A single " " after a chunk is only its
+# trailing space; any other whitespace run becomes a token of its own in spaCy.
+_WHITESPACE_SPLIT = re.compile(r"(\s+)").split
+
+# spaCy attribute id of a special-case token's text
+_ORTH = 65
+
+_CHUNK_CACHE_MAX_ENTRIES = 100000
+
+
+class TokenizerRules:
+    """spaCy tokenizer boundaries in plain Python, for one set of rules."""
+
+    def __init__(
+        self,
+        prefix_search=None,
+        suffix_search=None,
+        infix_finditer=None,
+        token_match=None,
+        url_match=None,
+        special_cases: Optional[Dict[str, List[str]]] = None,
+        faster_heuristics: bool = True,
+    ):
+        self.prefix_search = prefix_search
+        self.suffix_search = suffix_search
+        self.infix_finditer = infix_finditer
+        self.token_match = token_match
+        self.url_match = url_match
+        # Whitespace rules (" ", "\n", ...) never apply to a chunk
+        self.special_cases = {
+            string: list(tokens)
+            for string, tokens in (special_cases or {}).items()
+            if not any(ch.isspace() for ch in string)
+        }
+
+        # spaCy re-merges affix-split tokens that spell a special case (e.g.
+        # emoticons, "a.m."); these are the token sequences it looks for
+        self._special_patterns: Dict[Tuple[str, ...], str] = {}
+        for string in self.special_cases:
+            if not faster_heuristics or self._find_prefix(string) or self._find_suffix(string) or self._find_infix(string):
+                self._special_patterns[tuple(self._tokenize_chunk(string, with_special_cases=False))] = string
+        # First token -> (pattern, special case) pairs
+        self._special_index: Dict[str, List[Tuple[Tuple[str, ...], str]]] = {}
+        for pattern, string in self._special_patterns.items():
+            if pattern:
+                self._special_index.setdefault(pattern[0], []).append((pattern, string))
+
+        self._cache: Dict[str, Tuple[str, ...]] = {}
+
+    @classmethod
+    def from_spacy(cls, tokenizer) -> "TokenizerRules":
+        """Copy the rules of a spaCy Tokenizer (e.g. nlp.tokenizer)."""
+        special_cases = {
+            string: [spec.get(_ORTH, spec.get("ORTH")) for spec in specs]
+            for string, specs in tokenizer.rules.items()
+        }
+        return cls(
+            prefix_search=tokenizer.prefix_search,
+            suffix_search=tokenizer.suffix_search,
+            infix_finditer=tokenizer.infix_finditer,
+            token_match=tokenizer.token_match,
+            url_match=tokenizer.url_match,
+            special_cases=special_cases,
+            faster_heuristics=tokenizer.faster_heuristics,
+        )
+
+    def tokenize(self, text: str) -> List[str]:
+        """
+        Token texts of text, as spaCy would split it (whitespace tokens included).
+        Callers match on lowercased text, so the texts double as LOWER values.
+        """
+        tokens: List[str] = []
+        # Index of the first token of every chunk; special cases never span chunks
+        chunk_starts: List[int] = []
+        get_cached = self._cache.get
+        pieces = _WHITESPACE_SPLIT(text)
+        pieces.append("")
+        for chunk, whitespace in zip(pieces[::2], pieces[1::2]):
+            if chunk:
+                chunk_tokens = get_cached(chunk)
+                if chunk_tokens is None:
+                    chunk_tokens = tuple(self._tokenize_chunk(chunk))
+                    if len(self._cache) < _CHUNK_CACHE_MAX_ENTRIES:
+                        self._cache[chunk] = chunk_tokens
+                chunk_starts.append(len(tokens))
+                tokens.extend(chunk_tokens)
+                # The first space after a chunk is that token's trailing whitespace
+                if whitespace == " " or not whitespace:
+                    continue
+                if whitespace[0] == " ":
+                    whitespace = whitespace[1:]
+            elif not whitespace:
+                continue
+            chunk_starts.append(len(tokens))
+            tokens.append(whitespace)
+
+        if not self._special_index.keys().isdisjoint(tokens):
+            tokens = self._merge_special_cases(tokens, chunk_starts)
+        return tokens
+
+    # --- port of spacy.tokenizer.Tokenizer (_split_affixes / _attach_tokens) ---
+
+    def _find_prefix(self, string: str) -> int:
+        match = self.prefix_search(string) if self.prefix_search else None
+        return match.end() - match.start() if match is not None else 0
+
+    def _find_suffix(self, string: str) -> int:
+        match = self.suffix_search(string) if self.suffix_search else None
+        return match.end() - match.start() if match is not None else 0
+
+    def _find_infix(self, string: str) -> list:
+        return list(self.infix_finditer(string)) if self.infix_finditer else []
+
+    def _matches_token(self, string: str) -> bool:
+        return bool(
+            (self.token_match and self.token_match(string))
+            or (self.url_match and self.url_match(string))
+        )
+
+    def _tokenize_chunk(self, chunk: str, with_special_cases: bool = True) -> List[str]:
+        specials = self.special_cases if with_special_cases else {}
+        if chunk in specials:
+            return list(specials[chunk])
+
+        prefixes: List[str] = []
+        suffixes: List[str] = []
+        string = chunk
+        last_size = 0
+        while string and len(string) != last_size:
+            if self.token_match and self.token_match(string):
+                break
+            if string in specials:
+                break
+            last_size = len(string)
+            pre_len = self._find_prefix(string)
+            if pre_len:
+                prefix = string[:pre_len]
+                minus_pre = string[pre_len:]
+                if minus_pre and minus_pre in specials:
+                    string = minus_pre
+                    prefixes.append(prefix)
+                    break
+            suf_len = self._find_suffix(string[pre_len:])
+            if suf_len:
+                suffix = string[-suf_len:]
+                minus_suf = string[:-suf_len]
+                if minus_suf and minus_suf in specials:
+                    string = minus_suf
+                    suffixes.append(suffix)
+                    break
+            if pre_len and suf_len and (pre_len + suf_len) <= len(string):
+                string = string[pre_len:-suf_len]
+                prefixes.append(prefix)
+                suffixes.append(suffix)
+            elif pre_len:
+                string = minus_pre
+                prefixes.append(prefix)
+            elif suf_len:
+                string = minus_suf
+                suffixes.append(suffix)
+
+        tokens = prefixes
+        if string:
+            if string in specials:
+                tokens.extend(specials[string])
+            elif self._matches_token(string):
+                tokens.append(string)
+            else:
+                tokens.extend(self._split_infixes(string))
+        tokens.extend(reversed(suffixes))
+        return tokens
+
+    def _split_infixes(self, string: str) -> List[str]:
+        matches = self._find_infix(string)
+        if not matches:
+            return [string]
+        tokens = []
+        start = 0
+        for match in matches:
+            infix_start, infix_end = match.start(), match.end()
+            if infix_start == 0:
+                continue
+            if infix_start != start:
+                tokens.append(string[start:infix_start])
+            if infix_start != infix_end:
+                tokens.append(string[infix_start:infix_end])
+            start = infix_end
+        if string[start:]:
+            tokens.append(string[start:])
+        return tokens
+
+    def _merge_special_cases(self, tokens: List[str], chunk_starts: List[int]) -> List[str]:
+        """
+        spaCy's special-case matcher: find token runs spelling a special case,
+        keep the longest (then leftmost) of overlapping runs and retokenize the
+        kept runs that lie within one chunk.
+        """
+        spans = []
+        special_index = self._special_index
+        for start, token in enumerate(tokens):
+            candidates = special_index.get(token)
+            if candidates is None:
+                continue
+            for pattern, string in candidates:
+                end = start + len(pattern)
+                if end <= len(tokens) and tuple(tokens[start:end]) == pattern:
+                    spans.append((start, end, string))
+        if not spans:
+            return tokens
+        spans.sort(key=lambda span: (span[0] - span[1], span[0]))
+
+        # Same filter as spaCy: skip a span whose first or last token is taken.
+        # Runs across a space still take part in the filter but are not replaced.
+        seen = set()
+        kept = {}
+        for start, end, string in spans:
+            if start not in seen and end - 1 not in seen and _same_chunk(chunk_starts, start, end):
+                kept[start] = (end, string)
+            seen.update(range(start, end))
+
+        merged = []
+        i = 0
+        while i < len(tokens):
+            if i in kept:
+                end, string = kept[i]
+                merged.extend(self.special_cases[string])
+                i = end
+            else:
+                merged.append(tokens[i])
+                i += 1
+        return merged
+
+
+def _same_chunk(chunk_starts: List[int], start: int, end: int) -> bool:
+    """Whether tokens [start, end) come from one whitespace-delimited chunk."""
+    return bisect_right(chunk_starts, start) == bisect_right(chunk_starts, end - 1)
+
+
+class TokenTrieSkillMatcher:
+    """Matches canonical skills (and their aliases) in lowercased text without spaCy Docs."""
+
+    def __init__(self, taxonomy, rules: TokenizerRules):
+        self.taxonomy = taxonomy
+        self.rules = rules
+        # token -> [canonical skills whose term ends here, child tokens]
+        self._trie: Dict[str, list] = {}
+
+        for skill in taxonomy.skills:
+            for term in [skill] + taxonomy.aliases[skill]:
+                tokens = rules.tokenize(term)
+                if tokens:
+                    self._insert(tokens, skill)
+
+    def __call__(self, lower_text: str) -> List[str]:
+        """Sorted canonical skills mentioned in lower_text."""
+        tokens = self.rules.tokenize(lower_text)
+        trie = self._trie
+        count = len(tokens)
+        found = set()
+        for start in range(count):
+            node = trie.get(tokens[start])
+            pos = start + 1
+            while node is not None:
+                skills, children = node
+                found.update(skills)
+                if not children or pos >= count:
+                    break
+                node = children.get(tokens[pos])
+                pos += 1
+        return sorted(found)
+
+    def _insert(self, tokens: List[str], skill: str) -> None:
+        level = self._trie
+        for i, token in enumerate(tokens):
+            node = level.get(token)
+            if node is None:
+                node = level[token] = [(), {}]
+            if i == len(tokens) - 1 and skill not in node[0]:
+                node[0] += (skill,)
+            level = node[1]
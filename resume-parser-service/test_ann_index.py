@@ -0,0 +1,103 @@
+"""
+Tests for the IVF job index and when /recommend uses it instead of exact search.
+Run with: python -m pytest test_ann_index.py
+"""
+import numpy as np
+import pytest
+
+import main
+import settings
+from ann_index import IVFIndex, recall_report
+from job_store import JobEmbeddingStore
+
+DIM = 16
+
+
+def _unit_rows(count: int, seed: int) -> np.ndarray:
+    vectors = np.random.default_rng(seed).standard_normal((count, DIM)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobEmbeddingStore(str(tmp_path), dim=DIM, model_name="test-model")
+    store.upsert([f"job-{i}" for i in range(300)], _unit_rows(300, seed=1))
+    return store
+
+
+def test_probing_every_list_matches_exact_search(store):
+    index = IVFIndex(store)
+    index.train(nlist=8, iterations=5)
+
+    assert sum(index.list_sizes()) == 300
+    for query in _unit_rows(5, seed=2):
+        approx, exact = index.search(query, k=10, nprobe=8), store.search(query, k=10)
+        assert [job_id for job_id, _ in approx] == [job_id for job_id, _ in exact]
+        assert [score for _, score in approx] == pytest.approx([score for _, score in exact], abs=1e-5)
+
+    report = recall_report(index, _unit_rows(20, seed=3), k=10, nprobes=[1, 8])
+    assert [row["nprobe"] for row in report["results"]] == [1, 8]
+    assert report["results"][1]["recallAtK"] == 1.0
+    assert 0 < report["results"][0]["recallAtK"] <= 1.0
+    assert (report["jobs"], report["nlist"]) == (300, 8)
+
+
+def test_add_remove_and_sync_with_another_process(store, monkeypatch):
+    index = IVFIndex(store)
+    index.train(nlist=4, iterations=5)
+    new = _unit_rows(1, seed=4)
+
+    # The index's own writes do not make the next sync() rescan the store
+    with monkeypatch.context() as patch:
+        patch.setattr(store, "ids", lambda: pytest.fail("sync() rescanned the store"))
+        store.upsert(["new"], new)
+        index.add(["new"], new)
+        assert index.search(new[0], k=1, nprobe=1)[0][0] == "new"
+
+        store.delete(["new"])
+        index.remove(["new"])
+        index.sync()
+    assert sum(index.list_sizes()) == 300
+
+    # Writes through another handle (as from a sibling worker) are picked up by sync()
+    other = JobEmbeddingStore(store.directory, dim=DIM, model_name="test-model")
+    other.upsert(["remote"], new)
+    other.delete(["job-0"])
+    index.sync()
+    assert sum(index.list_sizes()) == 300
+    assert index.search(new[0], k=1, nprobe=4)[0][0] == "remote"
+
+    # A rebuild elsewhere replaces the centroids; a fresh index loads them
+    IVFIndex(other).train(nlist=6, iterations=5)
+    index.sync()
+    assert index.nlist == 6
+    reloaded = IVFIndex(store)
+    assert reloaded.load() and reloaded.nlist == 6
+
+
+def test_search_stays_exact_below_ann_min_jobs_even_when_trained(store, monkeypatch):
+    monkeypatch.setattr(main, "_ann_index", None)
+    monkeypatch.setattr(settings, "ANN_ENABLED", True)
+    IVFIndex(store).train(nlist=4, iterations=5)
+
+    monkeypatch.setattr(settings, "ANN_MIN_JOBS", 1000)
+    assert main._get_ann_index(store) is None
+
+    monkeypatch.setattr(settings, "ANN_MIN_JOBS", 300)
+    index = main._get_ann_index(store)
+    assert index is not None and index.nlist == 4
+
+    monkeypatch.setattr(settings, "ANN_ENABLED", False)
+    assert main._get_ann_index(store) is None
+
+
+def test_index_is_trained_on_first_use_once_the_store_is_large_enough(store, monkeypatch):
+    monkeypatch.setattr(main, "_ann_index", None)
+    monkeypatch.setattr(settings, "ANN_ENABLED", True)
+    monkeypatch.setattr(settings, "ANN_MIN_JOBS", 300)
+    monkeypatch.setattr(settings, "ANN_NLIST", 5)
+
+    index = main._get_ann_index(store)
+
+    assert index.nlist == 5
+    assert sum(index.list_sizes()) == 300
@@ -0,0 +1,80 @@
+"""
+Tests for bulk parsing (resume_parsing.parse_texts): batched results match
+single-document parsing, and a failing document does not fail the batch.
+Run with: python -m pytest test_batch_parsing.py
+"""
+import asyncio
+import json
+import os
+
+import pytest
+import spacy
+
+import main
+import metrics
+import resume_parsing
+import settings
+
+_GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "testdata", "golden_resume_fields.json")
+
+with open(_GOLDEN_PATH, encoding="utf-8") as f:
+    _RESUME_TEXTS = [case["text"] for case in json.load(f)["cases"]]
+
+
+@pytest.fixture
+def use_engine(monkeypatch):
+    def use(engine):
+        nlp = spacy.blank("en")
+        monkeypatch.setattr(settings, "SKILL_ENGINE", engine)
+        monkeypatch.setattr(settings, "NLP_BATCH_SIZE", 8)
+        monkeypatch.setattr(resume_parsing, "nlp", nlp)
+        monkeypatch.setattr(resume_parsing, "_skill_matcher", None)
+        monkeypatch.setattr(resume_parsing, "_tokenizer_rules", None)
+        return nlp
+
+    return use
+
+
+@pytest.mark.parametrize("engine", ["spacy", "trie"])
+def test_batch_matches_single_parses(use_engine, engine):
+    use_engine(engine)
+    expected = [resume_parsing._parse_resume_text(text) for text in _RESUME_TEXTS]
+    assert resume_parsing.parse_texts(_RESUME_TEXTS) == [(result, None) for result in expected]
+
+
+def test_failed_document_does_not_fail_batch(use_engine):
+    nlp = use_engine("spacy")
+    nlp.max_length = 2000
+    texts = ["Python developer", "python " * 1000, "Docker and kubernetes"]
+
+    results = resume_parsing.parse_texts(texts)
+
+    assert [result["skills"] for result, _ in (results[0], results[2])] == [["python"], ["docker", "kubernetes"]]
+    assert results[1][0] is None
+    assert "E088" in str(results[1][1])
+
+
+def test_batch_reports_a_failed_document_like_a_single_parse(use_engine, monkeypatch):
+    nlp = use_engine("spacy")
+    nlp.max_length = 2000
+    monkeypatch.setattr(settings, "PARSE_EXECUTOR", "thread")
+    monkeypatch.setattr(main, "_parse_executor", None)
+    monkeypatch.setattr(main, "parse_cache", None)
+    # The documents are their text; only the NLP stage is exercised
+    monkeypatch.setattr(resume_parsing, "extract_document_text", lambda content: content.decode())
+    too_long = "python " * 1000
+
+    with pytest.raises(ValueError) as single:
+        resume_parsing._parse_resume_text(too_long)
+    errors_before = metrics.ERRORS.value(type="ValueError")
+    expected = main._describe_parse_error(single.value)
+
+    try:
+        response = asyncio.run(main._parse_batch(["ok.pdf", "long.pdf"], [b"Python developer", too_long.encode()]))
+    finally:
+        main._shutdown_executors()
+
+    assert (response.parsed, response.failed) == (1, 1)
+    failed = response.results[1]
+    assert (failed.status, failed.error) == expected
+    assert metrics.ERRORS.value(type="ValueError") == errors_before + 2
@@ -0,0 +1,111 @@
+"""
+Tests for the async resume downloader against a local stand-in HTTP server.
+Run with: python -m pytest test_downloader.py
+"""
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from downloader import DownloadError, DownloadTooLarge, ResumeDownloader
+
+SAMPLE_PDF = b"%PDF-1.4\n1 0 obj\n<< /Type /Catalog >>\nendobj\ntrailer\n<< /Root 1 0 R >>\n%%EOF\n"
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Serves sample resumes plus a few failure modes, counting requests per path."""
+
+    hits = {}
+
+    def do_GET(self):
+        hits = _StandInHandler.hits
+        hits[self.path] = hits.get(self.path, 0) + 1
+
+        if self.path == "/resume.pdf":
+            self._send(200, SAMPLE_PDF, "application/pdf")
+        elif self.path == "/big.pdf":
+            self._send(200, SAMPLE_PDF * 1000, "application/pdf")
+        elif self.path == "/big-chunked.pdf":
+            # No Content-Length: the limit must be enforced while streaming
+            self.send_response(200)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            try:
+                for _ in range(1000):
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(SAMPLE_PDF), SAMPLE_PDF))
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # the client aborted once the limit was hit
+        elif self.path == "/flaky.pdf" and hits[self.path] == 1:
+            self._send(503, b"busy", "text/plain")
+        elif self.path == "/flaky.pdf":
+            self._send(200, SAMPLE_PDF, "application/pdf")
+        else:
+            self._send(404, b"not found", "text/plain")
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def _fetch(url, max_bytes=64 * 1024):
+    async def run():
+        downloader = ResumeDownloader(
+            max_bytes=max_bytes,
+            connect_timeout=2,
+            read_timeout=5,
+            max_connections=4,
+            retries=2,
+            retry_backoff=0.01,
+        )
+        try:
+            return await downloader.fetch(url)
+        finally:
+            await downloader.aclose()
+
+    return asyncio.run(run())
+
+
+def test_downloads_sample_pdf(server_url):
+    body, content_type = _fetch(f"{server_url}/resume.pdf")
+    assert body == SAMPLE_PDF
+    assert content_type == "application/pdf"
+
+
+def test_rejects_declared_oversized_file(server_url):
+    with pytest.raises(DownloadTooLarge):
+        _fetch(f"{server_url}/big.pdf", max_bytes=1024)
+
+
+def test_aborts_streamed_oversized_file(server_url):
+    with pytest.raises(DownloadTooLarge):
+        _fetch(f"{server_url}/big-chunked.pdf", max_bytes=1024)
+
+
+def test_retries_transient_errors(server_url):
+    body, _ = _fetch(f"{server_url}/flaky.pdf")
+    assert body == SAMPLE_PDF
+    assert _StandInHandler.hits["/flaky.pdf"] == 2
+
+
+def test_does_not_retry_client_errors(server_url):
+    with pytest.raises(DownloadError):
+        _fetch(f"{server_url}/missing.pdf")
+    assert _StandInHandler.hits["/missing.pdf"] == 1
@@ -0,0 +1,82 @@
+"""
+Tests for the in-process embedding LRU cache.
+Run with: python -m pytest test_embedding_cache.py
+"""
+import numpy as np
+import pytest
+
+from embedding_cache import EmbeddingCache
+
+
+def _vector(value: float, dim: int = 4) -> np.ndarray:
+    return np.full(dim, value, dtype=np.float32)  # 4 bytes per dimension
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = EmbeddingCache(max_entries=2, max_bytes=1 << 20)
+    cache.put("a", _vector(1))
+    cache.put("b", _vector(2))
+    cache.get("a")  # "b" is now the oldest
+    cache.put("c", _vector(3))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_total_vector_bytes_stay_within_max_bytes():
+    cache = EmbeddingCache(max_entries=100, max_bytes=40)
+    for key in "abc":
+        cache.put(key, _vector(1))  # 16 bytes each
+    assert (cache.stats()["entries"], cache.stats()["bytes"]) == (2, 32)
+    assert cache.get("a") is None
+
+    # Replacing an entry counts only its new size
+    cache.put("c", _vector(1, dim=2))
+    assert cache.stats()["bytes"] == 24
+
+    # A vector larger than the whole budget is not cached and evicts nothing
+    cache.put("huge", _vector(1, dim=11))
+    assert cache.get("huge") is None
+    assert cache.stats()["entries"] == 2
+
+
+def test_hit_and_miss_counters_and_clear():
+    cache = EmbeddingCache(max_entries=10, max_bytes=1 << 20)
+    cache.put("a", _vector(1))
+
+    cache.get("a")
+    cache.get("a")
+    cache.get("missing")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (2, 1, pytest.approx(0.6667))
+
+    cache.clear()
+    assert (cache.stats()["entries"], cache.stats()["bytes"]) == (0, 0)
+    assert cache.get("a") is None
+
+
+def test_cached_vectors_are_read_only_copies():
+    cache = EmbeddingCache(max_entries=10, max_bytes=1 << 20)
+    vector = _vector(1)
+    cache.put("a", vector)
+    vector[0] = 9
+
+    cached = cache.get("a")
+    assert cached[0] == 1
+    with pytest.raises(ValueError):
+        cached[0] = 2
+
+
+def test_zero_max_entries_disables_the_cache():
+    cache = EmbeddingCache(max_entries=0, max_bytes=1 << 20)
+    cache.put("a", _vector(1))
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_key_depends_on_model_and_text():
+    key = EmbeddingCache.make_key("model-a", "Python developer")
+    assert key == EmbeddingCache.make_key("model-a", "Python developer")
+    assert key != EmbeddingCache.make_key("model-b", "Python developer")
+    assert key != EmbeddingCache.make_key("model-a", "Python  developer")
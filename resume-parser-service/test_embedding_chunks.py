@@ -0,0 +1,54 @@
+"""
+Tests for chunked embeddings of long texts.
+Run with: python -m pytest test_embedding_chunks.py
+"""
+import random
+
+import numpy as np
+
+from embedding_chunks import chunk_text, pool_chunked, pool_embeddings
+
+_WORDS = (
+    "python java react docker kubernetes aws sql senior backend engineer built services apis "
+    "team led migrated designed platform data pipelines latency reduced customers"
+).split()
+
+
+def _text(words: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(_WORDS) + str(rng.randrange(50)) for _ in range(words))
+
+
+def test_short_texts_are_one_window_and_long_texts_overlap():
+    assert chunk_text("Senior Python engineer", max_words=8, overlap_words=2) == ["Senior Python engineer"]
+
+    words = _text(1000).split()
+    chunks = chunk_text(" ".join(words), max_words=64, overlap_words=8)
+
+    assert all(len(chunk.split()) <= 64 for chunk in chunks)
+    # Each window starts with the last 8 words of the previous one, and together they cover the text
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert chunk.split()[:8] == previous.split()[-8:]
+    assert [w for chunk in chunks[:1] + [" ".join(c.split()[8:]) for c in chunks[1:]] for w in chunk.split()] == words
+
+
+def test_an_edit_changes_only_the_windows_around_it():
+    words = _text(2000, seed=1).split()
+    edited = words[:1000] + ["kubernetes", "operator", "author"] + words[1000:]
+
+    before = chunk_text(" ".join(words), max_words=64, overlap_words=8)
+    after = chunk_text(" ".join(edited), max_words=64, overlap_words=8)
+
+    assert len(before) > 30
+    assert len(set(after) - set(before)) <= 3
+
+
+def test_pooling_returns_one_normalized_row_per_text():
+    vectors = np.array([[1, 0, 0], [0, 1, 0], [0.6, 0.8, 0], [0, 0, 1]], dtype=np.float32)
+
+    pooled = pool_chunked(vectors, [1, 2, 1], "mean")
+
+    assert pooled.shape == (3, 3)
+    np.testing.assert_allclose(np.linalg.norm(pooled, axis=1), 1.0, rtol=1e-6)
+    np.testing.assert_array_equal(pooled[0], vectors[0])
+    np.testing.assert_allclose(pool_embeddings(vectors[1:3], "max"), np.array([0.6, 1, 0]) / np.hypot(0.6, 1), rtol=1e-6)
@@ -0,0 +1,82 @@
+"""
+Tests for micro-batching of concurrent encode requests.
+Run with: python -m pytest test_encode_batcher.py
+"""
+import asyncio
+
+import numpy as np
+
+from encode_batcher import EncodeBatcher
+
+
+class _FakeModel:
+    """Encodes each text as [len(text)] and records the batches it was given."""
+
+    def __init__(self, delay: float = 0.0, error: Exception = None):
+        self.batches = []
+        self.delay = delay
+        self.error = error
+
+    async def __call__(self, texts):
+        self.batches.append(list(texts))
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return np.array([[len(text)] for text in texts], dtype=np.float32)
+
+
+def test_concurrent_requests_share_one_batch_and_get_their_own_rows():
+    async def run():
+        model = _FakeModel()
+        batcher = EncodeBatcher(model, max_items=64, max_wait=0.05, max_concurrent=1)
+        requests = [["a" * i, "b" * (i + 10)] for i in range(10)]
+        results = await asyncio.gather(*(batcher.encode(texts) for texts in requests))
+        return model, results
+
+    model, results = asyncio.run(run())
+
+    assert len(model.batches) == 1 and len(model.batches[0]) == 20
+    for i, rows in enumerate(results):
+        assert rows[:, 0].tolist() == [i, i + 10]
+
+
+def test_batches_are_capped_and_grow_while_the_model_is_busy():
+    async def run():
+        model = _FakeModel(delay=0.05)
+        batcher = EncodeBatcher(model, max_items=4, max_wait=0.0, max_concurrent=1)
+        first = asyncio.ensure_future(batcher.encode(["x"]))
+        await asyncio.sleep(0.01)  # the first request is encoding alone
+        rest = [batcher.encode(["y", "z"]) for _ in range(3)]
+        await asyncio.gather(first, *rest)
+        return model, batcher
+
+    model, batcher = asyncio.run(run())
+
+    assert [len(batch) for batch in model.batches] == [1, 4, 2]
+    assert batcher.stats()["batches"] == 3 and batcher.stats()["pending"] == 0
+
+
+def test_encode_error_fails_every_request_in_the_batch():
+    async def run():
+        batcher = EncodeBatcher(_FakeModel(error=RuntimeError("model failed")), max_items=8, max_wait=0.01, max_concurrent=2)
+        return await asyncio.gather(batcher.encode(["a"]), batcher.encode(["b"]), return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_batches_in_flight_are_referenced_until_they_finish():
+    async def run():
+        batcher = EncodeBatcher(_FakeModel(delay=0.05), max_items=1, max_wait=0.0, max_concurrent=2)
+        requests = [asyncio.ensure_future(batcher.encode([text])) for text in ("a", "bb")]
+        await asyncio.sleep(0.01)
+        in_flight = len(batcher._tasks)
+        results = await asyncio.gather(*requests)
+        await asyncio.sleep(0)
+        return in_flight, len(batcher._tasks), results
+
+    in_flight, left, results = asyncio.run(run())
+
+    assert (in_flight, left) == (2, 0)
+    assert [rows[:, 0].tolist() for rows in results] == [[1], [2]]
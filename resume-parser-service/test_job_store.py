@@ -0,0 +1,109 @@
+"""
+Tests for the memory-mapped job-embedding store.
+Run with: python -m pytest test_job_store.py
+"""
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from job_store import JobEmbeddingStore, fcntl, top_k_indices
+
+DIM = 8
+MODEL = "test-model"
+
+
+def _unit(seed: int) -> np.ndarray:
+    vector = np.random.default_rng(seed).standard_normal(DIM).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def _store(directory) -> JobEmbeddingStore:
+    return JobEmbeddingStore(str(directory), dim=DIM, model_name=MODEL)
+
+
+def _upsert_from_another_process(directory: str):
+    _store(directory).upsert(["remote"], _unit(99)[None, :])
+
+
+def _delete_from_another_process(directory: str):
+    _store(directory).delete(["a"])
+
+
+def test_upsert_overwrites_existing_ids_in_place(tmp_path):
+    store = _store(tmp_path)
+    store.upsert(["a", "b"], np.stack([_unit(1), _unit(2)]))
+    store.upsert(["b", "c"], np.stack([_unit(3), _unit(4)]))
+
+    assert store.ids() == ["a", "b", "c"]
+    ids, vectors = store.vectors_for(["c", "missing", "b"])
+    assert ids == ["c", "b"]
+    np.testing.assert_allclose(vectors, np.stack([_unit(4), _unit(3)]))
+    with pytest.raises(ValueError):
+        store.upsert(["d"], np.zeros((1, DIM + 1)))
+
+
+def test_delete_moves_the_last_row_into_the_hole(tmp_path):
+    store = _store(tmp_path)
+    store.upsert(["a", "b", "c", "d"], np.stack([_unit(i) for i in range(4)]))
+
+    assert store.delete(["b", "missing"]) == 1
+
+    assert store.ids() == ["a", "d", "c"]
+    np.testing.assert_allclose(store.vectors(), np.stack([_unit(0), _unit(3), _unit(2)]))
+    assert store.search(_unit(3), k=1) == [("d", pytest.approx(1.0))]
+
+
+def test_grows_past_initial_capacity_and_reopens_after_restart(tmp_path):
+    ids = [f"job-{i}" for i in range(1500)]
+    vectors = np.stack([_unit(i) for i in range(len(ids))])
+    _store(tmp_path).upsert(ids, vectors)
+
+    reopened = _store(tmp_path)
+
+    assert len(reopened) == 1500
+    np.testing.assert_allclose(reopened.vectors(), vectors)
+    assert reopened.search(vectors[1234], k=3)[0][0] == "job-1234"
+    with pytest.raises(ValueError):
+        JobEmbeddingStore(str(tmp_path), dim=DIM, model_name="other-model")
+
+
+def test_sees_writes_from_another_process(tmp_path):
+    store = _store(tmp_path)
+    store.upsert(["local"], _unit(1)[None, :])
+    version = store.version
+
+    process = multiprocessing.get_context("spawn").Process(target=_upsert_from_another_process, args=(str(tmp_path),))
+    process.start()
+    process.join(timeout=60)
+
+    assert process.exitcode == 0
+    assert store.version != version
+    assert store.ids() == ["local", "remote"]
+    assert store.search(_unit(99), k=1)[0][0] == "remote"
+
+
+@pytest.mark.skipif(fcntl is None, reason="needs flock")
+def test_writers_in_other_processes_wait_for_readers(tmp_path):
+    store = _store(tmp_path)
+    store.upsert(["a", "b", "c"], np.stack([_unit(1), _unit(2), _unit(3)]))
+    process = multiprocessing.get_context("spawn").Process(target=_delete_from_another_process, args=(str(tmp_path),))
+
+    with store.reading():
+        process.start()
+        process.join(timeout=5)
+        # The delete would move "c" into row 0; it waits until the read is over
+        assert process.is_alive()
+        assert store.ids() == ["a", "b", "c"]
+        np.testing.assert_allclose(store.vectors()[0], _unit(1))
+
+    process.join(timeout=60)
+    assert process.exitcode == 0
+    assert store.ids() == ["c", "b"]
+    np.testing.assert_allclose(store.vectors()[0], _unit(3))
+
+
+def test_top_k_indices_are_best_first():
+    scores = np.array([0.1, 0.9, 0.5, 0.9, -1.0])
+    assert top_k_indices(scores, 3).tolist() == [1, 3, 2]
+    assert top_k_indices(scores, 10).tolist() == [1, 3, 2, 0, 4]
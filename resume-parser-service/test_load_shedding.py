@@ -0,0 +1,122 @@
+"""
+Tests for admission control, upload limits and the DOCX expansion budget.
+Run with: python -m pytest test_load_shedding.py
+"""
+import asyncio
+import io
+import zipfile
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+import main
+import settings
+from load_shedding import AdmissionMiddleware, Overloaded, UploadLimitMiddleware, WorkGate
+
+
+def test_gate_runs_tasks_in_order_and_refuses_work_past_its_limits():
+    async def run():
+        gate = WorkGate("parse", slots=1, max_queued=2, max_queue_seconds=0.05)
+        order = []
+
+        async def task(name):
+            async with gate.slot():
+                order.append(name)
+                await asyncio.sleep(0.1)
+
+        tasks = [asyncio.ensure_future(task(i)) for i in range(3)]
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded) as full:
+            gate.check()
+        await asyncio.sleep(0.15)  # the first task is done, the third has waited 0.15 s
+        with pytest.raises(Overloaded) as late:
+            gate.check()
+        await asyncio.gather(*tasks)
+        gate.check()
+        return order, full.value, late.value, gate.stats()
+
+    order, full, late, stats = asyncio.run(run())
+
+    assert order == [0, 1, 2]
+    assert (full.status, late.status) == (429, 503)
+    assert late.retry_after >= 1
+    assert stats == {"running": 0, "queued": 0, "oldest_wait": 0.0}
+
+
+def test_cancelled_waiter_gives_up_its_place():
+    async def run():
+        gate = WorkGate("encode", slots=1)
+        async with gate.slot():
+            waiter = asyncio.ensure_future(gate.slot().__aenter__())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.sleep(0)
+            assert gate.queued == 0
+        return gate.running
+
+    assert asyncio.run(run()) == 0
+
+
+def _app(gate: WorkGate):
+    async def upload(request):
+        form = await request.form()
+        return PlainTextResponse(str(len(await form["file"].read())))
+
+    app = Starlette(routes=[Route("/parse-resume-file", upload, methods=["POST"])])
+    app = UploadLimitMiddleware(app, max_bytes=lambda path: 1000, allowance=500)
+    return AdmissionMiddleware(app, routes=[("/parse-resume", gate)])
+
+
+def test_uploads_over_the_limit_and_requests_to_an_overloaded_pool_are_refused():
+    async def run():
+        gate = WorkGate("parse", slots=1, max_queued=1)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=_app(gate)), base_url="http://test") as client:
+            small = await client.post("/parse-resume-file", files={"file": ("a.pdf", b"x" * 100)})
+            framed = await client.post("/parse-resume-file", files={"file": ("a.pdf", b"x" * 1000)})
+            large = await client.post("/parse-resume-file", files={"file": ("a.pdf", b"x" * 5000)})
+            async with gate.slot():
+                waiter = asyncio.ensure_future(gate.slot().__aenter__())
+                await asyncio.sleep(0)
+                busy = await client.post("/parse-resume-file", files={"file": ("a.pdf", b"x")})
+                waiter.cancel()
+        return small, framed, large, busy
+
+    small, framed, large, busy = asyncio.run(run())
+
+    assert (small.status_code, small.text) == (200, "100")
+    assert (framed.status_code, framed.text) == (200, "1000")
+    assert large.status_code == 413
+    assert large.json()["detail"] == "Upload exceeds the 1000 byte limit"
+    assert busy.status_code == 429 and busy.headers["Retry-After"] == "1"
+
+
+def test_docx_that_expands_past_the_budget_is_413(client, monkeypatch):
+    monkeypatch.setattr(settings, "DOCX_MAX_UNCOMPRESSED_BYTES", 1024 * 1024)
+    monkeypatch.setattr(settings, "PARSE_EXECUTOR", "thread")
+    monkeypatch.setattr(main, "parse_cache", None)
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr("word/document.xml", b" " * (2 * 1024 * 1024))
+
+    main._shutdown_executors()
+    try:
+        response = client("/parse-resume-file", files={"file": ("bomb.docx", archive.getvalue())})
+    finally:
+        main._shutdown_executors()
+
+    assert response.status_code == 413
+    assert "expands to" in response.json()["detail"]
+
+
+def test_upload_over_the_file_limit_is_413_on_every_upload_endpoint(client, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_MAX_BYTES", 1000)
+
+    # Within the multipart allowance, so the endpoints themselves refuse it
+    files = {"file": ("a.pdf", b"x" * 1200)}
+    for path in ("/parse-resume-file", "/jobs/parse-resume-file"):
+        response = client(path, files=files)
+        assert response.status_code == 413
+        assert "1000 bytes" in response.json()["detail"]
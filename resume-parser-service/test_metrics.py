@@ -0,0 +1,45 @@
+"""
+Tests for the Prometheus metrics registry.
+Run with: python -m pytest test_metrics.py
+"""
+from metrics import Registry
+
+
+def test_renders_prometheus_text_format():
+    registry = Registry()
+    errors = registry.counter("test_errors_total", "Errors by type", ["type"])
+    latency = registry.histogram("test_stage_seconds", "Stage latency", ["stage"], buckets=(0.1, 1.0))
+    errors.inc(type='Bad "quoted"\nvalue')
+    latency.observe(0.05, stage="spacy")
+    latency.observe(0.5, stage="spacy")
+    latency.observe(5, stage="spacy")
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE test_errors_total counter" in lines
+    assert 'test_errors_total{type="Bad \\"quoted\\"\\nvalue"} 1' in lines
+    assert 'test_stage_seconds_bucket{stage="spacy",le="0.1"} 1' in lines
+    assert 'test_stage_seconds_bucket{stage="spacy",le="1"} 2' in lines
+    assert 'test_stage_seconds_bucket{stage="spacy",le="+Inf"} 3' in lines
+    assert 'test_stage_seconds_sum{stage="spacy"} 5.55' in lines
+    assert 'test_stage_seconds_count{stage="spacy"} 3' in lines
+
+
+def test_drained_worker_metrics_merge_into_another_registry():
+    worker, api = Registry(), Registry()
+    for registry in (worker, api):
+        registry.counter("test_pages_total", "Pages")
+        registry.histogram("test_stage_seconds", "Stage latency", ["stage"])
+        registry.gauge("test_in_flight", "In flight")
+    worker._metrics["test_pages_total"].inc(3)
+    worker._metrics["test_stage_seconds"].observe(0.2, stage="extract_text")
+    worker._metrics["test_in_flight"].inc()
+    api._metrics["test_pages_total"].inc(1)
+
+    api.merge(worker.drain())
+    api.merge(worker.drain())  # drained values are not shipped twice
+
+    assert api._metrics["test_pages_total"].value() == 4
+    assert api._metrics["test_stage_seconds"].count(stage="extract_text") == 1
+    assert api._metrics["test_in_flight"].value() == 0
+    assert worker._metrics["test_in_flight"].value() == 1
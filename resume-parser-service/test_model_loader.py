@@ -0,0 +1,48 @@
+"""
+Tests for background/on-demand model loading.
+Run with: python -m pytest test_model_loader.py
+"""
+import threading
+import time
+
+from model_loader import ModelLoader
+
+
+def test_concurrent_callers_share_one_background_load():
+    loads = []
+    warmed = []
+
+    def load():
+        loads.append(1)
+        time.sleep(0.1)
+        return "model"
+
+    loader = ModelLoader("test", load, warmed.append)
+    loader.start()
+    assert loader.state == "loading"
+
+    results = []
+    callers = [threading.Thread(target=lambda: results.append(loader.get())) for _ in range(4)]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join()
+
+    assert results == ["model"] * 4
+    assert loads == [1]
+    assert warmed == ["model"]
+    assert loader.ready
+    assert loader.status()["loadSeconds"] >= 0.1
+
+
+def test_failed_load_or_warmup_is_reported_and_not_retried():
+    def warmup(model):
+        raise RuntimeError("warmup inference failed")
+
+    loader = ModelLoader("test", lambda: "model", warmup)
+
+    assert loader.get() is None
+    assert loader.get() is None
+    assert loader.status()["state"] == "failed"
+    assert loader.status()["error"] == "warmup inference failed"
+    assert ModelLoader("test", lambda: None).get() is None
@@ -0,0 +1,79 @@
+"""
+Parity tests for the ONNX Runtime embedding backend against sentence-transformers on PyTorch.
+Run with: python -m pytest test_onnx_encoder.py
+"""
+import numpy as np
+import pytest
+
+pytest.importorskip("onnxruntime", reason="install requirements-onnx.txt")
+
+import torch
+from sentence_transformers import SentenceTransformer
+from tokenizers import Tokenizer, models, normalizers, pre_tokenizers, processors
+from transformers import BertConfig, BertModel, PreTrainedTokenizerFast
+
+from onnx_encoder import load_onnx_encoder
+
+_WORDS = (
+    "python java javascript react node docker kubernetes aws sql postgresql developer engineer senior "
+    "backend frontend experience years team built services api apis with and the in of for"
+).split()
+
+RESUMES = [
+    "Senior backend engineer with 6 years of Python, PostgreSQL and AWS experience",
+    "Frontend developer: React, JavaScript, Node",
+    "Built APIs and services with Docker and Kubernetes for the team " * 12,  # truncated at max_seq_length
+]
+JOBS = ["Python backend engineer", "React developer", "Kubernetes and Docker experience", "Java"]
+
+
+@pytest.fixture(scope="module")
+def model_dir(tmp_path_factory):
+    """A small randomly initialised BERT sentence-transformer, built offline."""
+    directory = str(tmp_path_factory.mktemp("model"))
+    vocab = {token: i for i, token in enumerate(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", ",", ":", "."] + _WORDS)}
+    tokenizer = Tokenizer(models.WordPiece(vocab, unk_token="[UNK]"))
+    tokenizer.normalizer = normalizers.BertNormalizer(lowercase=True)
+    tokenizer.pre_tokenizer = pre_tokenizers.BertPreTokenizer()
+    tokenizer.post_processor = processors.TemplateProcessing(
+        single="[CLS] $A [SEP]", special_tokens=[("[CLS]", vocab["[CLS]"]), ("[SEP]", vocab["[SEP]"])]
+    )
+    PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer, unk_token="[UNK]", pad_token="[PAD]", cls_token="[CLS]",
+        sep_token="[SEP]", mask_token="[MASK]", model_max_length=64,
+    ).save_pretrained(directory)
+
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=len(vocab), hidden_size=64, num_hidden_layers=2, num_attention_heads=4,
+        intermediate_size=128, max_position_embeddings=64,
+    )
+    BertModel(config).save_pretrained(directory)
+    # Mean pooling over the BERT token embeddings, as all-MiniLM-L6-v2 uses
+    SentenceTransformer(directory, device="cpu").save(directory)
+    return directory
+
+
+def _cosines(encoder) -> np.ndarray:
+    resumes = np.asarray(encoder.encode(RESUMES, normalize_embeddings=True))
+    jobs = np.asarray(encoder.encode(JOBS, normalize_embeddings=True))
+    return resumes @ jobs.T
+
+
+@pytest.mark.parametrize("quantize, tolerance", [(False, 1e-5), (True, 0.02)])
+def test_cosine_scores_match_pytorch(model_dir, tmp_path, quantize, tolerance):
+    reference = _cosines(SentenceTransformer(model_dir, device="cpu", local_files_only=True))
+    encoder = load_onnx_encoder(model_dir, str(tmp_path), quantize=quantize, intra_op_threads=1)
+
+    assert encoder.get_sentence_embedding_dimension() == 64
+    assert np.max(np.abs(_cosines(encoder) - reference)) < tolerance
+
+
+def test_export_is_reused(model_dir, tmp_path):
+    first = load_onnx_encoder(model_dir, str(tmp_path))
+    second = load_onnx_encoder(model_dir, str(tmp_path))
+
+    assert second.model_path == first.model_path
+    assert second.model_path.endswith("model_qint8.onnx")
+    np.testing.assert_array_equal(first.encode(JOBS), second.encode(JOBS))
+    assert first.encode([]).shape == (0, 64)
@@ -0,0 +1,74 @@
+"""
+Tests for the SQLite parse-result cache.
+Run with: python -m pytest test_parse_cache.py
+"""
+import pytest
+
+from parse_cache import ParseResultCache
+
+RESULT = {"title": "Data Scientist", "skills": ["python", "sql"], "experienceYears": 4}
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "cache" / "parse-cache.sqlite3")
+
+
+def test_hit_after_put_and_across_reopen(cache_path):
+    cache = ParseResultCache(cache_path, max_bytes=1024 * 1024)
+    key = ParseResultCache.make_key(b"%PDF-1.4 resume")
+    assert cache.get(key, "v1") is None
+
+    cache.put(key, "v1", RESULT)
+    assert cache.get(key, "v1") == RESULT
+    cache.close()
+
+    reopened = ParseResultCache(cache_path, max_bytes=1024 * 1024)
+    assert reopened.get(key, "v1") == RESULT
+    assert reopened.stats()["entries"] == 1
+
+
+def test_other_version_is_a_miss_and_gets_replaced(cache_path):
+    cache = ParseResultCache(cache_path, max_bytes=1024 * 1024)
+    key = ParseResultCache.make_key(b"%PDF-1.4 resume")
+    cache.put(key, "parser1-taxonomy1", RESULT)
+
+    assert cache.get(key, "parser1-taxonomy2") is None
+
+    updated = dict(RESULT, skills=["python", "sql", "dbt"])
+    cache.put(key, "parser1-taxonomy2", updated)
+    assert cache.get(key, "parser1-taxonomy2") == updated
+    assert cache.get(key, "parser1-taxonomy1") is None
+    assert cache.stats()["entries"] == 1
+
+
+def test_evicts_least_recently_used_past_max_bytes(cache_path):
+    cache = ParseResultCache(cache_path, max_bytes=400)
+    keys = [ParseResultCache.make_key(bytes([i])) for i in range(8)]
+    for key in keys:
+        cache.put(key, "v1", RESULT)
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 400
+    assert stats["evictions"] > 0
+    assert cache.get(keys[-1], "v1") == RESULT
+    assert cache.get(keys[0], "v1") is None
+
+
+
+def test_size_limit_holds_with_replacements_and_another_writer(cache_path):
+    cache = ParseResultCache(cache_path, max_bytes=400)
+    other = ParseResultCache(cache_path, max_bytes=400)
+    key = ParseResultCache.make_key(b"same document")
+    for _ in range(10):
+        cache.put(key, "v1", RESULT)
+    assert cache.stats()["evictions"] == 0
+
+    # Entries another process wrote are counted once this one's total crosses the limit
+    for i in range(3):
+        other.put(ParseResultCache.make_key(bytes([i])), "v1", RESULT)
+    for i in range(5):
+        cache.put(ParseResultCache.make_key(bytes([100 + i])), "v1", RESULT)
+
+    assert cache.stats()["bytes"] <= 400
+    assert cache.stats()["evictions"] > 0
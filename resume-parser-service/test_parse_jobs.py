@@ -0,0 +1,115 @@
+"""
+Tests for the asynchronous parse job queue.
+Run with: python -m pytest test_parse_jobs.py
+"""
+import asyncio
+
+import pytest
+
+from parse_jobs import ParseJobQueue, QueueFull
+
+
+def _describe(error):
+    if isinstance(error, asyncio.TimeoutError):
+        return 504, str(error)
+    return 500, str(error)
+
+
+def _queue(**overrides):
+    options = dict(workers=1, max_queued=2, timeout=1.0, result_ttl=60.0, describe_error=_describe)
+    options.update(overrides)
+    return ParseJobQueue(**options)
+
+
+async def _wait_finished(queue, job_id):
+    for _ in range(200):
+        job = queue.get(job_id)
+        if job is None or job.status in ("done", "failed"):
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def test_job_runs_and_reports_result():
+    async def run():
+        queue = _queue()
+        queue.start()
+
+        async def work():
+            return {"skills": ["python"]}
+
+        job = queue.submit("resume.pdf", work)
+        assert job.status == "queued"
+        finished = await _wait_finished(queue, job.id)
+        await queue.stop()
+        return finished
+
+    job = asyncio.run(run())
+    assert job.status == "done"
+    assert job.result == {"skills": ["python"]}
+    assert job.started_at is not None and job.finished_at >= job.started_at
+
+
+def test_failures_and_timeouts_are_reported_per_job():
+    async def run():
+        queue = _queue(timeout=0.05)
+        queue.start()
+
+        async def broken():
+            raise ValueError("not a resume")
+
+        async def slow():
+            await asyncio.sleep(5)
+
+        failed = queue.submit("a.pdf", broken)
+        timed_out = queue.submit("b.pdf", slow)
+        results = [await _wait_finished(queue, job.id) for job in (failed, timed_out)]
+        await queue.stop()
+        return results
+
+    failed, timed_out = asyncio.run(run())
+    assert (failed.status, failed.error_status, failed.error) == ("failed", 500, "not a resume")
+    assert (timed_out.status, timed_out.error_status) == ("failed", 504)
+
+
+def test_full_queue_rejects_with_retry_after():
+    async def run():
+        queue = _queue(max_queued=1)
+        queue.start()
+        release = asyncio.Event()
+
+        async def blocked():
+            await release.wait()
+            return {}
+
+        queue.submit("running.pdf", blocked)
+        await asyncio.sleep(0.01)  # the worker takes the first job
+        queue.submit("waiting.pdf", blocked)
+        with pytest.raises(QueueFull) as excinfo:
+            queue.submit("rejected.pdf", blocked)
+        release.set()
+        await queue.stop()
+        return queue, excinfo.value
+
+    queue, error = asyncio.run(run())
+    assert error.retry_after >= 1
+    assert queue.stats()["rejected"] == 1
+
+
+def test_finished_jobs_expire_after_ttl():
+    async def run():
+        queue = _queue(result_ttl=0.05)
+        queue.start()
+
+        async def work():
+            return {}
+
+        job = queue.submit("resume.pdf", work)
+        await _wait_finished(queue, job.id)
+        assert queue.get(job.id) is not None
+        await asyncio.sleep(0.1)
+        expired = queue.get(job.id)
+        await queue.stop()
+        return expired
+
+    assert asyncio.run(run()) is None
@@ -0,0 +1,69 @@
+"""
+Tests for opt-in per-request profiling.
+Run with: python -m pytest test_request_profiling.py
+"""
+import asyncio
+import os
+import pstats
+
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+import request_profiling
+from request_profiling import ProfilingMiddleware, RequestProfile
+
+
+def _parse_stage(n):
+    return sum(i * i for i in range(n))
+
+
+def test_stats_of_all_tasks_are_merged_into_one_capped_dump(tmp_path):
+    directory = str(tmp_path)
+    for age, request_id in enumerate(("old-1", "old-2")):
+        profile = RequestProfile(request_id)
+        profile.add(request_profiling.run_profiled(_parse_stage, 10)[1])
+        profile.save(directory, max_dumps=2)
+        os.utime(os.path.join(directory, profile.file_name), (age, age))
+
+    profile = RequestProfile("slow-resume")
+    for n in (1000, 2000):
+        result, stats = request_profiling.run_profiled(_parse_stage, n)
+        profile.add(stats)
+    path = profile.save(directory, max_dumps=2)
+
+    assert result == _parse_stage(2000)
+    calls = {func[2]: stat[1] for func, stat in pstats.Stats(path).stats.items()}
+    assert calls["_parse_stage"] == 2
+    # The oldest dump was deleted
+    assert sorted(name.split("-", 1)[1] for name in os.listdir(directory)) == ["old-2.prof", "slow-resume.prof"]
+
+
+def test_only_requests_that_ask_for_it_are_profiled(tmp_path):
+    async def parse(request):
+        profile = request_profiling.current()
+        if profile is not None:
+            result, stats = request_profiling.run_profiled(_parse_stage, 100)
+            profile.add(stats)
+        return PlainTextResponse("profiled" if profile else "plain")
+
+    app = Starlette(routes=[Route("/parse-resume", parse, methods=["POST"])])
+    app = ProfilingMiddleware(
+        app, prefixes=["/parse-resume"], header="X-Profile", sample_rate=0.0, directory=str(tmp_path), max_dumps=5
+    )
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            plain = await client.post("/parse-resume")
+            profiled = await client.post("/parse-resume", headers={"X-Profile": "1", "X-Request-ID": "req-42"})
+            unsafe_id = await client.post("/parse-resume", headers={"X-Profile": "1", "X-Request-ID": "../../etc"})
+        return plain, profiled, unsafe_id
+
+    plain, profiled, unsafe_id = asyncio.run(run())
+
+    assert plain.text == "plain" and "X-Profile" not in plain.headers
+    assert profiled.text == "profiled" and profiled.headers["X-Request-ID"] == "req-42"
+    assert profiled.headers["X-Profile"].endswith("-req-42.prof")
+    assert unsafe_id.headers["X-Request-ID"] != "../../etc"
+    assert sorted(os.listdir(tmp_path)) == sorted([profiled.headers["X-Profile"], unsafe_id.headers["X-Profile"]])
@@ -0,0 +1,28 @@
+"""
+Golden-corpus tests for the single-pass section/title/summary scanner.
+testdata/golden_resume_fields.json holds resume texts (edge cases, the
+benchmark corpus and randomly assembled header/date lines) with the fields
+produced by the original per-field extractors.
+Run with: python -m pytest test_resume_sections.py
+"""
+import json
+import os
+
+import pytest
+
+from resume_sections import scan_resume
+
+_GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "testdata", "golden_resume_fields.json")
+
+with open(_GOLDEN_PATH, encoding="utf-8") as f:
+    _CASES = json.load(f)["cases"]
+
+
+@pytest.mark.parametrize("case", _CASES, ids=[f"case{i}" for i in range(len(_CASES))])
+def test_matches_golden_output(case):
+    assert scan_resume(case["text"]) == case["expected"]
+
+
+def test_accepts_precomputed_lowercase():
+    text = _CASES[2]["text"]
+    assert scan_resume(text, text.lower()) == scan_resume(text)
@@ -0,0 +1,58 @@
+"""
+Tests for /semantic-score and /semantic-score/batch scoring (with a fake encoder).
+Run with: python -m pytest test_semantic_score.py
+"""
+import numpy as np
+import pytest
+
+import main
+import settings
+
+_E1, _E2 = np.eye(4, dtype=np.float32)[:2]
+_VECTORS = {
+    "python developer": _E1,
+    "python developer role": _E1,
+    "backend engineer": (_E1 + _E2) / np.sqrt(2),
+    "gardener": _E2,
+    "opposite": -_E1,
+}
+
+
+def _fake_encode(texts):
+    return np.stack([_VECTORS[text.lower()] for text in texts])
+
+
+@pytest.fixture(autouse=True)
+def fake_encoder(monkeypatch):
+    monkeypatch.setattr(main, "_encode_texts", _fake_encode)
+    # Encode each request on its own, through the patched _encode_texts
+    monkeypatch.setattr(settings, "ENCODE_BATCH_MAX_ITEMS", 1)
+
+
+def test_batch_scores_and_clamping_match_single_requests(client):
+    job_texts = ["Python developer role", "Backend   engineer", "Gardener", "Opposite", "   "]
+    batch = client("/semantic-score/batch", json={
+        "resumeText": "Python developer",
+        "jobs": [{"id": str(i), "jobText": text} for i, text in enumerate(job_texts)],
+    })
+    singles = [
+        client("/semantic-score", json={"resumeText": "Python developer", "jobText": text}).json() for text in job_texts
+    ]
+
+    assert batch.status_code == 200
+    results = batch.json()["results"]
+    assert [item["id"] for item in results] == ["0", "1", "2", "3", "4"]
+    assert [{k: v for k, v in item.items() if k != "id"} for item in results] == singles
+    assert singles == [
+        {"semanticScore": 1.0, "semanticPercent": 100},
+        {"semanticScore": 0.7071, "semanticPercent": 71},
+        {"semanticScore": 0.0, "semanticPercent": 0},
+        {"semanticScore": 0.0, "semanticPercent": 0},  # negative cosine clamps to 0
+        {"semanticScore": 0.0, "semanticPercent": 0},  # empty job text
+    ]
+
+
+def test_batch_refuses_more_than_semantic_batch_max_jobs(client):
+    jobs = [{"id": str(i), "jobText": "Gardener"} for i in range(settings.SEMANTIC_BATCH_MAX_JOBS + 1)]
+    response = client("/semantic-score/batch", json={"resumeText": "Python developer", "jobs": jobs})
+    assert response.status_code == 422
@@ -0,0 +1,55 @@
+"""
+Tests for loading and compiling the skill taxonomy data file.
+Run with: python -m pytest test_skill_taxonomy.py
+"""
+import json
+
+import pytest
+import spacy
+
+import settings
+from skill_taxonomy import SkillTaxonomy, SkillTaxonomyError
+
+
+def _write(tmp_path, data):
+    path = tmp_path / "skills.json"
+    path.write_text(data if isinstance(data, str) else json.dumps(data), encoding="utf-8")
+    return str(path)
+
+
+def test_bundled_taxonomy_loads():
+    taxonomy = SkillTaxonomy.load(settings.SKILLS_TAXONOMY_PATH)
+    assert "kubernetes" in taxonomy.skills
+    assert "k8s" in taxonomy.aliases["kubernetes"]
+    assert taxonomy.category_of["postgresql"] == "Databases"
+
+
+def test_aliases_resolve_to_canonical_skill(tmp_path):
+    path = _write(tmp_path, {"categories": {
+        "Cloud": [{"skill": "kubernetes", "aliases": ["k8s"]}, "docker"],
+        "Languages": [{"skill": "javascript", "aliases": ["js", "ecmascript"]}],
+    }})
+    nlp = spacy.blank("en")
+    matcher = SkillTaxonomy.load(path).compile(nlp)
+    doc = nlp("shipped k8s operators in js and ecmascript, deployed with docker")
+    assert matcher(doc) == ["docker", "javascript", "kubernetes"]
+
+
+def test_version_follows_file_content(tmp_path):
+    first = SkillTaxonomy.load(_write(tmp_path, {"categories": {"A": ["python"]}})).version
+    second = SkillTaxonomy.load(_write(tmp_path, {"categories": {"A": ["python", "rust"]}})).version
+    assert first != second
+
+
+@pytest.mark.parametrize("data", [
+    "{not json",
+    {"skills": ["python"]},
+    {"categories": {"A": [42]}},
+    {"categories": {"A": "python"}},
+    {"categories": {"A": [{"skill": "go", "aliases": "golang"}]}},
+    {"categories": {"A": [{"skill": "go", "aliases": ["golang", 7]}]}},
+    {"categories": {"A": [{"skill": "go", "aliases": ["golang"]}], "B": [{"skill": "golang"}]}},
+])
+def test_rejects_invalid_files(tmp_path, data):
+    with pytest.raises(SkillTaxonomyError):
+        SkillTaxonomy.load(_write(tmp_path, data))
@@ -0,0 +1,60 @@
+"""
+Parity tests for the token-trie skill engine (SKILL_ENGINE=trie) against
+spaCy's tokenizer and the PhraseMatcher engine (SKILL_ENGINE=spacy).
+Uses spacy.blank("en"), whose tokenizer rules are the ones en_core_web_sm ships.
+Run with: python -m pytest test_skill_trie.py
+"""
+import json
+import os
+
+import pytest
+import spacy
+
+import resume_parsing
+import settings
+from skill_trie import TokenizerRules
+
+_GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "testdata", "golden_resume_fields.json")
+
+with open(_GOLDEN_PATH, encoding="utf-8") as f:
+    _RESUME_TEXTS = [case["text"] for case in json.load(f)["cases"]]
+
+# Skill boundaries that depend on spaCy's prefix/suffix/infix rules and special cases
+_TRICKY_TEXTS = [
+    "c++, c# and node.js; ci/cd pipelines with asp.net core",
+    "(c++) [c#] {node.js} \"ci/cd\" 'r'",
+    "c++/java c#/c++ c++/c# javascript/typescript sql/nosql ci/cd/devops",
+    "r&d, r. and (r), r's, r-based, r: stats",
+    "e.g.python, python.org, me@python.org, https://python.org/go",
+    "react-native, scikit-learn. power bi; k8s: golang... node js!",
+    "rest  api\nrest\tapi rest api",
+    "can't :) :-) ;) 10a.m. a.m. u.s. etc. (etc.) ...go... -go- go-to",
+]
+
+
+@pytest.fixture(scope="module")
+def nlp():
+    return spacy.blank("en")
+
+
+@pytest.mark.parametrize("text", _TRICKY_TEXTS + _RESUME_TEXTS[:20])
+def test_tokens_match_spacy(nlp, text):
+    rules = TokenizerRules.from_spacy(nlp.tokenizer)
+    for variant in (text, text.lower()):
+        assert rules.tokenize(variant) == [token.text for token in nlp.tokenizer(variant)]
+
+
+def _extract_all(monkeypatch, nlp, engine, texts):
+    monkeypatch.setattr(settings, "SKILL_ENGINE", engine)
+    monkeypatch.setattr(resume_parsing, "nlp", nlp)
+    monkeypatch.setattr(resume_parsing, "_skill_matcher", None)
+    monkeypatch.setattr(resume_parsing, "_tokenizer_rules", None)
+    return [resume_parsing._extract_skills(text.lower()) for text in texts]
+
+
+def test_trie_engine_matches_phrase_matcher(monkeypatch, nlp):
+    texts = _TRICKY_TEXTS + _RESUME_TEXTS
+    expected = _extract_all(monkeypatch, nlp, "spacy", texts)
+    assert _extract_all(monkeypatch, nlp, "trie", texts) == expected
+    assert expected[0] == ["asp.net", "c#", "c++", "ci/cd", "node.js"]
+    assert expected[3] == ["r"]
@@ -0,0 +1,122 @@
+"""
+Tests for the NDJSON streaming batch responses (?stream=true).
+Run with: python -m pytest test_streaming.py
+"""
+import asyncio
+import json
+import zlib
+
+import numpy as np
+import pytest
+
+import main
+import settings
+from resume_parsing import UnsupportedDocumentError
+
+
+def _fake_encode(texts):
+    """Deterministic unit vectors per text; texts containing "boom" fail to encode."""
+    if any("boom" in text for text in texts):
+        raise RuntimeError("encoder exploded")
+    vectors = np.stack([np.random.default_rng(zlib.crc32(text.encode())).standard_normal(8) for text in texts])
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+@pytest.fixture(autouse=True)
+def fake_encoder(monkeypatch):
+    monkeypatch.setattr(main, "_encode_texts", _fake_encode)
+
+
+def _lines(response) -> list:
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    # Every line, the last one included, ends with a newline
+    assert response.text == "" or response.text.endswith("\n")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_streamed_scores_match_the_buffered_response(client, monkeypatch):
+    monkeypatch.setattr(settings, "STREAM_SCORE_GROUP_SIZE", 2)
+    body = {
+        "resumeText": "Python backend engineer",
+        "jobs": [{"id": f"job-{i}", "jobText": f"Job number {i}"} for i in range(5)] + [{"id": "empty", "jobText": "  "}],
+    }
+
+    streamed = _lines(client("/semantic-score/batch", params={"stream": "true"}, json=body))
+    buffered = client("/semantic-score/batch", json=body).json()["results"]
+
+    # Jobs without text come first; the rest in completion order
+    assert streamed[0] == {"id": "empty", "semanticScore": 0.0, "semanticPercent": 0}
+    assert sorted(streamed, key=lambda item: item["id"]) == sorted(buffered, key=lambda item: item["id"])
+
+
+def test_failed_group_yields_error_lines_and_the_rest_still_stream(client, monkeypatch):
+    monkeypatch.setattr(settings, "STREAM_SCORE_GROUP_SIZE", 1)
+    body = {"resumeText": "Python", "jobs": [{"id": "ok", "jobText": "Go"}, {"id": "bad", "jobText": "boom"}]}
+
+    lines = {line["id"]: line for line in _lines(client("/semantic-score/batch", params={"stream": "true"}, json=body))}
+
+    assert set(lines["ok"]) == {"id", "semanticScore", "semanticPercent"}
+    assert lines["bad"] == {"id": "bad", "error": "Semantic scoring failed: encoder exploded"}
+
+
+def test_empty_resume_or_no_jobs_streams_without_encoding(client, monkeypatch):
+    def must_not_encode(texts):
+        raise AssertionError("encoded")
+
+    monkeypatch.setattr(main, "_encode_texts", must_not_encode)
+
+    assert _lines(client("/semantic-score/batch", params={"stream": "true"}, json={"resumeText": "Python", "jobs": []})) == []
+    lines = _lines(
+        client("/semantic-score/batch", params={"stream": "true"}, json={"resumeText": "", "jobs": [{"id": "a", "jobText": "Go"}]})
+    )
+    assert lines == [{"id": "a", "semanticScore": 0.0, "semanticPercent": 0}]
+
+
+def test_parse_batch_streams_one_line_per_document_with_its_own_status(client, monkeypatch):
+    async def parse_content(content):
+        if content.startswith(b"PK"):
+            raise UnsupportedDocumentError("Unrecognised file type")
+        return {"title": content.decode(), "skills": ["python"]}
+
+    monkeypatch.setattr(main, "_parse_content", parse_content)
+    files = [("files", ("a.pdf", b"First")), ("files", ("b.zip", b"PK\x03\x04")), ("files", ("c.pdf", b"Third"))]
+
+    lines = sorted(_lines(client("/parse-resume-file/batch", params={"stream": "true"}, files=files)), key=lambda line: line["index"])
+
+    assert [(line["source"], line["status"]) for line in lines] == [("a.pdf", 200), ("b.zip", 415), ("c.pdf", 200)]
+    assert lines[0]["result"]["title"] == "First"
+    assert lines[1]["error"] == "Unrecognised file type" and lines[1]["result"] is None
+
+
+def test_as_completed_bounded_limits_work_in_flight_and_cancels_on_close():
+    async def run():
+        running, peak, cancelled = 0, 0, []
+
+        async def work(i):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            try:
+                await asyncio.sleep(0.01 * (5 - i % 5))
+                return i
+            except asyncio.CancelledError:
+                cancelled.append(i)
+                raise
+            finally:
+                running -= 1
+
+        results = [i async for i in main._as_completed_bounded(10, work, max_in_flight=3)]
+
+        stream = main._as_completed_bounded(10, work, max_in_flight=3)
+        await stream.__anext__()
+        await stream.aclose()  # the client went away
+        await asyncio.sleep(0)
+        return results, peak, cancelled
+
+    results, peak, cancelled = asyncio.run(run())
+
+    assert sorted(results) == list(range(10))
+    assert results != list(range(10))  # completion order, not submission order
+    assert peak == 3
+    assert len(cancelled) == 2
@@ -0,0 +1,169 @@
+"""
+Tests for in-memory text extraction: format sniffing from magic bytes, the
+DOCX expansion check and the page/character/time budgets, on small documents
+generated here.
+Run with: python -m pytest test_text_extraction.py
+"""
+import io
+import multiprocessing
+import os
+import signal
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import resume_parsing
+import settings
+from resume_parsing import DocumentTooLargeError, UnsupportedDocumentError
+
+
+def _pdf(pages) -> bytes:
+    """An uncompressed PDF with one line of Helvetica text per page."""
+    objects = {1: b"<< /Type /Catalog /Pages 2 0 R >>", 3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    kids = []
+    for number, line in enumerate(pages):
+        page_id, content_id = 4 + 2 * number, 5 + 2 * number
+        kids.append(b"%d 0 R" % page_id)
+        stream = b"BT /F1 12 Tf 50 700 Td (%s) Tj ET" % line.encode("latin-1")
+        objects[content_id] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        objects[page_id] = (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+    objects[2] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = out.tell()
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (object_id, objects[object_id]))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for object_id in sorted(objects):
+        out.write(b"%010d 00000 n \n" % offsets[object_id])
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def _zip(entries: dict) -> bytes:
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
+    return out.getvalue()
+
+
+def _docx(text: str) -> bytes:
+    document = (
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:body></w:document>"
+    )
+    return _zip({"word/document.xml": document})
+
+
+def test_pdf_and_docx_are_recognised_by_content_not_name():
+    assert resume_parsing._extract_text(_pdf(["Python developer"])) == "Python developer"
+    # Junk before the header, as some generators write, is tolerated
+    assert resume_parsing._extract_text(b"\r\n\x00" + _pdf(["Go developer"])) == "Go developer"
+    assert resume_parsing._extract_text(_docx("Rust developer")) == "Rust developer"
+
+
+@pytest.mark.parametrize("content, message", [
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + b"\x00" * 512, "Legacy .doc"),
+    (_zip({"content.xml": "<office:document/>"}), "not a Word"),
+    (b"PK\x03\x04 truncated archive", "not a Word"),
+    (b"{\\rtf1 Plain rich text}", "Unrecognised file type"),
+    (b"", "Unrecognised file type"),
+], ids=["ole-doc", "other-zip", "broken-zip", "rtf", "empty"])
+def test_other_formats_are_unsupported(content, message):
+    with pytest.raises(UnsupportedDocumentError, match=message):
+        resume_parsing._extract_text(content)
+
+
+def test_docx_that_would_expand_past_the_limit_is_refused_before_decompressing(monkeypatch):
+    monkeypatch.setattr(settings, "DOCX_MAX_UNCOMPRESSED_BYTES", 64 * 1024)
+    bomb = _zip({"word/document.xml": "<w:document/>", "word/media/filler.bin": b"\0" * (1024 * 1024)})
+
+    assert len(bomb) < 8 * 1024
+    with pytest.raises(DocumentTooLargeError, match="expands to"):
+        resume_parsing._extract_text(bomb)
+
+
+@pytest.fixture
+def budgets(monkeypatch):
+    def set_budgets(pages=0, chars=0, seconds=0.0):
+        monkeypatch.setattr(settings, "PDF_MAX_PAGES", pages)
+        monkeypatch.setattr(settings, "EXTRACT_MAX_CHARS", chars)
+        monkeypatch.setattr(settings, "EXTRACT_TIMEOUT", seconds)
+        monkeypatch.setattr(settings, "PDF_PARALLEL_WORKERS", 0)
+
+    return set_budgets
+
+
+def test_pdf_extraction_stops_at_the_page_budget(budgets):
+    pdf = _pdf([f"Page {n}" for n in range(1, 6)])
+
+    budgets(pages=2)
+    assert resume_parsing._extract_text(pdf) == "Page 1\nPage 2"
+    budgets(pages=0)
+    assert resume_parsing._extract_text(pdf).splitlines()[-1] == "Page 5"
+
+
+def test_text_is_cut_at_the_character_budget(budgets):
+    budgets(chars=10)
+    assert resume_parsing._extract_text(_pdf(["Python developer", "Never read"])) == "Python dev"
+    assert resume_parsing._extract_text(_docx("Rust developer with Tokio")) == "Rust devel"
+
+
+def test_pdf_extraction_past_its_deadline_fails_between_pages(budgets):
+    budgets(seconds=1e-9)
+    with pytest.raises(TimeoutError, match="after 1 of 3 pages"):
+        resume_parsing._extract_text(_pdf(["One", "Two", "Three"]))
+
+    # A single-page document has nothing left to skip, so it completes
+    assert resume_parsing._extract_text(_pdf(["Only page"])) == "Only page"
+
+
+def _children(pid: int) -> list:
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/task"), reason="needs /proc to list child processes")
+def test_parallel_extraction_in_a_parse_worker_shuts_its_page_pool_down(monkeypatch):
+    # Spawned workers read their settings from the environment
+    for name, value in [("PDF_PARALLEL_WORKERS", "2"), ("PDF_PARALLEL_MIN_PAGES", "4"), ("PDF_PARALLEL_CHUNK_PAGES", "3"),
+                        ("PDF_MAX_PAGES", "0"), ("EXTRACT_TIMEOUT", "0")]:
+        monkeypatch.setenv(name, value)
+    pages = [f"Page {n}" for n in range(1, 11)]
+    parse_pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        text = parse_pool.submit(resume_parsing.extract_document_text, _pdf(pages)).result(timeout=60)
+        (worker,) = parse_pool._processes.values()
+        page_workers = _children(worker.pid)
+    finally:
+        parse_pool.shutdown(wait=False)
+
+    assert text.splitlines() == pages
+    assert len(page_workers) == 2
+
+    # The worker exits once its page pool has stopped, instead of waiting on it forever
+    worker.join(timeout=30)
+    try:
+        assert worker.exitcode == 0
+        assert not any(_alive(pid) for pid in page_workers)
+    finally:
+        if worker.is_alive():
+            worker.kill()
+            for pid in page_workers:
+                os.kill(pid, signal.SIGKILL)
@@ -0,0 +1,95 @@
+"""
+Tests for the parse and encode pools: dispatch to worker processes, replacing
+a broken process pool and PARSE_TIMEOUT, with a single-worker pool.
+Run with: python -m pytest test_worker_pools.py
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+import main
+import settings
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(settings, "PARSE_EXECUTOR", "process")
+    monkeypatch.setattr(settings, "PARSE_WORKERS", 1)
+    monkeypatch.setattr(settings, "PARSE_TIMEOUT", 0.0)
+    monkeypatch.setattr(main.parse_gate, "slots", 1)
+    main._shutdown_executors()
+    yield
+    main._shutdown_executors()
+
+
+def test_parse_runs_in_a_worker_process(pool):
+    async def run():
+        return await main._run_parse(os.getpid), await main._run_parse(os.getpid)
+
+    first, second = asyncio.run(run())
+
+    assert first != os.getpid()
+    assert first == second  # the worker is reused
+    assert main._parse_executor is not None
+
+
+def test_pool_is_replaced_after_a_worker_dies(pool):
+    async def run():
+        before = await main._run_parse(os.getpid)
+        with pytest.raises(BrokenProcessPool):
+            await main._run_parse(os._exit, 1)
+        assert main._parse_executor is None
+        return before, await main._run_parse(os.getpid)
+
+    before, after = asyncio.run(run())
+
+    assert after not in (before, os.getpid())
+
+
+def test_parse_past_parse_timeout_fails_and_the_pool_stays_usable(pool, monkeypatch):
+    monkeypatch.setattr(settings, "PARSE_TIMEOUT", 0.2)
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError, match="Parsing took longer than 0.2 s"):
+            await main._run_parse(time.sleep, 1.0)
+        # The hung task keeps its worker, and its slot, until it finishes
+        assert main.parse_gate.running == 1
+        monkeypatch.setattr(settings, "PARSE_TIMEOUT", 0.0)
+        next_parse = asyncio.ensure_future(main._run_parse(os.getpid))
+        await asyncio.sleep(0.1)
+        assert main.parse_gate.queued == 1
+        pid = await next_parse
+        await asyncio.sleep(0)
+        return pid, main.parse_gate.stats()
+
+    pid, stats = asyncio.run(run())
+
+    assert pid != os.getpid()
+    assert (stats["running"], stats["queued"]) == (0, 0)
+
+
+def test_timeout_raised_by_the_task_keeps_its_own_message(pool, monkeypatch):
+    monkeypatch.setattr(settings, "PARSE_EXECUTOR", "thread")
+    monkeypatch.setattr(settings, "PARSE_TIMEOUT", 5.0)
+
+    def times_out():
+        raise TimeoutError("Text extraction stopped after 1 of 3 pages")
+
+    with pytest.raises(TimeoutError, match="after 1 of 3 pages"):
+        asyncio.run(main._run_parse(times_out))
+
+
+def test_thread_executors_run_off_the_event_loop(pool, monkeypatch):
+    monkeypatch.setattr(settings, "PARSE_EXECUTOR", "thread")
+
+    async def run():
+        return await main._run_parse(threading.current_thread), await main._run_encode(threading.current_thread)
+
+    parse_thread, encode_thread = asyncio.run(run())
+
+    assert parse_thread.name.startswith("parse")
+    assert encode_thread.name.startswith("encode")